@@ -0,0 +1,70 @@
+"""
+Store email_domain on admin users created before it was recorded.
+
+GET /org/query finds organizations by admin email domain through the
+email_domain field, so admins without it are invisible to that filter.
+Every admin missing the field gets it derived from their email, with the
+updates sent in bulk. It is safe to re-run after an interruption.
+
+Usage (from the repository root, with .env configured):
+    python -m scripts.backfill_email_domains [--dry-run] [--batch-size 500]
+"""
+import argparse
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from src.config.database import db
+from src.services.admin_service import AdminService
+
+
+def flush(updates: list) -> int:
+    """Apply pending email_domain updates and return how many were modified."""
+    if not updates:
+        return 0
+    result = db.admin_users.bulk_write(updates, ordered=False)
+    updates.clear()
+    return result.modified_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    backfilled = 0
+    updates = []
+
+    cursor = db.admin_users.find(
+        {"email_domain": {"$exists": False}}, {"email": 1}
+    ).batch_size(args.batch_size)
+    for admin in cursor:
+        email_domain = AdminService.email_domain(admin["email"])
+
+        if args.dry_run:
+            print(f"{admin['email']} -> {email_domain}")
+            backfilled += 1
+            continue
+
+        updates.append(
+            UpdateOne(
+                {"_id": admin["_id"], "email": admin["email"]},
+                {
+                    "$set": {
+                        "email_domain": email_domain,
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                },
+            )
+        )
+
+        if len(updates) >= args.batch_size:
+            backfilled += flush(updates)
+
+    backfilled += flush(updates)
+
+    action = "Would backfill" if args.dry_run else "Backfilled"
+    print(f"{action} {backfilled} admin users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the range-partitioned collection copy against a local mongod.
+
+Seeds a synthetic tenant collection once, then copies it with 1..N parallel
+ranges and prints throughput and speedup for each worker count.
+
+Usage (from the repository root, with .env configured):
+    python -m scripts.benchmark_migration --documents 5000000 --workers 1,2,4,8
+"""
+import argparse
+import time
+from pymongo import MongoClient
+from src.services.migration_service import MigrationService
+
+SEED_BATCH_SIZE = 10000
+
+
+def seed_collection(collection, documents: int):
+    """Fill the source collection with synthetic tenant documents."""
+    existing = collection.estimated_document_count()
+    if existing >= documents:
+        return
+
+    collection.drop()
+    payload = "x" * 200
+    for start in range(0, documents, SEED_BATCH_SIZE):
+        count = min(SEED_BATCH_SIZE, documents - start)
+        collection.insert_many(
+            [
+                {"seq": start + i, "name": f"record-{start + i}", "payload": payload}
+                for i in range(count)
+            ],
+            ordered=False,
+        )
+    collection.create_index("seq")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="migration_benchmark")
+    parser.add_argument("--documents", type=int, default=5_000_000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    worker_counts = [int(value) for value in args.workers.split(",")]
+    client = MongoClient(args.url, maxPoolSize=max(worker_counts) * 2 + 4)
+    database = client[args.database]
+    source = database["org_benchmark_source"]
+
+    print(f"Seeding {args.documents} documents...")
+    seed_collection(source, args.documents)
+
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>9} {'docs/sec':>12} {'MB/sec':>8} {'speedup':>8}")
+    for workers in worker_counts:
+        target = database[f"org_benchmark_target_{workers}"]
+        target.drop()
+
+        started = time.monotonic()
+        stats = MigrationService.copy_collection_parallel(
+            source, target, workers=workers, batch_size=args.batch_size
+        )
+        elapsed = time.monotonic() - started
+
+        rate = stats["documents"] / elapsed
+        baseline = baseline or rate
+        print(
+            f"{workers:>8} {elapsed:>9.2f} {rate:>12.0f} "
+            f"{stats['bytes'] / elapsed / 1e6:>8.1f} {rate / baseline:>7.2f}x"
+        )
+        target.drop()
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
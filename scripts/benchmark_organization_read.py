@@ -0,0 +1,114 @@
+"""
+Benchmark the single-round-trip organization read against two queries.
+
+Seeds organizations with one admin each, then loads random organizations by
+name with find_one + admin find_one (the previous path) and with the $lookup
+aggregation used by OrganizationService.load_organization, printing p50/p99
+latency for each. The gap grows with the round-trip time to the server, so
+also run it against a remote mongod.
+
+Usage (from the repository root, with .env configured):
+    python -m scripts.benchmark_organization_read --organizations 100000
+"""
+import argparse
+import random
+import statistics
+import time
+from bson import ObjectId
+from pymongo import MongoClient
+from src.config.database import MASTER_INDEXES
+from src.services.organization_service import OrganizationService
+
+SEED_BATCH_SIZE = 10000
+
+
+def seed(database, organizations: int):
+    """Fill the organizations and admin_users collections once."""
+    if database.organizations.estimated_document_count() >= organizations:
+        return
+
+    database.organizations.drop()
+    database.admin_users.drop()
+    for collection_name, keys, options in MASTER_INDEXES:
+        if collection_name in ("organizations", "admin_users"):
+            database[collection_name].create_index(keys, **options)
+
+    for start in range(0, organizations, SEED_BATCH_SIZE):
+        orgs, admins = [], []
+        for number in range(start, min(start + SEED_BATCH_SIZE, organizations)):
+            organization_id = ObjectId()
+            orgs.append(
+                {
+                    "_id": organization_id,
+                    "organization_name": f"org-{number}",
+                    "collection_name": f"org_{organization_id}",
+                }
+            )
+            admins.append(
+                {
+                    "email": f"admin-{number}@example.com",
+                    "password_hash": "$2b$12$" + "x" * 53,
+                    "organization_id": organization_id,
+                }
+            )
+        database.organizations.insert_many(orgs, ordered=False)
+        database.admin_users.insert_many(admins, ordered=False)
+
+
+def two_queries(database, name: str) -> dict:
+    """Organization, then its admin, as two sequential round trips."""
+    org = database.organizations.find_one({"organization_name": name})
+    admin = database.admin_users.find_one({"organization_id": org["_id"]})
+    org["admin_email"] = admin["email"]
+    org["admin_id"] = admin["_id"]
+    return org
+
+
+def single_round_trip(database, name: str) -> dict:
+    """Organization with its admin joined server-side."""
+    pipeline = OrganizationService.organization_with_admin_pipeline(
+        {"organization_name": name}
+    )
+    return next(database.organizations.aggregate(pipeline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="read_benchmark")
+    parser.add_argument("--organizations", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=10_000)
+    args = parser.parse_args()
+
+    client = MongoClient(args.url)
+    database = client[args.database]
+    print(f"Seeding {args.organizations} organizations...")
+    seed(database, args.organizations)
+
+    print(f"{'path':>18} {'p50 ms':>8} {'p99 ms':>8} {'reads/sec':>10}")
+    for label, load in (("two queries", two_queries), ("$lookup", single_round_trip)):
+        # Warm the cache and connection pool before measuring
+        for _ in range(min(args.reads, 1000)):
+            load(database, f"org-{random.randrange(args.organizations)}")
+
+        latencies = []
+        started = time.monotonic()
+        for _ in range(args.reads):
+            name = f"org-{random.randrange(args.organizations)}"
+            read_started = time.perf_counter()
+            load(database, name)
+            latencies.append((time.perf_counter() - read_started) * 1000)
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        print(
+            f"{label:>18} {statistics.median(latencies):>8.3f} "
+            f"{latencies[int(len(latencies) * 0.99)]:>8.3f} "
+            f"{args.reads / elapsed:>10.0f}"
+        )
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
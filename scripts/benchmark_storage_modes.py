@@ -0,0 +1,108 @@
+"""
+Benchmark dedicated against shared tenant storage on a local mongod.
+
+For each tenant count, seeds the tenants once in each storage mode (a
+collection per tenant, or one shared collection scoped by tenant_id) and
+prints setup time, point read/write latency and the storage footprint.
+Seeding 50k dedicated collections takes several minutes by design.
+
+Usage (from the repository root):
+    python -m scripts.benchmark_storage_modes --tenants 1000,10000,50000
+"""
+import argparse
+import random
+import statistics
+import time
+from bson import ObjectId
+from pymongo import ASCENDING, MongoClient
+from src.services.tenant_collection import TenantCollection
+
+
+def seed(database, mode: str, tenants: int, documents: int) -> list:
+    """Create the tenants and return a scoped handle for each."""
+    payload = "x" * 200
+    shared = database["tenant_data"]
+    if mode == "shared":
+        shared.create_index([("tenant_id", ASCENDING), ("_id", ASCENDING)])
+
+    handles = []
+    for tenant in range(tenants):
+        if mode == "shared":
+            handle = TenantCollection(shared, tenant_id=ObjectId())
+        else:
+            collection_name = f"org_{ObjectId()}"
+            database.create_collection(collection_name)
+            handle = TenantCollection(database[collection_name])
+        handle.insert_many(
+            [{"seq": seq, "payload": payload} for seq in range(documents)]
+        )
+        handles.append(handle)
+    return handles
+
+
+def measure(operation, handles: list, operations: int) -> list:
+    """Run an operation against random tenants and return latencies in ms."""
+    latencies = []
+    for _ in range(operations):
+        handle = random.choice(handles)
+        started = time.perf_counter()
+        operation(handle)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    """Get a percentile of a list of latencies."""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--database", default="storage_benchmark")
+    parser.add_argument("--tenants", default="1000,10000,50000")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=5000)
+    args = parser.parse_args()
+
+    client = MongoClient(args.url)
+    print(
+        f"{'tenants':>8} {'mode':>9} {'setup s':>8} {'read p50':>9} {'read p99':>9} "
+        f"{'write p50':>10} {'write p99':>10} {'colls':>7} {'indexes':>8} {'MB':>8}"
+    )
+    for tenants in [int(value) for value in args.tenants.split(",")]:
+        for mode in ("dedicated", "shared"):
+            client.drop_database(args.database)
+            database = client[args.database]
+
+            started = time.monotonic()
+            handles = seed(database, mode, tenants, args.documents)
+            setup = time.monotonic() - started
+
+            reads = measure(
+                lambda handle: handle.find_one({"seq": random.randrange(args.documents)}),
+                handles,
+                args.operations,
+            )
+            writes = measure(
+                lambda handle: handle.insert_one({"seq": -1, "payload": "y" * 200}),
+                handles,
+                args.operations,
+            )
+
+            stats = database.command("dbStats")
+            size_mb = (stats["storageSize"] + stats["indexSize"]) / 1e6
+            print(
+                f"{tenants:>8} {mode:>9} {setup:>8.1f} "
+                f"{statistics.median(reads):>9.2f} {percentile(reads, 0.99):>9.2f} "
+                f"{statistics.median(writes):>10.2f} {percentile(writes, 0.99):>10.2f} "
+                f"{stats['collections']:>7} {stats['indexes']:>8} {size_mb:>8.1f}"
+            )
+
+    client.drop_database(args.database)
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
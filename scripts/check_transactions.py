@@ -0,0 +1,69 @@
+"""
+Check transactional organization creation against a replica set.
+
+Creates a throwaway organization through the sync and the async
+transactional paths with the collection pool switched off, so the tenant
+collection is created inside the transaction, then checks that the
+collection exists and deletes the organization again. Run it against a
+replica set or sharded cluster before enabling TRANSACTIONS_ENABLED there;
+it exits non-zero if either path fails.
+
+Usage (from the repository root, with .env pointing at a replica set):
+    python -m scripts.check_transactions
+"""
+import argparse
+import asyncio
+import sys
+from bson import ObjectId
+from src.config.database import DatabaseConfig
+from src.config.settings import settings
+from src.services.database_service import DatabaseService
+from src.services.organization_service import OrganizationService
+
+
+def check(label: str, org: dict) -> bool:
+    """Report whether a created organization got its collection, then delete it."""
+    created = DatabaseService.collection_exists(org["collection_name"])
+    OrganizationService.delete_organization(org["organization_name"], org["admin_id"])
+    print(f"{label}: {'ok' if created else 'collection missing'}")
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.parse_args()
+
+    if not DatabaseConfig.supports_transactions():
+        print("Server does not support transactions (needs a replica set, 4.4+)")
+        sys.exit(1)
+
+    # Force the collection to be created inside the transaction
+    settings.collection_pool_size = 0
+    settings.lazy_tenant_collections = False
+    settings.tenant_database_targets = {}
+    settings.tenant_storage_mode = "dedicated"
+
+    passed = True
+    for label, create in (
+        ("sync", OrganizationService.create_organization_in_transaction),
+        (
+            "async",
+            lambda *args: asyncio.run(
+                OrganizationService.create_organization_in_transaction_async(*args)
+            ),
+        ),
+    ):
+        name = f"transaction-check-{ObjectId()}"
+        try:
+            org = create(name, f"admin@{name}.example", "check-password")
+        except Exception as e:
+            print(f"{label}: failed ({e})")
+            passed = False
+            continue
+        passed = check(label, org) and passed
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Convert name-derived tenant collections to organization-ID-keyed ones.
+
+Every organization whose collection_name is not yet org_<organization _id>
+gets its collection renamed server-side (metadata only) and its
+collection_name repointed, with the metadata updates sent in bulk. Run it
+once with the API stopped. It is safe to re-run after an interruption:
+collections that were already renamed are detected and only repointed.
+
+Usage (from the repository root, with .env configured):
+    python -m scripts.migrate_collection_names [--dry-run] [--batch-size 500]
+"""
+import argparse
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+from src.config.database import db
+from src.services.database_service import DatabaseService
+
+
+def flush(updates: list) -> int:
+    """Apply pending collection_name updates and return how many matched."""
+    if not updates:
+        return 0
+    result = db.organizations.bulk_write(updates, ordered=False)
+    updates.clear()
+    return result.matched_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    converted = 0
+    skipped = 0
+    updates = []
+
+    cursor = db.organizations.find({}, {"collection_name": 1}).batch_size(
+        args.batch_size
+    )
+    for org in cursor:
+        old_collection_name = org["collection_name"]
+        new_collection_name = DatabaseService.tenant_collection_name(org["_id"])
+
+        if old_collection_name == new_collection_name:
+            skipped += 1
+            continue
+
+        if args.dry_run:
+            print(f"{old_collection_name} -> {new_collection_name}")
+            converted += 1
+            continue
+
+        DatabaseService.move_collection(old_collection_name, new_collection_name)
+        updates.append(
+            UpdateOne(
+                {"_id": org["_id"], "collection_name": old_collection_name},
+                {
+                    "$set": {
+                        "collection_name": new_collection_name,
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                },
+            )
+        )
+
+        if len(updates) >= args.batch_size:
+            converted += flush(updates)
+
+    converted += flush(updates)
+
+    action = "Would convert" if args.dry_run else "Converted"
+    print(f"{action} {converted} organizations, {skipped} already ID-keyed")
+
+
+if __name__ == "__main__":
+    main()
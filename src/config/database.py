@@ -1,13 +1,66 @@
-from pymongo import MongoClient, ASCENDING
+from pymongo import AsyncMongoClient, MongoClient, ASCENDING
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
+from pymongo.uri_parser import parse_uri
+from typing import Optional
 from src.config.settings import settings
 
+# Placement target name of the main database (settings.mongodb_url)
+PRIMARY_TARGET = "primary"
+
+# Wire version of MongoDB 4.4, the first to create collections in transactions
+TRANSACTION_MIN_WIRE_VERSION = 9
+
+# Master database indexes as (collection, keys, create_index options)
+MASTER_INDEXES = [
+    # Organizations collection indexes
+    ("organizations", [("organization_name", ASCENDING)], {"unique": True}),
+    ("organizations", [("collection_name", ASCENDING)], {"unique": True}),
+    ("organizations", [("updated_at", ASCENDING)], {}),
+    # Keyset pagination of GET /org/list in creation order
+    ("organizations", [("created_at", ASCENDING), ("_id", ASCENDING)], {}),
+    # Admin users collection indexes
+    ("admin_users", [("email", ASCENDING)], {"unique": True}),
+    # Includes _id so ownership lookups by organization are covered queries
+    ("admin_users", [("organization_id", ASCENDING), ("_id", ASCENDING)], {}),
+    ("admin_users", [("updated_at", ASCENDING)], {}),
+    # Organization queries by admin email domain, covered by the index
+    ("admin_users", [("email_domain", ASCENDING), ("organization_id", ASCENDING)], {}),
+    # Deletions seen by processes polling for cache invalidation (kept a day)
+    ("cache_tombstones", [("updated_at", ASCENDING)], {"expireAfterSeconds": 86400}),
+    # Shared tenant collection used by hybrid storage, scoped by tenant_id
+    (settings.shared_tenant_collection, [("tenant_id", ASCENDING), ("_id", ASCENDING)], {}),
+    # Background jobs: at most one active job per organization
+    (
+        "jobs",
+        [("organization_id", ASCENDING)],
+        {"unique": True, "partialFilterExpression": {"active": True}},
+    ),
+    (
+        "jobs",
+        [("heartbeat_at", ASCENDING)],
+        {"partialFilterExpression": {"active": True}},
+    ),
+    ("jobs", [("owner", ASCENDING)], {"partialFilterExpression": {"active": True}}),
+]
+
+
+def _supports_transactions(hello: dict) -> bool:
+    """Check a hello response for transactions that may create collections."""
+    topology = hello.get("setName") or hello.get("msg") == "isdbgrid"
+    wire_version = hello.get("maxWireVersion", 0)
+    return bool(topology) and wire_version >= TRANSACTION_MIN_WIRE_VERSION
+
 
 class DatabaseConfig:
     """Manages MongoDB connection and provides database access."""
 
     _client: MongoClient = None
     _database: Database = None
+    _supports_transactions: Optional[bool] = None
+    # Tenant placement targets: one pooled client per URI, one handle per target
+    _target_clients: dict = {}
+    _target_databases: dict = {}
 
     @classmethod
     def get_client(cls) -> MongoClient:
@@ -24,6 +77,32 @@ class DatabaseConfig:
             cls._database = client[settings.database_name]
         return cls._database
 
+    @classmethod
+    def get_target_database(cls, target: Optional[str] = None) -> Database:
+        """
+        Get the database of a tenant placement target.
+
+        Args:
+            target: Name from settings.tenant_database_targets; None or
+                PRIMARY_TARGET for the main database
+
+        Returns:
+            Database handle
+
+        Raises:
+            KeyError: If the target is not configured
+        """
+        if target is None or target == PRIMARY_TARGET:
+            return cls.get_database()
+
+        if target not in cls._target_databases:
+            uri = settings.tenant_database_targets[target]
+            if uri not in cls._target_clients:
+                cls._target_clients[uri] = MongoClient(uri)
+            database_name = parse_uri(uri)["database"] or settings.database_name
+            cls._target_databases[target] = cls._target_clients[uri][database_name]
+        return cls._target_databases[target]
+
     @classmethod
     def close_connection(cls):
         """Close MongoDB connection."""
@@ -31,21 +110,101 @@ class DatabaseConfig:
             cls._client.close()
             cls._client = None
             cls._database = None
+            cls._supports_transactions = None
+        for client in cls._target_clients.values():
+            client.close()
+        cls._target_clients = {}
+        cls._target_databases = {}
+
+    @classmethod
+    def supports_transactions(cls) -> bool:
+        """
+        Whether the deployment can create collections inside transactions.
+
+        That needs a replica set or sharded cluster running MongoDB 4.4+.
+        """
+        if cls._supports_transactions is None:
+            hello = cls.get_database().command("hello")
+            cls._supports_transactions = _supports_transactions(hello)
+        return cls._supports_transactions
 
     @classmethod
     def initialize_indexes(cls):
         """Create necessary indexes for the master database."""
         db = cls.get_database()
 
-        # Organizations collection indexes
-        db.organizations.create_index(
-            [("organization_name", ASCENDING)], unique=True
-        )
+        for collection_name, keys, options in MASTER_INDEXES:
+            db[collection_name].create_index(keys, **options)
+
+
+class AsyncDatabaseConfig:
+    """Manages the native async MongoDB connection used by async routes."""
+
+    _client: AsyncMongoClient = None
+    _database: AsyncDatabase = None
+    _supports_transactions: Optional[bool] = None
+    _target_clients: dict = {}
+    _target_databases: dict = {}
+
+    @classmethod
+    def get_client(cls) -> AsyncMongoClient:
+        """Get async MongoDB client instance (singleton)."""
+        if cls._client is None:
+            cls._client = AsyncMongoClient(settings.mongodb_url)
+        return cls._client
+
+    @classmethod
+    def get_database(cls) -> AsyncDatabase:
+        """Get main async database instance."""
+        if cls._database is None:
+            client = cls.get_client()
+            cls._database = client[settings.database_name]
+        return cls._database
+
+    @classmethod
+    def get_target_database(cls, target: Optional[str] = None) -> AsyncDatabase:
+        """Async version of DatabaseConfig.get_target_database."""
+        if target is None or target == PRIMARY_TARGET:
+            return cls.get_database()
+
+        if target not in cls._target_databases:
+            uri = settings.tenant_database_targets[target]
+            if uri not in cls._target_clients:
+                cls._target_clients[uri] = AsyncMongoClient(uri)
+            database_name = parse_uri(uri)["database"] or settings.database_name
+            cls._target_databases[target] = cls._target_clients[uri][database_name]
+        return cls._target_databases[target]
+
+    @classmethod
+    async def close_connection(cls):
+        """Close async MongoDB connection."""
+        if cls._client is not None:
+            await cls._client.close()
+            cls._client = None
+            cls._database = None
+            cls._supports_transactions = None
+        for client in cls._target_clients.values():
+            await client.close()
+        cls._target_clients = {}
+        cls._target_databases = {}
+
+    @classmethod
+    async def supports_transactions(cls) -> bool:
+        """Async version of DatabaseConfig.supports_transactions."""
+        if cls._supports_transactions is None:
+            hello = await cls.get_database().command("hello")
+            cls._supports_transactions = _supports_transactions(hello)
+        return cls._supports_transactions
+
+    @classmethod
+    async def initialize_indexes(cls):
+        """Create necessary indexes for the master database."""
+        db = cls.get_database()
 
-        # Admin users collection indexes
-        db.admin_users.create_index([("email", ASCENDING)], unique=True)
-        db.admin_users.create_index([("organization_id", ASCENDING)])
+        for collection_name, keys, options in MASTER_INDEXES:
+            await db[collection_name].create_index(keys, **options)
 
 
-# Global database instance
+# Global database instances
 db = DatabaseConfig.get_database()
+async_db = AsyncDatabaseConfig.get_database()
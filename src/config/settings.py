@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -11,6 +11,88 @@ class Settings(BaseSettings):
     jwt_algorithm: str
     jwt_expiration_hours: int
 
+    # Password hashing pool (kept separate from the request threadpool)
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32
+
+    # Verified-token cache used by get_current_admin
+    token_cache_max_entries: int = 10000
+    token_cache_max_bytes: int = 8 * 1024 * 1024
+    token_cache_ttl_seconds: int = 300
+
+    # Read-through cache of organization records used by get_organization
+    org_cache_max_entries: int = 10000
+    org_cache_max_bytes: int = 16 * 1024 * 1024
+    org_cache_ttl_seconds: int = 60
+    org_cache_stale_seconds: int = 300
+    org_cache_negative_ttl_seconds: int = 5
+
+    # Optional shared-memory organization directory (see shared_directory.py)
+    shared_directory_path: Optional[str] = None
+    shared_directory_slots: int = 16384
+    shared_directory_refresh_interval_seconds: float = 1.0
+    shared_directory_max_age_seconds: float = 10.0
+
+    # Cross-process cache invalidation: auto, change_stream, poll or off
+    cache_invalidation_mode: str = "auto"
+    cache_invalidation_poll_interval_seconds: float = 1.0
+
+    # Multi-document transactions for tenant provisioning (replica sets only)
+    transactions_enabled: bool = True
+    transaction_timeout_seconds: int = 30
+
+    # Create tenant collections on their first write instead of at signup
+    lazy_tenant_collections: bool = False
+
+    # Extra databases tenant collections are spread over, as JSON
+    # {"name": "mongodb://host:port/database"}; the main database is "primary"
+    tenant_database_targets: Dict[str, str] = {}
+    placement_virtual_nodes: int = 128
+    rebalance_fence_grace_seconds: float = 2.0
+
+    # Tenant storage: "dedicated" (collection per organization) or "hybrid"
+    # (new organizations share one collection until promoted by size)
+    tenant_storage_mode: str = "dedicated"
+    shared_tenant_collection: str = "tenant_data"
+    storage_promotion_threshold_documents: int = 10000
+    storage_promotion_check_interval_seconds: int = 300
+    storage_promotion_grace_seconds: float = 5.0
+
+    # Spare tenant collections created ahead of signups (0 disables the pool)
+    collection_pool_size: int = 0
+    collection_pool_refill_batch: int = 10
+    collection_pool_refill_interval_seconds: float = 1.0
+
+    # Key of the X-Operator-Key header required by cross-tenant endpoints
+    # (GET /org/list, GET /org/query); unset disables them
+    operator_api_key: Optional[str] = None
+
+    # GET /org/list page sizes and the cursor batch size of streamed listings
+    organization_list_default_limit: int = 100
+    organization_list_max_limit: int = 1000
+    organization_list_batch_size: int = 1000
+    # Most organizations an admin_email_domain filter of GET /org/query may
+    # resolve to before the query is rejected
+    organization_query_max_domain_organizations: int = 1000
+
+    # How long DatabaseService trusts a cached "collection exists" answer
+    collection_catalog_ttl_seconds: int = 30
+    collection_catalog_max_entries: int = 100000
+
+    # Serve routes from the native async driver instead of the threadpool
+    async_database: bool = False
+
+    # Streaming collection copy used by tenant migrations
+    migration_batch_size: int = 1000
+    migration_max_retries: int = 3
+    migration_workers: int = 4
+
+    # Background job workers
+    job_workers: int = 2
+    job_heartbeat_interval_seconds: int = 10
+    job_heartbeat_timeout_seconds: int = 60
+    job_max_attempts: int = 3
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,5 +1,17 @@
 from fastapi import FastAPI
-from src.config.database import DatabaseConfig
+from src.config.database import AsyncDatabaseConfig, DatabaseConfig
+from src.config.settings import settings
+from src.services.auth_service import AuthService
+from src.services.collection_pool import CollectionPool
+from src.services.database_service import DatabaseService
+from src.services.invalidation_bus import InvalidationBus
+from src.services.job_service import JobService
+from src.services.organization_cache import OrganizationCache
+from src.services.shared_directory import SharedDirectory
+from src.services.storage_promoter import StoragePromoter
+# Imported for its job handler, so moves of a dead worker are resumed here
+import src.services.rebalancer  # noqa: F401
+from src.utils.metrics import Metrics
 from src.routes.organization_routes import router as organization_router
 from src.routes.admin_routes import router as admin_router
 
@@ -16,14 +28,29 @@ app.include_router(admin_router)
 @app.on_event("startup")
 async def startup_event():
     """Initialize database indexes on startup."""
-    DatabaseConfig.initialize_indexes()
+    if settings.async_database:
+        await AsyncDatabaseConfig.initialize_indexes()
+    else:
+        DatabaseConfig.initialize_indexes()
     print("Database indexes initialized")
 
+    JobService.start()
+    InvalidationBus.start()
+    CollectionPool.start()
+    StoragePromoter.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connection on shutdown."""
+    StoragePromoter.shutdown()
+    CollectionPool.shutdown()
+    InvalidationBus.shutdown()
+    JobService.shutdown()
+    OrganizationCache.shutdown()
+    AuthService.shutdown_hash_executor()
     DatabaseConfig.close_connection()
+    await AsyncDatabaseConfig.close_connection()
     print("Database connection closed")
 
 
@@ -37,6 +64,20 @@ async def root():
     }
 
 
+@app.get("/stats")
+async def stats():
+    """In-process cache statistics for sizing and monitoring."""
+    return {
+        "token_cache": AuthService.token_cache.stats(),
+        "organization_cache": OrganizationCache.cache.stats(),
+        "shared_directory": SharedDirectory.stats(),
+        "collection_catalog": DatabaseService.catalog.stats(),
+        "collection_pool": CollectionPool.stats(),
+        "invalidation_bus": InvalidationBus.stats(),
+        "metrics": Metrics.snapshot(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
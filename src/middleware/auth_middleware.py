@@ -1,13 +1,20 @@
+import hashlib
+import hmac
+import time
+from typing import Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from bson import ObjectId
+from starlette.concurrency import run_in_threadpool
 from src.services.auth_service import AuthService
-from src.services.admin_service import AdminService
+from src.services.admin_service import AdminProjection, AdminService
+from src.config.settings import settings
 
 security = HTTPBearer()
+operator_key_header = APIKeyHeader(name="X-Operator-Key", auto_error=False)
 
 
-def get_current_admin(
+async def get_current_admin(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> dict:
     """
@@ -17,13 +24,22 @@ def get_current_admin(
         credentials: HTTP Bearer token from Authorization header
 
     Returns:
-        Admin user document with decoded token data
+        Admin record (_id, email, organization_id) with decoded token data
 
     Raises:
         HTTPException: If token is invalid or admin not found
     """
     token = credentials.credentials
 
+    # Serve repeat requests for an already verified token from the cache
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    cached = AuthService.token_cache.get(cache_key)
+    if cached is not None:
+        payload, admin = cached
+        return {**admin, "token_data": dict(payload)}
+
+    cache_epoch = AuthService.token_cache.epoch
+
     # Decode token
     payload = AuthService.decode_token(token)
 
@@ -53,8 +69,16 @@ def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get admin from database
-    admin = AdminService.get_admin_by_id(admin_id)
+    # Get admin from database, only the fields handlers need and never the
+    # password hash
+    if settings.async_database:
+        admin = await AdminService.get_admin_by_id_async(
+            admin_id, AdminProjection.PUBLIC
+        )
+    else:
+        admin = await run_in_threadpool(
+            AdminService.get_admin_by_id, admin_id, AdminProjection.PUBLIC
+        )
 
     if not admin:
         raise HTTPException(
@@ -63,10 +87,55 @@ def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Cache until the token expires, capped by the configured TTL
+    ttl = settings.token_cache_ttl_seconds
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    AuthService.token_cache.set(
+        cache_key,
+        (payload, admin),
+        ttl=ttl,
+        tags=(admin["_id"], admin["organization_id"]),
+        epoch=cache_epoch,
+    )
+
     # Add decoded token data to admin document
-    admin["token_data"] = payload
+    return {**admin, "token_data": dict(payload)}
+
+
+async def require_operator(
+    operator_key: Optional[str] = Depends(operator_key_header),
+) -> bool:
+    """
+    FastAPI dependency guarding endpoints that expose every organization.
+
+    Tenant admin tokens are not accepted: the caller must send the
+    configured operator_api_key in the X-Operator-Key header.
+
+    Args:
+        operator_key: Value of the X-Operator-Key header
+
+    Returns:
+        True if the key matches
+
+    Raises:
+        HTTPException: If no operator key is configured or it does not match
+    """
+    if not settings.operator_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator API is disabled",
+        )
+
+    if not operator_key or not hmac.compare_digest(
+        operator_key.encode(), settings.operator_api_key.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid operator key",
+        )
 
-    return admin
+    return True
 
 
 def verify_admin_organization(admin: dict, organization_id: ObjectId) -> bool:
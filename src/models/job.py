@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class JobProgress(BaseModel):
+    """Copy progress of a background job."""
+
+    copied: int = 0
+    total: int = 0
+    docs_per_sec: float = 0.0
+    eta_seconds: Optional[float] = None
+
+
+class JobResponse(BaseModel):
+    """Response schema for background job status."""
+
+    job_id: str
+    job_type: str
+    status: str
+    organization_id: str
+    progress: JobProgress
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timezone
 from bson import ObjectId
 
@@ -78,3 +78,10 @@ class OrganizationResponse(BaseModel):
 
     class Config:
         json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class OrganizationListResponse(BaseModel):
+    """Response schema for one page of organizations."""
+
+    organizations: List[OrganizationResponse]
+    next_cursor: Optional[str] = None
@@ -2,14 +2,14 @@ from fastapi import APIRouter, HTTPException, status
 from datetime import timedelta
 from src.models.admin import LoginRequest, TokenResponse
 from src.services.admin_service import AdminService
-from src.services.auth_service import AuthService
+from src.services.auth_service import AuthService, PasswordHashingBusyError
 from src.config.settings import settings
 
 router = APIRouter(prefix="/admin", tags=["Authentication"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def admin_login(request: LoginRequest):
+async def admin_login(request: LoginRequest):
     """
     Admin login endpoint - authenticates admin and returns JWT token.
 
@@ -24,7 +24,9 @@ def admin_login(request: LoginRequest):
     """
     try:
         # Authenticate admin
-        admin = AdminService.authenticate_admin(request.email, request.password)
+        admin = await AdminService.authenticate_admin_async(
+            request.email, request.password
+        )
 
         if not admin:
             raise HTTPException(
@@ -57,6 +59,12 @@ def admin_login(request: LoginRequest):
 
     except HTTPException:
         raise
+    except PasswordHashingBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,21 +1,90 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import re
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
+from starlette.concurrency import run_in_threadpool
 from src.models.organization import (
     CreateOrganizationRequest,
     GetOrganizationRequest,
     UpdateOrganizationRequest,
     DeleteOrganizationRequest,
     OrganizationResponse,
+    OrganizationListResponse,
 )
-from src.services.organization_service import OrganizationService
+from src.models.job import JobResponse
+from src.services.organization_service import (
+    ORGANIZATION_LIST_ORDERS,
+    ORGANIZATION_QUERY_SORTS,
+    OrganizationService,
+    QueryNotIndexedError,
+    QueryTooBroadError,
+)
+from src.services.auth_service import AuthService, PasswordHashingBusyError
+from src.services.job_service import JobConflictError, JobService
 from src.utils.validators import Validators
-from src.middleware.auth_middleware import get_current_admin
+from src.middleware.auth_middleware import (
+    get_current_admin,
+    require_operator,
+    verify_admin_organization,
+)
+from src.config.settings import settings
 
 router = APIRouter(prefix="/org", tags=["Organizations"])
 
 
+def _job_response(job: dict) -> JobResponse:
+    """Build the API representation of a job document."""
+    return JobResponse(
+        job_id=str(job["_id"]),
+        job_type=job["job_type"],
+        status=job["status"],
+        organization_id=str(job["organization_id"]),
+        progress=job["progress"],
+        result=job.get("result"),
+        error=job.get("error"),
+        created_at=job["created_at"].isoformat(),
+        updated_at=job["updated_at"].isoformat(),
+    )
+
+
+def _organization_response(org: dict) -> OrganizationResponse:
+    """Build the API representation of a listed organization."""
+    return OrganizationResponse(
+        organization_id=str(org["_id"]),
+        organization_name=org["organization_name"],
+        collection_name=org["collection_name"],
+        created_at=org["created_at"].isoformat(),
+    )
+
+
+def _ndjson(orgs: Iterator[dict]) -> Iterator[str]:
+    """Serialize organizations as NDJSON, one chunk per cursor batch."""
+    lines = []
+    for org in orgs:
+        lines.append(_organization_response(org).model_dump_json() + "\n")
+        if len(lines) >= settings.organization_list_batch_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+async def _ndjson_async(orgs: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Async version of _ndjson."""
+    lines = []
+    async for org in orgs:
+        lines.append(_organization_response(org).model_dump_json() + "\n")
+        if len(lines) >= settings.organization_list_batch_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
 @router.post("/create", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED)
-def create_organization(request: CreateOrganizationRequest):
+async def create_organization(request: CreateOrganizationRequest):
     """
     Create a new organization with admin user and dynamic collection.
 
@@ -47,10 +116,25 @@ def create_organization(request: CreateOrganizationRequest):
         if not is_valid:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
 
+        # Hash the admin password off the request threadpool
+        password_hash = await AuthService.hash_password_async(request.password)
+
         # Create organization
-        org = OrganizationService.create_organization(
-            request.organization_name, request.email, request.password
-        )
+        if settings.async_database:
+            org = await OrganizationService.create_organization_async(
+                request.organization_name,
+                request.email,
+                request.password,
+                admin_password_hash=password_hash,
+            )
+        else:
+            org = await run_in_threadpool(
+                OrganizationService.create_organization,
+                request.organization_name,
+                request.email,
+                request.password,
+                admin_password_hash=password_hash,
+            )
 
         # Return response
         return OrganizationResponse(
@@ -63,6 +147,12 @@ def create_organization(request: CreateOrganizationRequest):
 
     except HTTPException:
         raise
+    except PasswordHashingBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -71,7 +161,7 @@ def create_organization(request: CreateOrganizationRequest):
 
 
 @router.get("/get", response_model=OrganizationResponse)
-def get_organization(organization_name: str):
+async def get_organization(organization_name: str):
     """
     Get organization details by name.
 
@@ -85,7 +175,12 @@ def get_organization(organization_name: str):
         HTTPException: If organization not found
     """
     try:
-        org = OrganizationService.get_organization(organization_name)
+        if settings.async_database:
+            org = await OrganizationService.get_organization_async(organization_name)
+        else:
+            org = await run_in_threadpool(
+                OrganizationService.get_organization, organization_name
+            )
 
         if not org:
             raise HTTPException(
@@ -110,21 +205,188 @@ def get_organization(organization_name: str):
         )
 
 
-@router.put("/update", response_model=OrganizationResponse)
-def update_organization(
+@router.get("/list", response_model=OrganizationListResponse)
+async def list_organizations(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    order: str = "id",
+    stream: bool = False,
+    operator: bool = Depends(require_operator),
+):
+    """
+    List organizations page by page, or stream all of them as NDJSON.
+    Requires the operator key, as it spans every tenant.
+
+    Args:
+        limit: Organizations per page, capped at organization_list_max_limit
+        cursor: next_cursor of the previous page (optional)
+        order: "id" or "created_at"
+        stream: Stream every organization after cursor as NDJSON instead
+        operator: Operator key check
+
+    Returns:
+        Page of organizations with the cursor of the next page, or an
+        application/x-ndjson stream
+
+    Raises:
+        HTTPException: If order or cursor is invalid
+    """
+    try:
+        if order not in ORGANIZATION_LIST_ORDERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"order must be one of: {', '.join(ORGANIZATION_LIST_ORDERS)}",
+            )
+
+        after = None
+        if cursor:
+            after = OrganizationService.decode_list_cursor(cursor, order)
+            if after is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+
+        if stream:
+            if settings.async_database:
+                body = _ndjson_async(
+                    OrganizationService.iter_organizations_async(after, order)
+                )
+            else:
+                body = _ndjson(OrganizationService.iter_organizations(after, order))
+            return StreamingResponse(body, media_type="application/x-ndjson")
+
+        limit = min(
+            limit or settings.organization_list_default_limit,
+            settings.organization_list_max_limit,
+        )
+        if settings.async_database:
+            orgs, next_cursor = await OrganizationService.list_organizations_async(
+                limit, after, order
+            )
+        else:
+            orgs, next_cursor = await run_in_threadpool(
+                OrganizationService.list_organizations, limit, after, order
+            )
+
+        return OrganizationListResponse(
+            organizations=[_organization_response(org) for org in orgs],
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
+
+
+@router.get("/query", response_model=OrganizationListResponse)
+async def query_organizations(
+    name_prefix: Optional[str] = Query(None, max_length=50),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    admin_email_domain: Optional[str] = None,
+    order: str = "created_at",
+    limit: Optional[int] = Query(None, ge=1),
+    operator: bool = Depends(require_operator),
+):
+    """
+    Query organizations by name prefix, creation time and admin email domain.
+    Requires the operator key, as it spans every tenant. Only indexed queries
+    are run.
+
+    Args:
+        name_prefix: Organization name prefix, case-sensitive (optional)
+        created_after: Earliest creation time, inclusive (optional)
+        created_before: Latest creation time, exclusive (optional)
+        admin_email_domain: Domain of the admin's email, e.g. TWC.com (optional)
+        order: "organization_name" or "created_at", "-" prefix for descending
+        limit: Maximum organizations, capped at organization_list_max_limit
+        operator: Operator key check
+
+    Returns:
+        Matching organizations
+
+    Raises:
+        HTTPException: If a parameter is invalid, no index serves the query or
+            the email domain matches too many organizations
+    """
+    try:
+        if order.lstrip("-") not in ORGANIZATION_QUERY_SORTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="order must be one of: "
+                + ", ".join(ORGANIZATION_QUERY_SORTS)
+                + " (prefix with - for descending)",
+            )
+
+        if admin_email_domain and not re.match(
+            r"^[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", admin_email_domain
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid email domain",
+            )
+
+        limit = min(
+            limit or settings.organization_list_default_limit,
+            settings.organization_list_max_limit,
+        )
+        if settings.async_database:
+            orgs = await OrganizationService.query_organizations_async(
+                name_prefix,
+                created_after,
+                created_before,
+                admin_email_domain,
+                order,
+                limit,
+            )
+        else:
+            orgs = await run_in_threadpool(
+                OrganizationService.query_organizations,
+                name_prefix,
+                created_after,
+                created_before,
+                admin_email_domain,
+                order,
+                limit,
+            )
+
+        return OrganizationListResponse(
+            organizations=[_organization_response(org) for org in orgs]
+        )
+
+    except HTTPException:
+        raise
+    except (QueryNotIndexedError, QueryTooBroadError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
+
+
+@router.put(
+    "/update", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def update_organization(
     request: UpdateOrganizationRequest,
     current_admin: dict = Depends(get_current_admin)
 ):
     """
     Update organization name and/or admin credentials.
-    Requires authentication.
+    Requires authentication. Credentials are updated immediately; the rename
+    runs as a background job whose status is served by GET /org/jobs/{job_id}.
 
     Args:
         request: Organization update request
         current_admin: Authenticated admin from JWT token
 
     Returns:
-        Updated organization details
+        Queued rename job
 
     Raises:
         HTTPException: If update fails
@@ -152,33 +414,57 @@ def update_organization(
                 )
 
         # Get current organization name from admin's organization
-        current_org = OrganizationService.get_organization_by_id(
-            current_admin["organization_id"]
-        )
+        if settings.async_database:
+            current_org = await OrganizationService.get_organization_by_id_async(
+                current_admin["organization_id"]
+            )
+        else:
+            current_org = await run_in_threadpool(
+                OrganizationService.get_organization_by_id,
+                current_admin["organization_id"],
+            )
         if not current_org:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Current organization not found",
             )
 
-        # Update organization
-        org = OrganizationService.update_organization(
-            current_org["organization_name"],
-            request.organization_name,
-            request.email,
-            request.password,
-        )
+        # Hash the new admin password off the request threadpool
+        password_hash = None
+        if request.password:
+            password_hash = await AuthService.hash_password_async(request.password)
+
+        # Queue the rename job
+        if settings.async_database:
+            job = await OrganizationService.start_organization_update_async(
+                current_org,
+                request.organization_name,
+                request.email,
+                request.password,
+                admin_password_hash=password_hash,
+            )
+        else:
+            job = await run_in_threadpool(
+                OrganizationService.start_organization_update,
+                current_org,
+                request.organization_name,
+                request.email,
+                request.password,
+                admin_password_hash=password_hash,
+            )
 
-        return OrganizationResponse(
-            organization_id=str(org["_id"]),
-            organization_name=org["organization_name"],
-            collection_name=org["collection_name"],
-            created_at=org["created_at"].isoformat(),
-            admin_email=org.get("admin_email"),
-        )
+        return _job_response(job)
 
     except HTTPException:
         raise
+    except JobConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except PasswordHashingBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -187,7 +473,7 @@ def update_organization(
 
 
 @router.delete("/delete", status_code=status.HTTP_200_OK)
-def delete_organization(
+async def delete_organization(
     request: DeleteOrganizationRequest,
     current_admin: dict = Depends(get_current_admin)
 ):
@@ -207,9 +493,16 @@ def delete_organization(
     """
     try:
         # Delete organization using authenticated admin ID
-        success = OrganizationService.delete_organization(
-            request.organization_name, current_admin["_id"]
-        )
+        if settings.async_database:
+            success = await OrganizationService.delete_organization_async(
+                request.organization_name, current_admin["_id"]
+            )
+        else:
+            success = await run_in_threadpool(
+                OrganizationService.delete_organization,
+                request.organization_name,
+                current_admin["_id"],
+            )
 
         if success:
             return {"message": "Organization deleted successfully"}
@@ -226,3 +519,46 @@ def delete_organization(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, current_admin: dict = Depends(get_current_admin)):
+    """
+    Get the status and progress of a background job.
+    Requires authentication. Admins can only see their organization's jobs.
+
+    Args:
+        job_id: Job ID returned by PUT /org/update
+        current_admin: Authenticated admin from JWT token
+
+    Returns:
+        Job status, progress and result
+
+    Raises:
+        HTTPException: If job not found or not authorized
+    """
+    try:
+        job = None
+        if ObjectId.is_valid(job_id):
+            if settings.async_database:
+                job = await JobService.get_job_async(ObjectId(job_id))
+            else:
+                job = await run_in_threadpool(JobService.get_job, ObjectId(job_id))
+
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found",
+            )
+
+        verify_admin_organization(current_admin, job["organization_id"])
+
+        return _job_response(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        )
@@ -1,16 +1,62 @@
 from typing import Optional
 from datetime import datetime, timezone
 from bson import ObjectId
-from src.config.database import db
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.client_session import ClientSession
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+from src.config.database import db, async_db
+from src.config.settings import settings
 from src.services.auth_service import AuthService
+from src.services.invalidation_bus import InvalidationBus
+from src.services.organization_cache import OrganizationCache
 from src.models.admin import AdminUserModel
 
 
+class AdminProjection:
+    """
+    Named projections for reading admin users.
+
+    Getters default to PUBLIC, so the password hash is only fetched (and
+    decoded) by callers that verify a password and ask for AUTH.
+    """
+
+    # Password verification during login
+    AUTH = {"_id": 1, "email": 1, "organization_id": 1, "password_hash": 1}
+    # Identity handed to request handlers and API responses
+    PUBLIC = {"_id": 1, "email": 1, "organization_id": 1}
+    # Ownership checks; covered by the (organization_id, _id) index when
+    # looked up by organization
+    MINIMAL = {"_id": 1, "organization_id": 1}
+
+
 class AdminService:
     """Service class for admin user management operations."""
 
     @staticmethod
-    def create_admin(email: str, password: str, organization_id: ObjectId) -> dict:
+    def email_domain(email: str) -> str:
+        """
+        Get the normalized domain of an email address.
+
+        Stored as email_domain on admin users so organizations can be queried
+        by admin email domain through an index.
+
+        Args:
+            email: Email address
+
+        Returns:
+            Lowercased part after the last "@"
+        """
+        return email.rsplit("@", 1)[-1].lower()
+
+    @staticmethod
+    def create_admin(
+        email: str,
+        password: str,
+        organization_id: ObjectId,
+        password_hash: Optional[str] = None,
+        session: Optional[ClientSession] = None,
+    ) -> dict:
         """
         Create a new admin user.
 
@@ -18,6 +64,8 @@ class AdminService:
             email: Admin email address
             password: Plain text password
             organization_id: Associated organization ID
+            password_hash: Pre-computed bcrypt hash of password (optional)
+            session: Session of a running transaction (optional)
 
         Returns:
             Created admin user document
@@ -25,25 +73,54 @@ class AdminService:
         Raises:
             Exception: If admin with email already exists
         """
-        # Check if admin with email already exists
-        existing_admin = db.admin_users.find_one({"email": email})
-        if existing_admin:
+        # Hash the password unless the caller already did
+        if password_hash is None:
+            password_hash = AuthService.hash_password(password)
+
+        # Create admin user document
+        admin_doc = {
+            "email": email,
+            "email_domain": AdminService.email_domain(email),
+            "password_hash": password_hash,
+            "organization_id": organization_id,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+        # Insert into database; the unique email index rejects duplicates
+        try:
+            result = db.admin_users.insert_one(admin_doc, session=session)
+        except DuplicateKeyError:
             raise Exception("Admin with this email already exists")
+        admin_doc["_id"] = result.inserted_id
 
-        # Hash the password
-        password_hash = AuthService.hash_password(password)
+        return admin_doc
+
+    @staticmethod
+    async def create_admin_async(
+        email: str,
+        password: str,
+        organization_id: ObjectId,
+        password_hash: Optional[str] = None,
+        session: Optional[AsyncClientSession] = None,
+    ) -> dict:
+        """Async version of create_admin; hashes on the password hashing pool."""
+        if password_hash is None:
+            password_hash = await AuthService.hash_password_async(password)
 
-        # Create admin user document
         admin_doc = {
             "email": email,
+            "email_domain": AdminService.email_domain(email),
             "password_hash": password_hash,
             "organization_id": organization_id,
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc),
         }
 
-        # Insert into database
-        result = db.admin_users.insert_one(admin_doc)
+        try:
+            result = await async_db.admin_users.insert_one(admin_doc, session=session)
+        except DuplicateKeyError:
+            raise Exception("Admin with this email already exists")
         admin_doc["_id"] = result.inserted_id
 
         return admin_doc
@@ -60,8 +137,8 @@ class AdminService:
         Returns:
             Admin user document if authenticated, None otherwise
         """
-        # Find admin by email
-        admin = db.admin_users.find_one({"email": email})
+        # Find admin by email, with the password hash
+        admin = AdminService.get_admin_by_email(email, AdminProjection.AUTH)
 
         if not admin:
             return None
@@ -73,47 +150,119 @@ class AdminService:
         return admin
 
     @staticmethod
-    def get_admin_by_email(email: str) -> Optional[dict]:
+    async def authenticate_admin_async(email: str, password: str) -> Optional[dict]:
+        """
+        Authenticate admin user without blocking the event loop.
+
+        The lookup uses the async driver (or the request threadpool when
+        async_database is off) and the bcrypt check the password hashing pool.
+
+        Args:
+            email: Admin email address
+            password: Plain text password
+
+        Returns:
+            Admin user document if authenticated, None otherwise
+
+        Raises:
+            PasswordHashingBusyError: If the hashing pool is saturated
+        """
+        if settings.async_database:
+            admin = await AdminService.get_admin_by_email_async(
+                email, AdminProjection.AUTH
+            )
+        else:
+            admin = await run_in_threadpool(
+                AdminService.get_admin_by_email, email, AdminProjection.AUTH
+            )
+
+        if not admin:
+            return None
+
+        if not await AuthService.verify_password_async(
+            password, admin["password_hash"]
+        ):
+            return None
+
+        return admin
+
+    @staticmethod
+    def get_admin_by_email(
+        email: str, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
         """
         Get admin user by email.
 
         Args:
             email: Admin email address
+            projection: AdminProjection of the fields to fetch
 
         Returns:
             Admin user document or None
         """
-        return db.admin_users.find_one({"email": email})
+        return db.admin_users.find_one({"email": email}, projection)
 
     @staticmethod
-    def get_admin_by_id(admin_id: ObjectId) -> Optional[dict]:
+    async def get_admin_by_email_async(
+        email: str, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
+        """Async version of get_admin_by_email."""
+        return await async_db.admin_users.find_one({"email": email}, projection)
+
+    @staticmethod
+    def get_admin_by_id(
+        admin_id: ObjectId, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
         """
         Get admin user by ID.
 
         Args:
             admin_id: Admin user ID
+            projection: AdminProjection of the fields to fetch
 
         Returns:
             Admin user document or None
         """
-        return db.admin_users.find_one({"_id": admin_id})
+        return db.admin_users.find_one({"_id": admin_id}, projection)
+
+    @staticmethod
+    async def get_admin_by_id_async(
+        admin_id: ObjectId, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
+        """Async version of get_admin_by_id."""
+        return await async_db.admin_users.find_one({"_id": admin_id}, projection)
 
     @staticmethod
-    def get_admin_by_organization(organization_id: ObjectId) -> Optional[dict]:
+    def get_admin_by_organization(
+        organization_id: ObjectId, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
         """
         Get admin user by organization ID.
 
         Args:
             organization_id: Organization ID
+            projection: AdminProjection of the fields to fetch
 
         Returns:
             Admin user document or None
         """
-        return db.admin_users.find_one({"organization_id": organization_id})
+        return db.admin_users.find_one({"organization_id": organization_id}, projection)
+
+    @staticmethod
+    async def get_admin_by_organization_async(
+        organization_id: ObjectId, projection: dict = AdminProjection.PUBLIC
+    ) -> Optional[dict]:
+        """Async version of get_admin_by_organization."""
+        return await async_db.admin_users.find_one(
+            {"organization_id": organization_id}, projection
+        )
 
     @staticmethod
     def update_admin_credentials(
-        admin_id: ObjectId, email: Optional[str] = None, password: Optional[str] = None
+        admin_id: ObjectId,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        password_hash: Optional[str] = None,
     ) -> bool:
         """
         Update admin user credentials.
@@ -122,6 +271,7 @@ class AdminService:
             admin_id: Admin user ID
             email: New email (optional)
             password: New plain text password (optional)
+            password_hash: Pre-computed bcrypt hash of password (optional)
 
         Returns:
             True if successful, False otherwise
@@ -129,19 +279,59 @@ class AdminService:
         update_doc = {"updated_at": datetime.now(timezone.utc)}
 
         if email:
-            # Check if new email already exists for another admin
-            existing = db.admin_users.find_one({"email": email, "_id": {"$ne": admin_id}})
-            if existing:
-                raise Exception("Email already in use by another admin")
             update_doc["email"] = email
+            update_doc["email_domain"] = AdminService.email_domain(email)
 
-        if password:
+        if password_hash:
+            update_doc["password_hash"] = password_hash
+        elif password:
             update_doc["password_hash"] = AuthService.hash_password(password)
 
         if len(update_doc) == 1:  # Only updated_at
             return False
 
-        result = db.admin_users.update_one({"_id": admin_id}, {"$set": update_doc})
+        # The unique email index rejects an email used by another admin
+        try:
+            result = db.admin_users.update_one({"_id": admin_id}, {"$set": update_doc})
+        except DuplicateKeyError:
+            raise Exception("Email already in use by another admin")
+        AuthService.invalidate_cached_tokens(admin_id)
+        OrganizationCache.invalidate_admin(admin_id)
+
+        return result.modified_count > 0
+
+    @staticmethod
+    async def update_admin_credentials_async(
+        admin_id: ObjectId,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        password_hash: Optional[str] = None,
+    ) -> bool:
+        """Async version of update_admin_credentials."""
+        update_doc = {"updated_at": datetime.now(timezone.utc)}
+
+        if email:
+            update_doc["email"] = email
+            update_doc["email_domain"] = AdminService.email_domain(email)
+
+        if password_hash:
+            update_doc["password_hash"] = password_hash
+        elif password:
+            update_doc["password_hash"] = await AuthService.hash_password_async(
+                password
+            )
+
+        if len(update_doc) == 1:  # Only updated_at
+            return False
+
+        try:
+            result = await async_db.admin_users.update_one(
+                {"_id": admin_id}, {"$set": update_doc}
+            )
+        except DuplicateKeyError:
+            raise Exception("Email already in use by another admin")
+        AuthService.invalidate_cached_tokens(admin_id)
+        OrganizationCache.invalidate_admin(admin_id)
 
         return result.modified_count > 0
 
@@ -157,18 +347,42 @@ class AdminService:
             True if successful, False otherwise
         """
         result = db.admin_users.delete_one({"_id": admin_id})
+        AuthService.invalidate_cached_tokens(admin_id)
+        OrganizationCache.invalidate_admin(admin_id)
+        InvalidationBus.record_deletion("admin_users", admin_id)
         return result.deleted_count > 0
 
     @staticmethod
-    def delete_admins_by_organization(organization_id: ObjectId) -> int:
+    def delete_admins_by_organization(
+        organization_id: ObjectId, session: Optional[ClientSession] = None
+    ) -> int:
         """
         Delete all admin users for an organization.
 
         Args:
             organization_id: Organization ID
+            session: Session of a running transaction (optional); the caller
+                must then invalidate the organization's cached tokens after
+                committing
 
         Returns:
             Number of admins deleted
         """
-        result = db.admin_users.delete_many({"organization_id": organization_id})
+        result = db.admin_users.delete_many(
+            {"organization_id": organization_id}, session=session
+        )
+        if session is None:
+            AuthService.invalidate_cached_tokens(organization_id)
+        return result.deleted_count
+
+    @staticmethod
+    async def delete_admins_by_organization_async(
+        organization_id: ObjectId, session: Optional[AsyncClientSession] = None
+    ) -> int:
+        """Async version of delete_admins_by_organization."""
+        result = await async_db.admin_users.delete_many(
+            {"organization_id": organization_id}, session=session
+        )
+        if session is None:
+            AuthService.invalidate_cached_tokens(organization_id)
         return result.deleted_count
@@ -1,8 +1,19 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from src.config.settings import settings
+from src.services.invalidation_bus import InvalidationBus
+from src.utils.cache import TTLCache
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing pool cannot accept more work."""
+
+    pass
 
 
 class AuthService:
@@ -10,6 +21,20 @@ class AuthService:
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+    # bcrypt releases the GIL while hashing, so a dedicated thread pool gives
+    # real parallelism without tying up Starlette's request threadpool.
+    _hash_executor: Optional[ThreadPoolExecutor] = None
+    _hash_slots: Optional[threading.BoundedSemaphore] = None
+    _hash_lock = threading.Lock()
+
+    # Decoded payload and trimmed admin record per verified bearer token,
+    # tagged by admin ID and organization ID for invalidation.
+    token_cache = TTLCache(
+        max_entries=settings.token_cache_max_entries,
+        max_bytes=settings.token_cache_max_bytes,
+        default_ttl=settings.token_cache_ttl_seconds,
+    )
+
     @classmethod
     def hash_password(cls, password: str) -> str:
         """
@@ -37,6 +62,109 @@ class AuthService:
         """
         return cls.pwd_context.verify(plain_password, hashed_password)
 
+    @classmethod
+    def invalidate_cached_tokens(cls, owner_id) -> int:
+        """
+        Drop cached token verifications for an admin or organization.
+
+        Args:
+            owner_id: Admin ID or organization ID the tokens belong to
+
+        Returns:
+            Number of cache entries removed
+        """
+        return cls.token_cache.invalidate_tag(owner_id)
+
+    @classmethod
+    def get_hash_executor(cls) -> ThreadPoolExecutor:
+        """Get the password hashing executor, creating it on first use."""
+        if cls._hash_executor is None:
+            with cls._hash_lock:
+                if cls._hash_executor is None:
+                    # Running jobs plus queued jobs may never exceed this bound
+                    cls._hash_slots = threading.BoundedSemaphore(
+                        settings.password_hash_workers
+                        + settings.password_hash_queue_size
+                    )
+                    cls._hash_executor = ThreadPoolExecutor(
+                        max_workers=settings.password_hash_workers,
+                        thread_name_prefix="password-hash",
+                    )
+        return cls._hash_executor
+
+    @classmethod
+    def shutdown_hash_executor(cls):
+        """Shut down the password hashing executor."""
+        with cls._hash_lock:
+            if cls._hash_executor is not None:
+                cls._hash_executor.shutdown(wait=False, cancel_futures=True)
+                cls._hash_executor = None
+                cls._hash_slots = None
+
+    @classmethod
+    async def _run_in_hash_pool(cls, func: Callable, *args):
+        """
+        Run a bcrypt call on the hashing pool without blocking the event loop.
+
+        Raises:
+            PasswordHashingBusyError: If the pool and its queue are full
+        """
+        executor = cls.get_hash_executor()
+        slots = cls._hash_slots
+
+        if not slots.acquire(blocking=False):
+            raise PasswordHashingBusyError(
+                "Password hashing capacity exhausted, please retry later"
+            )
+
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+
+        # Release on completion rather than on await, so cancelled requests
+        # keep counting against the limit until their bcrypt call finishes.
+        future.add_done_callback(lambda _: slots.release())
+        return await asyncio.wrap_future(future)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """
+        Hash a plain text password on the dedicated hashing pool.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            Hashed password
+
+        Raises:
+            PasswordHashingBusyError: If the hashing pool is saturated
+        """
+        return await cls._run_in_hash_pool(cls.pwd_context.hash, password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        Verify a password on the dedicated hashing pool.
+
+        Args:
+            plain_password: Plain text password
+            hashed_password: Hashed password from database
+
+        Returns:
+            True if password matches, False otherwise
+
+        Raises:
+            PasswordHashingBusyError: If the hashing pool is saturated
+        """
+        return await cls._run_in_hash_pool(
+            cls.pwd_context.verify, plain_password, hashed_password
+        )
+
     @classmethod
     def create_access_token(
         cls, data: dict, expires_delta: Optional[timedelta] = None
@@ -86,3 +214,13 @@ class AuthService:
             return payload
         except JWTError:
             return None
+
+
+# Tokens are tagged by admin ID and organization ID, so changes to either
+# document made by other processes drop the affected verifications.
+for _collection_name in InvalidationBus.WATCHED_COLLECTIONS:
+    InvalidationBus.subscribe(
+        _collection_name,
+        lambda document_id, document: AuthService.invalidate_cached_tokens(document_id),
+    )
+InvalidationBus.subscribe_reset(AuthService.token_cache.clear)
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from pymongo.database import Database
+
+
+class CollectionCatalog:
+    """
+    In-process cache of which collections exist in a database.
+
+    Names are looked up lazily with listCollections filtered by name, so a
+    miss never transfers the whole catalog. Answers are trusted for
+    ttl_seconds and then re-checked, which picks up collections created or
+    dropped by other workers. Changes made through DatabaseService are
+    applied immediately. Expired answers are forgotten when next looked up,
+    and at most max_entries names are kept, dropping the least recently
+    checked first.
+    """
+
+    def __init__(self, database: Database, ttl_seconds: float, max_entries: int):
+        self.database = database
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._existing: set = set()
+        self._checked_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            True if exists, False otherwise
+        """
+        cached = self._lookup(collection_name)
+        if cached is not None:
+            return cached
+
+        found = bool(
+            self.database.list_collection_names(filter={"name": collection_name})
+        )
+        self._record(collection_name, found)
+        return found
+
+    def mark_created(self, collection_name: str):
+        """Record that a collection now exists."""
+        self._record(collection_name, True)
+
+    def mark_dropped(self, collection_name: str):
+        """Record that a collection no longer exists."""
+        self._record(collection_name, False)
+
+    def clear(self):
+        """Forget everything; the next lookups go to the server."""
+        with self._lock:
+            self._existing.clear()
+            self._checked_at.clear()
+
+    def stats(self) -> dict:
+        """
+        Get catalog counters for monitoring.
+
+        Returns:
+            Dictionary with known collections and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "tracked": len(self._checked_at),
+                "existing": len(self._existing),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _lookup(self, collection_name: str) -> Optional[bool]:
+        """Return the cached answer if it is still fresh, else None."""
+        with self._lock:
+            checked_at = self._checked_at.get(collection_name)
+            if checked_at is not None:
+                if time.monotonic() - checked_at < self.ttl_seconds:
+                    self.hits += 1
+                    return collection_name in self._existing
+                # Expired; the caller re-checks and records a fresh answer
+                self._forget(collection_name)
+            self.misses += 1
+            return None
+
+    def _record(self, collection_name: str, found: bool):
+        """Store an answer together with the time it was observed."""
+        with self._lock:
+            if found:
+                self._existing.add(collection_name)
+            else:
+                self._existing.discard(collection_name)
+            self._checked_at[collection_name] = time.monotonic()
+            self._checked_at.move_to_end(collection_name)
+
+            while len(self._checked_at) > self.max_entries:
+                self._forget(next(iter(self._checked_at)))
+                self.evictions += 1
+
+    def _forget(self, collection_name: str):
+        """Drop a name's answer; the caller holds the lock."""
+        self._checked_at.pop(collection_name, None)
+        self._existing.discard(collection_name)
@@ -0,0 +1,313 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+from src.config.database import db, async_db
+from src.config.settings import settings
+from src.services.database_service import DatabaseService
+from src.services.tenant_collection import TENANT_STORAGE_HYBRID
+from src.utils.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# How long a refill lease is held; a refill stops creating collections after
+# half of it, and spares left pending this long are taken as abandoned
+REFILL_LEASE_SECONDS = 30
+
+
+class CollectionPool:
+    """
+    Pool of pre-created tenant collections.
+
+    Creating a collection takes file creation and catalog locks on the
+    server, which dominate organization creation latency during signup
+    spikes. A background thread keeps collection_pool_size spare collections,
+    each named after a pre-allocated organization ID and listed in the
+    collection_pool ledger. create_organization claims a spare by deleting its
+    ledger entry (atomic across workers) and adopts its ID, so no collection
+    is created on the request path; callers create one as before when the
+    pool is empty. Claims, misses and claim latency are recorded under
+    "collection_pool.*".
+
+    Every process runs a refill thread, but only the holder of a lease in
+    collection_pool_lease refills, so the pool is not overfilled once per
+    worker. A spare's ledger entry is written as pending before its
+    collection is created, so a crashed refill leaves a ledger entry that a
+    later refill finishes instead of an untracked collection.
+    """
+
+    LEDGER_COLLECTION = "collection_pool"
+    LEASE_COLLECTION = "collection_pool_lease"
+
+    _thread: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+    _lease_owner = ObjectId()
+
+    available = 0
+    refill_rate = 0.0
+
+    @staticmethod
+    def enabled() -> bool:
+        """
+        Whether the pool is in use.
+
+        Spares live in the main database, so the pool is off while tenants
+        are placed across several databases. It is also off when new
+        organizations get no dedicated collection up front (hybrid storage or
+        lazy collections), as in OrganizationService.creates_collection_upfront.
+        """
+        return (
+            settings.collection_pool_size > 0
+            and not settings.tenant_database_targets
+            and settings.tenant_storage_mode != TENANT_STORAGE_HYBRID
+            and not settings.lazy_tenant_collections
+        )
+
+    @classmethod
+    def target_size(cls) -> int:
+        """Number of spares to keep; 0 while the pool is off, so spares are trimmed."""
+        return settings.collection_pool_size if cls.enabled() else 0
+
+    @classmethod
+    def claim(cls) -> Optional[ObjectId]:
+        """
+        Take a spare collection out of the pool.
+
+        Returns:
+            Organization ID the spare collection is named after, or None if
+            the pool is empty
+        """
+        if not cls.enabled():
+            return None
+
+        started = time.monotonic()
+        spare = db[cls.LEDGER_COLLECTION].find_one_and_delete(
+            {"pending": {"$exists": False}}, sort=[("_id", ASCENDING)]
+        )
+        return cls._record_claim(spare, started)
+
+    @classmethod
+    async def claim_async(cls) -> Optional[ObjectId]:
+        """Async version of claim."""
+        if not cls.enabled():
+            return None
+
+        started = time.monotonic()
+        spare = await async_db[cls.LEDGER_COLLECTION].find_one_and_delete(
+            {"pending": {"$exists": False}}, sort=[("_id", ASCENDING)]
+        )
+        return cls._record_claim(spare, started)
+
+    @classmethod
+    def release(cls, organization_id: ObjectId):
+        """
+        Return a claimed spare that ended up unused.
+
+        Args:
+            organization_id: ID returned by claim
+        """
+        try:
+            db[cls.LEDGER_COLLECTION].insert_one(cls._ledger_entry(organization_id))
+            cls.available += 1
+        except DuplicateKeyError:
+            pass
+
+    @classmethod
+    async def release_async(cls, organization_id: ObjectId):
+        """Async version of release."""
+        try:
+            await async_db[cls.LEDGER_COLLECTION].insert_one(
+                cls._ledger_entry(organization_id)
+            )
+            cls.available += 1
+        except DuplicateKeyError:
+            pass
+
+    @classmethod
+    def refill(cls) -> int:
+        """
+        Fill or trim the pool, if this process holds the refill lease.
+
+        At most collection_pool_refill_batch collections are created or
+        dropped per call, which with the refill interval bounds the DDL load
+        the pool puts on the server. Spares above a reduced pool size, or all
+        of them once the pool is turned off, are trimmed, and spares
+        abandoned by a crashed refill are finished.
+
+        Returns:
+            Number of spare collections created
+        """
+        if not cls._acquire_lease():
+            return 0
+
+        ledger = db[cls.LEDGER_COLLECTION]
+        started = time.monotonic()
+        deadline = started + REFILL_LEASE_SECONDS / 2
+        cls._finish_abandoned()
+
+        missing = cls.target_size() - ledger.count_documents({})
+        if missing < 0:
+            cls._trim(min(-missing, settings.collection_pool_refill_batch))
+        to_create = min(missing, settings.collection_pool_refill_batch)
+
+        created = 0
+        while (
+            created < to_create
+            and time.monotonic() < deadline
+            and not cls._stop_event.is_set()
+        ):
+            organization_id = ObjectId()
+            collection_started = time.monotonic()
+            ledger.insert_one({**cls._ledger_entry(organization_id), "pending": True})
+            DatabaseService.create_dynamic_collection(
+                DatabaseService.tenant_collection_name(organization_id)
+            )
+            ledger.update_one({"_id": organization_id}, {"$unset": {"pending": ""}})
+            Metrics.observe(
+                "collection_pool.create_seconds", time.monotonic() - collection_started
+            )
+            created += 1
+
+        elapsed = time.monotonic() - started
+        if created:
+            Metrics.increment("collection_pool.created", created)
+            cls.refill_rate = created / elapsed if elapsed > 0 else 0.0
+        cls.available = ledger.count_documents({"pending": {"$exists": False}})
+        return created
+
+    @classmethod
+    def start(cls):
+        """
+        Keep the pool filled from a background thread.
+
+        The thread also runs while the pool is off but spares are left from
+        an earlier configuration, and stops once they are trimmed.
+        """
+        if cls._thread is not None:
+            return
+        if not cls.enabled() and not cls._has_spares():
+            return
+
+        cls._stop_event.clear()
+        cls._thread = threading.Thread(
+            target=cls._refill_loop, name="collection-pool", daemon=True
+        )
+        cls._thread.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the refill thread."""
+        cls._stop_event.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Get pool fill level for monitoring.
+
+        Returns:
+            Dictionary with target size, spares available at the last refill
+            and the rate (collections per second) of the last refill
+        """
+        return {
+            "target": cls.target_size(),
+            "available": cls.available,
+            "refill_rate": cls.refill_rate,
+        }
+
+    @classmethod
+    def _acquire_lease(cls) -> bool:
+        """Take or renew the refill lease; False while another process holds it."""
+        now = datetime.now(timezone.utc)
+        try:
+            db[cls.LEASE_COLLECTION].update_one(
+                {
+                    "_id": "refill",
+                    "$or": [
+                        {"owner": cls._lease_owner},
+                        {"expires_at": {"$lt": now}},
+                    ],
+                },
+                {
+                    "$set": {
+                        "owner": cls._lease_owner,
+                        "expires_at": now + timedelta(seconds=REFILL_LEASE_SECONDS),
+                    }
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @classmethod
+    def _has_spares(cls) -> bool:
+        """Whether the ledger lists any spare, pending or not."""
+        return db[cls.LEDGER_COLLECTION].find_one({}, {"_id": 1}) is not None
+
+    @classmethod
+    def _finish_abandoned(cls):
+        """Create the collections of spares a crashed refill left pending."""
+        ledger = db[cls.LEDGER_COLLECTION]
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=REFILL_LEASE_SECONDS)
+        for spare in ledger.find({"pending": True, "created_at": {"$lt": cutoff}}):
+            DatabaseService.create_dynamic_collection(spare["collection_name"])
+            ledger.update_one({"_id": spare["_id"]}, {"$unset": {"pending": ""}})
+
+    @classmethod
+    def _trim(cls, count: int):
+        """Drop spares above the pool size, newest first."""
+        ledger = db[cls.LEDGER_COLLECTION]
+        trimmed = 0
+        while trimmed < count:
+            # Deleting the entry first keeps a concurrent claim from taking it
+            spare = ledger.find_one_and_delete(
+                {"pending": {"$exists": False}}, sort=[("_id", DESCENDING)]
+            )
+            if spare is None:
+                break
+            DatabaseService.drop_collection(spare["collection_name"])
+            trimmed += 1
+        if trimmed:
+            Metrics.increment("collection_pool.trimmed", trimmed)
+
+    @staticmethod
+    def _ledger_entry(organization_id: ObjectId) -> dict:
+        """Build the ledger document of a spare collection."""
+        return {
+            "_id": organization_id,
+            "collection_name": DatabaseService.tenant_collection_name(organization_id),
+            "created_at": datetime.now(timezone.utc),
+        }
+
+    @classmethod
+    def _record_claim(cls, spare: Optional[dict], started: float) -> Optional[ObjectId]:
+        """Record the outcome of a claim and return the claimed ID."""
+        Metrics.observe("collection_pool.claim_seconds", time.monotonic() - started)
+        if spare is None:
+            Metrics.increment("collection_pool.misses")
+            return None
+
+        Metrics.increment("collection_pool.claims")
+        cls.available = max(0, cls.available - 1)
+        DatabaseService.catalog.mark_created(spare["collection_name"])
+        return spare["_id"]
+
+    @classmethod
+    def _refill_loop(cls):
+        """Refill a batch on every interval, until a turned-off pool is empty."""
+        while True:
+            try:
+                cls.refill()
+                if not cls.enabled() and not cls._has_spares():
+                    return
+            except Exception:
+                logger.exception("Refilling the collection pool failed")
+            if cls._stop_event.wait(settings.collection_pool_refill_interval_seconds):
+                return
@@ -1,13 +1,91 @@
 import re
 from typing import Optional
+from bson import ObjectId
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.client_session import ClientSession
 from pymongo.collection import Collection
 from pymongo.errors import CollectionInvalid
-from src.config.database import db
+from src.config.database import (
+    PRIMARY_TARGET,
+    AsyncDatabaseConfig,
+    DatabaseConfig,
+    db,
+    async_db,
+)
+from src.config.settings import settings
+from src.services.collection_catalog import CollectionCatalog
+from src.utils.hash_ring import HashRing
+from src.services.tenant_collection import (
+    AsyncTenantCollection,
+    StorageMode,
+    TenantCollection,
+)
 
 
 class DatabaseService:
     """Service class for dynamic database and collection operations."""
 
+    catalog = CollectionCatalog(
+        db,
+        settings.collection_catalog_ttl_seconds,
+        settings.collection_catalog_max_entries,
+    )
+    # Catalogs of the extra placement targets, created on first use
+    _target_catalogs: dict = {}
+    _placement_ring: Optional[HashRing] = None
+
+    @staticmethod
+    def place_organization(organization_id: ObjectId) -> Optional[str]:
+        """
+        Pick the database an organization's collection is created in.
+
+        Organizations are spread over the main database and
+        settings.tenant_database_targets by consistent hashing of their ID,
+        so adding a target only moves the placement of about 1/N of new
+        organizations. The result is recorded as database_target on the
+        organization and never recomputed.
+
+        Args:
+            organization_id: Organization ObjectId
+
+        Returns:
+            Target name, or None for the main database
+        """
+        if not settings.tenant_database_targets:
+            return None
+
+        if DatabaseService._placement_ring is None:
+            DatabaseService._placement_ring = HashRing(
+                [PRIMARY_TARGET, *settings.tenant_database_targets],
+                settings.placement_virtual_nodes,
+            )
+        target = DatabaseService._placement_ring.get(str(organization_id))
+        return None if target == PRIMARY_TARGET else target
+
+    @staticmethod
+    def catalog_for(target: Optional[str] = None) -> CollectionCatalog:
+        """
+        Get the collection catalog of a placement target.
+
+        Args:
+            target: Target name, None for the main database
+
+        Returns:
+            Collection catalog of that database
+        """
+        if target is None or target == PRIMARY_TARGET:
+            return DatabaseService.catalog
+
+        catalog = DatabaseService._target_catalogs.get(target)
+        if catalog is None:
+            catalog = DatabaseService._target_catalogs[target] = CollectionCatalog(
+                DatabaseConfig.get_target_database(target),
+                settings.collection_catalog_ttl_seconds,
+                settings.collection_catalog_max_entries,
+            )
+        return catalog
+
     @staticmethod
     def sanitize_org_name(name: str) -> str:
         """
@@ -26,10 +104,29 @@ class DatabaseService:
         sanitized = sanitized.strip("_")
         return sanitized
 
+    @staticmethod
+    def tenant_collection_name(organization_id: ObjectId) -> str:
+        """
+        Generate the MongoDB collection name for an organization.
+
+        Collections are keyed by the immutable organization ID, so renaming an
+        organization never moves its data.
+
+        Args:
+            organization_id: Organization ObjectId
+
+        Returns:
+            Collection name in format: org_<organization_id>
+        """
+        return f"org_{organization_id}"
+
     @staticmethod
     def generate_collection_name(org_name: str) -> str:
         """
-        Generate MongoDB collection name from org name.
+        Generate the legacy, name-derived MongoDB collection name.
+
+        Only used to recognise collections created before collections were
+        keyed by organization ID (see scripts/migrate_collection_names.py).
 
         Args:
             org_name: Name of the org
@@ -41,12 +138,19 @@ class DatabaseService:
         return f"org_{sanitized}"
 
     @staticmethod
-    def create_dynamic_collection(collection_name: str) -> Collection:
+    def create_dynamic_collection(
+        collection_name: str,
+        session: Optional[ClientSession] = None,
+        target: Optional[str] = None,
+    ) -> Collection:
         """
         Create a new collection for an org.
 
         Args:
             collection_name: Name of the collection to create
+            session: Session of a running transaction (optional); the caller
+                must then record the collection in the catalog after committing
+            target: Placement target to create it in (defaults to the main database)
 
         Returns:
             Created collection handle
@@ -54,82 +158,230 @@ class DatabaseService:
         Raises:
             CollectionInvalid: If collection already exists or name is invalid
         """
+        database = DatabaseConfig.get_target_database(target)
+        if session is not None:
+            # listCollections is not allowed in a transaction, so skip the check
+            return database.create_collection(
+                collection_name, session=session, check_exists=False
+            )
+
         try:
             # Create collection explicitly
-            collection = db.create_collection(collection_name)
-            return collection
+            collection = database.create_collection(collection_name)
         except CollectionInvalid:
             # Collection already exists
-            return db[collection_name]
+            collection = database[collection_name]
+        DatabaseService.catalog_for(target).mark_created(collection_name)
+        return collection
 
     @staticmethod
-    def get_collection_handle(collection_name: str) -> Collection:
+    async def create_dynamic_collection_async(
+        collection_name: str,
+        session: Optional[AsyncClientSession] = None,
+        target: Optional[str] = None,
+    ) -> AsyncCollection:
+        """Async version of create_dynamic_collection."""
+        database = AsyncDatabaseConfig.get_target_database(target)
+        if session is not None:
+            return await database.create_collection(
+                collection_name, session=session, check_exists=False
+            )
+
+        try:
+            collection = await database.create_collection(collection_name)
+        except CollectionInvalid:
+            # Collection already exists
+            collection = database[collection_name]
+        DatabaseService.catalog_for(target).mark_created(collection_name)
+        return collection
+
+    @staticmethod
+    def get_collection_handle(
+        collection_name: str, target: Optional[str] = None
+    ) -> Collection:
         """
         Get a handle to an existing collection.
 
         Args:
             collection_name: Name of the collection
+            target: Placement target holding it (defaults to the main database)
 
         Returns:
             Collection handle
         """
-        return db[collection_name]
+        return DatabaseConfig.get_target_database(target)[collection_name]
 
     @staticmethod
-    def drop_collection(collection_name: str) -> bool:
+    def get_collection_handle_async(
+        collection_name: str, target: Optional[str] = None
+    ) -> AsyncCollection:
+        """Async version of get_collection_handle."""
+        return AsyncDatabaseConfig.get_target_database(target)[collection_name]
+
+    @staticmethod
+    def get_tenant_handle(org: dict) -> TenantCollection:
         """
-        Drop a collection from the database.
+        Get a handle to an organization's data, wherever it is stored.
+
+        Organizations with a storage_mode live in the shared tenant collection
+        and get a handle scoped to their tenant_id; all others own
+        collection_name in their database_target. Writes through the handle
+        are rejected while the organization is being promoted to a dedicated
+        collection or moved to another database (writes_fenced).
 
         Args:
-            collection_name: Name of the collection to drop
+            org: Organization document
+
+        Returns:
+            Tenant collection handle
+        """
+        storage_mode = org.get("storage_mode", StorageMode.DEDICATED)
+        if storage_mode == StorageMode.DEDICATED:
+            return TenantCollection(
+                DatabaseService.get_collection_handle(
+                    org["collection_name"], org.get("database_target")
+                ),
+                writes_fenced=org.get("writes_fenced", False),
+            )
+        return TenantCollection(
+            db[settings.shared_tenant_collection],
+            tenant_id=org["_id"],
+            writes_fenced=storage_mode == StorageMode.PROMOTING,
+        )
+
+    @staticmethod
+    def get_tenant_handle_async(org: dict) -> AsyncTenantCollection:
+        """Async version of get_tenant_handle."""
+        storage_mode = org.get("storage_mode", StorageMode.DEDICATED)
+        if storage_mode == StorageMode.DEDICATED:
+            return AsyncTenantCollection(
+                DatabaseService.get_collection_handle_async(
+                    org["collection_name"], org.get("database_target")
+                ),
+                writes_fenced=org.get("writes_fenced", False),
+            )
+        return AsyncTenantCollection(
+            async_db[settings.shared_tenant_collection],
+            tenant_id=org["_id"],
+            writes_fenced=storage_mode == StorageMode.PROMOTING,
+        )
+
+    @staticmethod
+    def drop_tenant_storage(org: dict) -> bool:
+        """
+        Delete all data of an organization in either storage mode.
+
+        The shared collection is cleaned up regardless of the recorded mode,
+        since the organization document may predate a promotion.
+
+        Args:
+            org: Organization document
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            db.drop_collection(collection_name)
-            return True
+            db[settings.shared_tenant_collection].delete_many({"tenant_id": org["_id"]})
         except Exception:
             return False
+        return DatabaseService.drop_collection(
+            org["collection_name"], org.get("database_target")
+        )
 
     @staticmethod
-    def migrate_collection_data(
-        source_collection_name: str, target_collection_name: str
-    ) -> bool:
+    async def drop_tenant_storage_async(org: dict) -> bool:
+        """Async version of drop_tenant_storage."""
+        try:
+            await async_db[settings.shared_tenant_collection].delete_many(
+                {"tenant_id": org["_id"]}
+            )
+        except Exception:
+            return False
+        return await DatabaseService.drop_collection_async(
+            org["collection_name"], org.get("database_target")
+        )
+
+    @staticmethod
+    def drop_collection(collection_name: str, target: Optional[str] = None) -> bool:
         """
-        Migrate all data from source collection to target collection.
+        Drop a collection from the database.
 
         Args:
-            source_collection_name: Source collection name
-            target_collection_name: Target collection name
+            collection_name: Name of the collection to drop
+            target: Placement target holding it (defaults to the main database)
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            source_collection = db[source_collection_name]
-            target_collection = db[target_collection_name]
-
-            # Get all documents from source
-            documents = list(source_collection.find())
-
-            # Insert into target if documents exist
-            if documents:
-                target_collection.insert_many(documents)
+            DatabaseConfig.get_target_database(target).drop_collection(collection_name)
+            DatabaseService.catalog_for(target).mark_dropped(collection_name)
+            return True
+        except Exception:
+            return False
 
+    @staticmethod
+    async def drop_collection_async(
+        collection_name: str, target: Optional[str] = None
+    ) -> bool:
+        """Async version of drop_collection."""
+        try:
+            await AsyncDatabaseConfig.get_target_database(target).drop_collection(
+                collection_name
+            )
+            DatabaseService.catalog_for(target).mark_dropped(collection_name)
             return True
         except Exception:
             return False
 
     @staticmethod
-    def collection_exists(collection_name: str) -> bool:
+    def move_collection(
+        source_collection_name: str, target_collection_name: str
+    ) -> str:
+        """
+        Rename a tenant collection ahead of the metadata cutover, idempotently.
+
+        renameCollection is a server-side, metadata-only change that keeps
+        indexes and takes constant time regardless of collection size. A
+        rename that already happened before a restart is detected.
+
+        Args:
+            source_collection_name: Collection the organization points at now
+            target_collection_name: Collection it should point at afterwards
+
+        Returns:
+            "renamed", "created" or "already_moved"
+
+        Raises:
+            Exception: If both collections already exist
+        """
+        source_exists = DatabaseService.collection_exists(source_collection_name)
+        target_exists = DatabaseService.collection_exists(target_collection_name)
+        if source_exists and target_exists:
+            raise Exception(f"Collection {target_collection_name} already exists")
+        if source_exists:
+            db[source_collection_name].rename(target_collection_name)
+            DatabaseService.catalog.mark_dropped(source_collection_name)
+            DatabaseService.catalog.mark_created(target_collection_name)
+            return "renamed"
+        if target_exists:
+            return "already_moved"
+        DatabaseService.create_dynamic_collection(target_collection_name)
+        return "created"
+
+    @staticmethod
+    def collection_exists(collection_name: str, target: Optional[str] = None) -> bool:
         """
         Check if a collection exists in the database.
 
+        Answered from the collection catalog, which only asks the server
+        about this one name when it has no fresh answer cached.
+
         Args:
             collection_name: Name of the collection
+            target: Placement target to look in (defaults to the main database)
 
         Returns:
             True if exists, False otherwise
         """
-        return collection_name in db.list_collection_names()
+        return DatabaseService.catalog_for(target).exists(collection_name)
@@ -0,0 +1,282 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from bson import ObjectId
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.client_session import ClientSession
+from pymongo.errors import OperationFailure, PyMongoError
+from src.config.database import db, async_db
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Server error codes meaning change streams cannot be used on this deployment
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}
+# The resume token fell off the oplog; events in between are lost
+CHANGE_STREAM_HISTORY_LOST = {280, 286}
+# Polled documents updated this long before the last poll are read again,
+# which absorbs clock skew between application servers
+POLL_OVERLAP = timedelta(seconds=5)
+
+
+class _ChangeStreamsUnavailable(Exception):
+    """Raised when the deployment does not support change streams."""
+
+    pass
+
+
+class InvalidationBus:
+    """
+    Propagates writes made by any process to this process' caches.
+
+    A background thread tails a change stream on the watched master
+    collections and calls the handlers subscribed for each collection with
+    the changed document's _id and its current version (None once deleted).
+    On a standalone mongod, where change streams are unavailable, it polls
+    documents whose updated_at moved past a high-water mark instead, and
+    picks up deletions from tombstones written by record_deletion. Whenever
+    events may have been missed, reset handlers drop whole caches.
+    """
+
+    WATCHED_COLLECTIONS = ("organizations", "admin_users")
+    TOMBSTONES_COLLECTION = "cache_tombstones"
+
+    _handlers: dict = {}
+    _reset_handlers: list = []
+    _thread: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+
+    mode: Optional[str] = None
+    events = 0
+    resets = 0
+
+    @classmethod
+    def subscribe(
+        cls,
+        collection_name: str,
+        handler: Callable[[ObjectId, Optional[dict]], None],
+    ):
+        """
+        Register a handler for changes to a watched collection.
+
+        Args:
+            collection_name: One of WATCHED_COLLECTIONS
+            handler: Callable(document_id, document) where document is the
+                current version, or None if it was deleted or is unknown
+        """
+        cls._handlers.setdefault(collection_name, []).append(handler)
+
+    @classmethod
+    def subscribe_reset(cls, handler: Callable[[], None]):
+        """
+        Register a handler that drops a whole cache when events may be lost.
+
+        Args:
+            handler: Callable without arguments
+        """
+        cls._reset_handlers.append(handler)
+
+    @classmethod
+    def publish(
+        cls,
+        collection_name: str,
+        document_id: ObjectId,
+        document: Optional[dict] = None,
+    ):
+        """
+        Deliver one change to the handlers of its collection.
+
+        Args:
+            collection_name: Collection the document belongs to
+            document_id: _id of the changed document
+            document: Current version of the document, or None
+        """
+        cls.events += 1
+        for handler in cls._handlers.get(collection_name, []):
+            try:
+                handler(document_id, document)
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", collection_name)
+
+    @classmethod
+    def reset(cls):
+        """Drop every subscribed cache."""
+        cls.resets += 1
+        for handler in cls._reset_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("Cache reset handler failed")
+
+    @classmethod
+    def tombstone(cls, collection_name: str, document_id: ObjectId, **fields) -> dict:
+        """Build a tombstone document for a deleted document."""
+        return {
+            "collection": collection_name,
+            "document_id": document_id,
+            "document": fields or None,
+            "updated_at": datetime.now(timezone.utc),
+        }
+
+    @classmethod
+    def record_deletion(
+        cls,
+        collection_name: str,
+        document_id: ObjectId,
+        session: Optional[ClientSession] = None,
+        **fields,
+    ):
+        """
+        Leave a tombstone so polling processes notice a deletion.
+
+        Args:
+            collection_name: Collection the document was deleted from
+            document_id: _id of the deleted document
+            session: Session of the transaction deleting the document (optional)
+            fields: Fields of the deleted document handlers may need
+        """
+        db[cls.TOMBSTONES_COLLECTION].insert_one(
+            cls.tombstone(collection_name, document_id, **fields), session=session
+        )
+
+    @classmethod
+    async def record_deletion_async(
+        cls,
+        collection_name: str,
+        document_id: ObjectId,
+        session: Optional[AsyncClientSession] = None,
+        **fields,
+    ):
+        """Async version of record_deletion."""
+        await async_db[cls.TOMBSTONES_COLLECTION].insert_one(
+            cls.tombstone(collection_name, document_id, **fields), session=session
+        )
+
+    @classmethod
+    def start(cls):
+        """Start the background watcher thread."""
+        if settings.cache_invalidation_mode == "off" or cls._thread is not None:
+            return
+
+        cls._stop_event.clear()
+        cls._thread = threading.Thread(
+            target=cls._run, name="cache-invalidation", daemon=True
+        )
+        cls._thread.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the background watcher thread."""
+        cls._stop_event.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+        cls.mode = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Get watcher counters for monitoring.
+
+        Returns:
+            Dictionary with the active mode and event/reset counters
+        """
+        return {"mode": cls.mode, "events": cls.events, "resets": cls.resets}
+
+    @classmethod
+    def _run(cls):
+        """Watch change streams, falling back to polling if unsupported."""
+        if settings.cache_invalidation_mode in ("auto", "change_stream"):
+            try:
+                cls._watch_change_streams()
+                return
+            except _ChangeStreamsUnavailable:
+                if settings.cache_invalidation_mode == "change_stream":
+                    logger.error("Change streams unavailable; cache invalidation disabled")
+                    cls.mode = None
+                    return
+                logger.warning("Change streams unavailable; polling for cache invalidation")
+
+        cls._poll()
+
+    @classmethod
+    def _watch_change_streams(cls):
+        """Tail a change stream on the watched collections until stopped."""
+        pipeline = [
+            {
+                "$match": {
+                    "ns.coll": {"$in": list(cls.WATCHED_COLLECTIONS)},
+                    "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+                }
+            }
+        ]
+        resume_token = None
+        opened = False
+
+        while not cls._stop_event.is_set():
+            try:
+                with db.watch(
+                    pipeline,
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                    max_await_time_ms=1000,
+                ) as stream:
+                    if opened and resume_token is None:
+                        # Reopened without a position: changes may be lost
+                        cls.reset()
+                    opened = True
+                    cls.mode = "change_stream"
+
+                    while not cls._stop_event.is_set() and stream.alive:
+                        change = stream.try_next()
+                        resume_token = stream.resume_token
+                        if change is not None:
+                            cls.publish(
+                                change["ns"]["coll"],
+                                change["documentKey"]["_id"],
+                                change.get("fullDocument"),
+                            )
+            except OperationFailure as e:
+                if not opened and e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    raise _ChangeStreamsUnavailable() from e
+                if e.code in CHANGE_STREAM_HISTORY_LOST:
+                    resume_token = None
+                logger.warning("Change stream failed, reopening: %s", e)
+                cls._stop_event.wait(1)
+            except PyMongoError as e:
+                logger.warning("Change stream failed, reopening: %s", e)
+                cls._stop_event.wait(1)
+            except Exception as e:
+                if not opened:
+                    raise _ChangeStreamsUnavailable() from e
+                raise
+
+    @classmethod
+    def _poll(cls):
+        """Poll the updated_at high-water mark of the watched collections."""
+        cls.mode = "poll"
+        high_water_mark = datetime.now(timezone.utc)
+
+        while not cls._stop_event.wait(settings.cache_invalidation_poll_interval_seconds):
+            polled_at = datetime.now(timezone.utc)
+            query = {"updated_at": {"$gt": high_water_mark - POLL_OVERLAP}}
+            try:
+                for collection_name in cls.WATCHED_COLLECTIONS:
+                    for document in db[collection_name].find(
+                        query, {"organization_name": 1, "organization_id": 1}
+                    ):
+                        cls.publish(collection_name, document["_id"], document)
+
+                for tombstone in db[cls.TOMBSTONES_COLLECTION].find(query):
+                    cls.publish(
+                        tombstone["collection"],
+                        tombstone["document_id"],
+                        tombstone.get("document"),
+                    )
+            except PyMongoError:
+                # Keep the old mark so the next poll covers the gap
+                logger.exception("Polling for cache invalidation failed")
+                continue
+
+            high_water_mark = polled_at
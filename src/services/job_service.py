@@ -0,0 +1,344 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from src.config.database import db, async_db
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobConflictError(Exception):
+    """Raised when an organization already has an active job."""
+
+    pass
+
+
+class JobStatus:
+    """Lifecycle states of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobService:
+    """
+    Service class for background jobs persisted in the master database.
+
+    Jobs live in the `jobs` collection and run on a local thread pool, so no
+    external broker is needed. Each job type is handled by a function
+    registered with register_handler, which receives the job document and a
+    callback for reporting copy progress. Handlers must be safe to re-run:
+    jobs whose worker died are picked up again by a live worker.
+    """
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    _handlers: dict = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    _heartbeat_thread: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+
+    @classmethod
+    def register_handler(cls, job_type: str, handler: Callable):
+        """
+        Register the function that executes jobs of a given type.
+
+        Args:
+            job_type: Job type name
+            handler: Callable(job, report_progress) returning an optional result dict
+        """
+        cls._handlers[job_type] = handler
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        """Get the job worker pool, creating it on first use."""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=settings.job_workers,
+                        thread_name_prefix="job-worker",
+                    )
+        return cls._executor
+
+    @classmethod
+    def start(cls):
+        """Start the heartbeat thread and resume jobs orphaned by dead workers."""
+        cls.get_executor()
+        cls.resume_orphaned_jobs()
+
+        if cls._heartbeat_thread is None:
+            cls._stop_event.clear()
+            cls._heartbeat_thread = threading.Thread(
+                target=cls._heartbeat_loop, name="job-heartbeat", daemon=True
+            )
+            cls._heartbeat_thread.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the heartbeat thread and the worker pool."""
+        cls._stop_event.set()
+        if cls._heartbeat_thread is not None:
+            cls._heartbeat_thread.join(timeout=5)
+            cls._heartbeat_thread = None
+
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+
+    @staticmethod
+    def build_job(job_type: str, organization_id: ObjectId, params: dict) -> dict:
+        """
+        Build a new job document owned by this worker.
+
+        Args:
+            job_type: Registered job type
+            organization_id: Organization the job operates on
+            params: Handler parameters (must be BSON-serialisable)
+
+        Returns:
+            Job document ready for insertion
+        """
+        now = datetime.now(timezone.utc)
+        return {
+            "job_type": job_type,
+            "organization_id": organization_id,
+            "params": params,
+            "status": JobStatus.QUEUED,
+            # Only set while queued or running; backs the one-active-job index
+            "active": True,
+            "owner": JobService.worker_id,
+            "attempts": 0,
+            "progress": {"copied": 0, "total": 0, "docs_per_sec": 0.0},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "heartbeat_at": now,
+        }
+
+    @classmethod
+    def enqueue(cls, job_type: str, organization_id: ObjectId, params: dict) -> dict:
+        """
+        Persist a job and hand it to the local worker pool.
+
+        Args:
+            job_type: Registered job type
+            organization_id: Organization the job operates on
+            params: Handler parameters (must be BSON-serialisable)
+
+        Returns:
+            Created job document
+
+        Raises:
+            JobConflictError: If the organization already has an active job
+        """
+        job = cls.build_job(job_type, organization_id, params)
+
+        try:
+            result = db.jobs.insert_one(job)
+        except DuplicateKeyError:
+            raise JobConflictError(
+                "Another update is already in progress for this organization"
+            )
+        job["_id"] = result.inserted_id
+
+        cls.submit(job["_id"])
+        return job
+
+    @classmethod
+    async def enqueue_async(
+        cls, job_type: str, organization_id: ObjectId, params: dict
+    ) -> dict:
+        """Async version of enqueue."""
+        job = cls.build_job(job_type, organization_id, params)
+
+        try:
+            result = await async_db.jobs.insert_one(job)
+        except DuplicateKeyError:
+            raise JobConflictError(
+                "Another update is already in progress for this organization"
+            )
+        job["_id"] = result.inserted_id
+
+        cls.submit(job["_id"])
+        return job
+
+    @classmethod
+    def submit(cls, job_id: ObjectId):
+        """Schedule a persisted job on the local worker pool."""
+        cls.get_executor().submit(cls._run, job_id)
+
+    @staticmethod
+    def get_job(job_id: ObjectId) -> Optional[dict]:
+        """
+        Get job by ID.
+
+        Args:
+            job_id: Job ObjectId
+
+        Returns:
+            Job document or None if not found
+        """
+        return db.jobs.find_one({"_id": job_id})
+
+    @staticmethod
+    async def get_job_async(job_id: ObjectId) -> Optional[dict]:
+        """Async version of get_job."""
+        return await async_db.jobs.find_one({"_id": job_id})
+
+    @classmethod
+    def resume_orphaned_jobs(cls) -> int:
+        """
+        Take over active jobs whose owning worker stopped sending heartbeats.
+
+        Each orphan is claimed atomically, so only one live worker resumes it.
+        Jobs that already used up job_max_attempts are failed instead, so a job
+        that crashes its worker cannot loop forever.
+
+        Returns:
+            Number of jobs resumed
+        """
+        resumed = 0
+        while True:
+            now = datetime.now(timezone.utc)
+            cutoff = now - timedelta(seconds=settings.job_heartbeat_timeout_seconds)
+            job = db.jobs.find_one_and_update(
+                {"active": True, "heartbeat_at": {"$lt": cutoff}},
+                {
+                    "$set": {
+                        "owner": cls.worker_id,
+                        "status": JobStatus.QUEUED,
+                        "heartbeat_at": now,
+                        "updated_at": now,
+                    }
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                break
+
+            if job.get("attempts", 0) >= settings.job_max_attempts:
+                cls._finish(
+                    job["_id"],
+                    JobStatus.FAILED,
+                    error="Job was interrupted too many times",
+                )
+                continue
+
+            logger.warning("Resuming orphaned job %s", job["_id"])
+            cls.submit(job["_id"])
+            resumed += 1
+
+        return resumed
+
+    @classmethod
+    def _run(cls, job_id: ObjectId):
+        """Execute one job and record its outcome."""
+        job = db.jobs.find_one_and_update(
+            {"_id": job_id, "status": JobStatus.QUEUED, "owner": cls.worker_id},
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING,
+                    "started_at": datetime.now(timezone.utc),
+                    "updated_at": datetime.now(timezone.utc),
+                },
+                "$inc": {"attempts": 1},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            return
+
+        handler = cls._handlers.get(job["job_type"])
+        try:
+            if handler is None:
+                raise Exception(f"No handler for job type {job['job_type']}")
+            result = handler(job, cls._progress_reporter(job_id))
+            cls._finish(job_id, JobStatus.SUCCEEDED, result=result)
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            cls._finish(job_id, JobStatus.FAILED, error=str(e))
+
+    @staticmethod
+    def _progress_reporter(job_id: ObjectId) -> Callable[[dict, int], None]:
+        """Build a throttled callback that persists copy progress for a job."""
+        last_write = [0.0]
+
+        def report(stats: dict, total: int):
+            now = time.monotonic()
+            if now - last_write[0] < 1.0 and stats["documents"] < total:
+                return
+            last_write[0] = now
+
+            copied = stats["documents"]
+            rate = stats["docs_per_sec"]
+            progress = {
+                "copied": copied,
+                "total": max(total, copied),
+                "docs_per_sec": rate,
+            }
+            if rate > 0:
+                progress["eta_seconds"] = max(total - copied, 0) / rate
+
+            db.jobs.update_one(
+                {"_id": job_id},
+                {
+                    "$set": {
+                        "progress": progress,
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                },
+            )
+
+        return report
+
+    @staticmethod
+    def _finish(
+        job_id: ObjectId,
+        status: str,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ):
+        """Record the final status of a job and release its active slot."""
+        now = datetime.now(timezone.utc)
+        db.jobs.update_one(
+            {"_id": job_id},
+            {
+                "$set": {
+                    "status": status,
+                    "result": result,
+                    "error": error,
+                    "finished_at": now,
+                    "updated_at": now,
+                    "progress.eta_seconds": 0,
+                },
+                "$unset": {"active": ""},
+            },
+        )
+
+    @classmethod
+    def _heartbeat_loop(cls):
+        """Keep this worker's jobs alive and reap jobs of dead workers."""
+        while not cls._stop_event.wait(settings.job_heartbeat_interval_seconds):
+            try:
+                db.jobs.update_many(
+                    {"owner": cls.worker_id, "active": True},
+                    {"$set": {"heartbeat_at": datetime.now(timezone.utc)}},
+                )
+                cls.resume_orphaned_jobs()
+            except Exception:
+                logger.exception("Job heartbeat failed")
@@ -0,0 +1,496 @@
+import logging
+import re
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional
+from bson.binary import Binary
+from bson.codec_options import CodecOptions
+from bson.datetime_ms import DatetimeMS
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.max_key import MaxKey
+from bson.min_key import MinKey
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+from bson.regex import Regex
+from bson.timestamp import Timestamp
+from pymongo.collection import Collection
+from pymongo.errors import (
+    AutoReconnect,
+    BulkWriteError,
+    NetworkTimeout,
+)
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Documents are streamed as raw BSON: never decoded, and sized for free
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# Sampled _ids per partition when computing range boundaries
+SAMPLES_PER_PARTITION = 20
+
+# $type aliases of the BSON type brackets, in BSON comparison order. Query
+# operators such as $gt only match values within the bracket of their operand.
+BSON_TYPE_ORDER = [
+    "minKey",
+    "null",
+    "number",
+    "string",
+    "object",
+    "array",
+    "binData",
+    "objectId",
+    "bool",
+    "date",
+    "timestamp",
+    "regex",
+    "maxKey",
+]
+
+# $type names reported by the server that share a bracket with another type
+SERVER_TYPE_BRACKETS = {
+    "int": "number",
+    "long": "number",
+    "double": "number",
+    "decimal": "number",
+    "symbol": "string",
+}
+
+
+def bson_type_bracket(value: Any) -> str:
+    """
+    Get the $type alias of the comparison bracket a Python value encodes to.
+
+    Args:
+        value: Decoded BSON value, e.g. an _id
+
+    Returns:
+        Entry of BSON_TYPE_ORDER
+    """
+    if isinstance(value, MinKey):
+        return "minKey"
+    if isinstance(value, MaxKey):
+        return "maxKey"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float, Int64, Decimal128, Decimal)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, Mapping):
+        return "object"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    if isinstance(value, (bytes, Binary, uuid.UUID)):
+        return "binData"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, (datetime, DatetimeMS)):
+        return "date"
+    if isinstance(value, Timestamp):
+        return "timestamp"
+    if isinstance(value, (Regex, re.Pattern)):
+        return "regex"
+    raise TypeError(f"Unsupported _id type {type(value).__name__}")
+
+
+class MigrationService:
+    """Service class for copying tenant collections in bounded memory."""
+
+    @staticmethod
+    def copy_collection(
+        source: Collection,
+        target: Collection,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        query: Optional[dict] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        resume_after: Any = None,
+    ) -> dict:
+        """
+        Stream documents from source to target in fixed-size batches.
+
+        At most one batch is held in memory at a time. Documents are read in
+        _id order so that a failed read can resume after the last copied _id,
+        and a failed write retries only the current batch.
+
+        Args:
+            source: Collection to copy from
+            target: Collection to copy into (may live in another database)
+            batch_size: Documents per cursor batch and per insert
+            max_retries: Attempts per batch before giving up
+            query: Extra filter restricting which source documents are copied
+            progress_callback: Called with the running stats after each batch
+            resume_after: Only copy documents whose _id sorts after this one
+
+        Returns:
+            Copy statistics (documents, bytes, seconds, rates, retries)
+
+        Raises:
+            Exception: If a batch still fails after max_retries attempts
+        """
+        batch_size = batch_size or settings.migration_batch_size
+        max_retries = max_retries or settings.migration_max_retries
+
+        source = source.with_options(codec_options=RAW_CODEC_OPTIONS)
+        stats = {
+            "documents": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+            "docs_per_sec": 0.0,
+            "bytes_per_sec": 0.0,
+            "retries": 0,
+            "last_id": resume_after,
+        }
+        started = time.monotonic()
+
+        def open_cursor():
+            criteria = dict(query or {})
+            if stats["last_id"] is not None:
+                after = MigrationService.after_id_query(stats["last_id"])
+                criteria = {"$and": [criteria, after]}
+            return source.find(criteria, batch_size=batch_size).sort("_id", 1)
+
+        cursor = open_cursor()
+        batch = []
+        read_failures = 0
+
+        while True:
+            try:
+                document = next(cursor, None)
+            except (AutoReconnect, NetworkTimeout):
+                # Resume reading after the last document already flushed
+                read_failures += 1
+                stats["retries"] += 1
+                if read_failures > max_retries:
+                    raise
+                cursor.close()
+                batch = []
+                time.sleep(0.1 * 2**read_failures)
+                cursor = open_cursor()
+                continue
+
+            if document is not None:
+                batch.append(document)
+
+            if batch and (document is None or len(batch) >= batch_size):
+                MigrationService._insert_batch(target, batch, max_retries, stats)
+                stats["documents"] += len(batch)
+                stats["bytes"] += sum(len(doc.raw) for doc in batch)
+                stats["last_id"] = batch[-1]["_id"]
+                batch = []
+                read_failures = 0
+
+                MigrationService._update_rates(stats, started)
+                if progress_callback is not None:
+                    progress_callback(stats)
+
+            if document is None:
+                break
+
+        MigrationService._update_rates(stats, started)
+        logger.info(
+            "Copied %d documents (%d bytes) from %s to %s at %.0f docs/sec",
+            stats["documents"],
+            stats["bytes"],
+            source.full_name,
+            target.full_name,
+            stats["docs_per_sec"],
+        )
+        return stats
+
+    @staticmethod
+    def after_id_query(last_id: Any) -> dict:
+        """
+        Build the filter selecting documents sorted after an _id.
+
+        $gt only matches _ids of the same type bracket as last_id, so _ids of
+        every bracket that sorts later are matched by type instead.
+
+        Args:
+            last_id: Last _id already copied
+
+        Returns:
+            MongoDB filter document
+        """
+        bracket = bson_type_bracket(last_id)
+        later = BSON_TYPE_ORDER[BSON_TYPE_ORDER.index(bracket) + 1 :]
+        after = {"_id": {"$gt": last_id}}
+        if not later:
+            return after
+        return {"$or": [after, {"_id": {"$type": later}}]}
+
+    @staticmethod
+    def split_id_ranges(source: Collection, partitions: int) -> list:
+        """
+        Split the _id space of a collection into roughly equal ranges.
+
+        Boundaries are quantiles of a server-side $sample. Range bounds only
+        match _ids of their own type bracket, so a collection whose smallest
+        and largest _id differ in type is copied as a single range.
+
+        Args:
+            source: Collection to split
+            partitions: Desired number of ranges
+
+        Returns:
+            List of (lower, upper) bounds; lower is inclusive, upper exclusive,
+            and None means unbounded
+        """
+        if partitions <= 1:
+            return [(None, None)]
+
+        sample_size = partitions * SAMPLES_PER_PARTITION
+        if source.estimated_document_count() < sample_size:
+            return [(None, None)]
+
+        brackets = {
+            MigrationService._id_type_bracket(source, direction)
+            for direction in (1, -1)
+        }
+        if len(brackets) != 1:
+            return [(None, None)]
+
+        sampled = [
+            doc["_id"]
+            for doc in source.aggregate(
+                [
+                    {"$sample": {"size": sample_size}},
+                    {"$project": {"_id": 1}},
+                    {"$sort": {"_id": 1}},
+                ]
+            )
+        ]
+
+        boundaries = []
+        for i in range(1, partitions):
+            boundary = sampled[i * len(sampled) // partitions]
+            if not boundaries or boundary != boundaries[-1]:
+                boundaries.append(boundary)
+
+        lowers = [None] + boundaries
+        uppers = boundaries + [None]
+        return list(zip(lowers, uppers))
+
+    @staticmethod
+    def _id_type_bracket(source: Collection, direction: int) -> Optional[str]:
+        """Get the type bracket of the smallest (1) or largest (-1) _id."""
+        edge = next(
+            source.aggregate(
+                [
+                    {"$sort": {"_id": direction}},
+                    {"$limit": 1},
+                    {"$project": {"type": {"$type": "$_id"}}},
+                ]
+            ),
+            None,
+        )
+        if edge is None:
+            return None
+        return SERVER_TYPE_BRACKETS.get(edge["type"], edge["type"])
+
+    @staticmethod
+    def range_query(lower: Any, upper: Any) -> dict:
+        """
+        Build the filter selecting documents in an _id range.
+
+        Args:
+            lower: Inclusive lower bound or None
+            upper: Exclusive upper bound or None
+
+        Returns:
+            MongoDB filter document
+        """
+        bounds = {}
+        if lower is not None:
+            bounds["$gte"] = lower
+        if upper is not None:
+            bounds["$lt"] = upper
+        return {"_id": bounds} if bounds else {}
+
+    @staticmethod
+    def copy_collection_parallel(
+        source: Collection,
+        target: Collection,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        verify_counts: bool = True,
+    ) -> dict:
+        """
+        Copy a collection by streaming several _id ranges concurrently.
+
+        Each range runs copy_collection on its own thread, and therefore on
+        its own pooled connection. Document counts are verified per range
+        and for the whole collection once all ranges are copied.
+
+        Args:
+            source: Collection to copy from
+            target: Collection to copy into (expected to start empty)
+            workers: Number of ranges copied in parallel
+            batch_size: Documents per cursor batch and per insert
+            max_retries: Attempts per batch before giving up
+            progress_callback: Called with aggregated stats after each batch
+            verify_counts: Compare source and target counts after the copy;
+                disable when the source still takes writes that are replayed
+                separately (e.g. from a change stream)
+
+        Returns:
+            Aggregated copy statistics with a per-range breakdown
+
+        Raises:
+            Exception: If a range fails to copy or its counts do not match
+        """
+        workers = workers or settings.migration_workers
+        ranges = MigrationService.split_id_ranges(source, workers)
+
+        lock = threading.Lock()
+        copied = [0] * len(ranges)
+        copied_bytes = [0] * len(ranges)
+        started = time.monotonic()
+
+        def report(index: int, range_stats: dict):
+            with lock:
+                copied[index] = range_stats["documents"]
+                copied_bytes[index] = range_stats["bytes"]
+                stats = {"documents": sum(copied), "bytes": sum(copied_bytes)}
+                MigrationService._update_rates(stats, started)
+                if progress_callback is not None:
+                    progress_callback(stats)
+
+        def copy_range(index: int) -> dict:
+            lower, upper = ranges[index]
+            return MigrationService.copy_collection(
+                source,
+                target,
+                batch_size=batch_size,
+                max_retries=max_retries,
+                query=MigrationService.range_query(lower, upper),
+                progress_callback=lambda range_stats: report(index, range_stats),
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=len(ranges), thread_name_prefix="range-copy"
+        ) as executor:
+            range_stats = list(executor.map(copy_range, range(len(ranges))))
+
+        stats = {
+            "documents": sum(item["documents"] for item in range_stats),
+            "bytes": sum(item["bytes"] for item in range_stats),
+            "retries": sum(item["retries"] for item in range_stats),
+            "ranges": [],
+        }
+        MigrationService._update_rates(stats, started)
+
+        # Verify every range landed completely
+        for (lower, upper), item in zip(ranges, range_stats):
+            if verify_counts:
+                query = MigrationService.range_query(lower, upper)
+                source_count = source.count_documents(query)
+                target_count = target.count_documents(query)
+                if source_count != target_count:
+                    raise Exception(
+                        f"Range {lower!r}..{upper!r} copied {target_count} of "
+                        f"{source_count} documents"
+                    )
+            stats["ranges"].append(
+                {
+                    "lower": lower,
+                    "upper": upper,
+                    "documents": item["documents"],
+                    "docs_per_sec": item["docs_per_sec"],
+                }
+            )
+
+        # Catch documents that no range selected
+        if verify_counts:
+            source_total = source.count_documents({})
+            target_total = target.count_documents({})
+            if source_total != target_total:
+                raise Exception(
+                    f"Copied {target_total} of {source_total} documents "
+                    f"from {source.full_name}"
+                )
+
+        logger.info(
+            "Copied %d documents from %s to %s over %d ranges at %.0f docs/sec",
+            stats["documents"],
+            source.full_name,
+            target.full_name,
+            len(ranges),
+            stats["docs_per_sec"],
+        )
+        return stats
+
+    @staticmethod
+    def copy_indexes(source: Collection, target: Collection) -> int:
+        """
+        Recreate the secondary indexes of source on target.
+
+        Args:
+            source: Collection whose indexes are copied
+            target: Collection receiving the indexes
+
+        Returns:
+            Number of indexes created
+        """
+        created = 0
+        for name, info in source.index_information().items():
+            if name == "_id_":
+                continue
+            options = {
+                key: value
+                for key, value in info.items()
+                if key not in ("key", "v", "ns")
+            }
+            target.create_index(info["key"], name=name, **options)
+            created += 1
+        return created
+
+    @staticmethod
+    def _insert_batch(
+        target: Collection, batch: list, max_retries: int, stats: dict
+    ):
+        """
+        Insert one batch unordered, retrying just this batch on failure.
+
+        Duplicate key errors mean the document landed in an earlier attempt,
+        so a retried batch is idempotent.
+        """
+        for attempt in range(1, max_retries + 1):
+            try:
+                target.insert_many(batch, ordered=False)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if errors and all(
+                    error.get("code") == DUPLICATE_KEY_ERROR for error in errors
+                ):
+                    return
+                if attempt == max_retries:
+                    raise
+            except (AutoReconnect, NetworkTimeout):
+                if attempt == max_retries:
+                    raise
+            stats["retries"] += 1
+            time.sleep(0.1 * 2**attempt)
+
+    @staticmethod
+    def _update_rates(stats: dict, started: float):
+        """Refresh elapsed time and throughput figures in stats."""
+        elapsed = time.monotonic() - started
+        stats["seconds"] = elapsed
+        if elapsed > 0:
+            stats["docs_per_sec"] = stats["documents"] / elapsed
+            stats["bytes_per_sec"] = stats["bytes"] / elapsed
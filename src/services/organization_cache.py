@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Hashable, Optional
+from bson import ObjectId
+from src.config.settings import settings
+from src.services.invalidation_bus import InvalidationBus
+from src.services.shared_directory import SharedDirectory
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Cached in place of an organization that does not exist
+_MISSING = "__missing__"
+
+
+class OrganizationCache:
+    """
+    Read-through cache of assembled organization records.
+
+    Each record (organization document plus admin_email/admin_id) is stored
+    under ("name", organization_name) and ("id", _id), tagged by the
+    organization and admin IDs. Unknown names are cached briefly as well.
+    Expired records are still served for a grace period while a single
+    background load refreshes them.
+    """
+
+    cache = TTLCache(
+        max_entries=settings.org_cache_max_entries,
+        max_bytes=settings.org_cache_max_bytes,
+        default_ttl=settings.org_cache_ttl_seconds,
+    )
+
+    _refresh_executor: Optional[ThreadPoolExecutor] = None
+    _refreshing: set = set()
+    _refresh_tasks: set = set()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def name_key(organization_name: str) -> tuple:
+        """Cache key of an organization looked up by name."""
+        return ("name", organization_name)
+
+    @staticmethod
+    def id_key(organization_id: ObjectId) -> tuple:
+        """Cache key of an organization looked up by ID."""
+        return ("id", organization_id)
+
+    @classmethod
+    def get_or_load(
+        cls, key: Hashable, loader: Callable[[], Optional[dict]]
+    ) -> Optional[dict]:
+        """
+        Get an organization record, loading it on a miss.
+
+        Args:
+            key: name_key(...) or id_key(...)
+            loader: Loads the assembled record from the database, or None
+
+        Returns:
+            Copy of the organization record, or None if it does not exist
+        """
+        value, fresh = cls.cache.get_stale(key)
+        if value is not None:
+            if not fresh and cls._claim_refresh(key):
+                cls._get_refresh_executor().submit(cls._refresh, key, loader)
+            return cls._unwrap(value)
+
+        epoch = cls.cache.epoch
+        org = loader()
+        cls.store(key, org, epoch)
+        return cls._unwrap(org)
+
+    @classmethod
+    async def get_or_load_async(
+        cls, key: Hashable, loader: Callable[[], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        """Async version of get_or_load."""
+        value, fresh = cls.cache.get_stale(key)
+        if value is not None:
+            if not fresh and cls._claim_refresh(key):
+                task = asyncio.get_running_loop().create_task(
+                    cls._refresh_async(key, loader)
+                )
+                cls._refresh_tasks.add(task)
+                task.add_done_callback(cls._refresh_tasks.discard)
+            return cls._unwrap(value)
+
+        epoch = cls.cache.epoch
+        org = await loader()
+        cls.store(key, org, epoch)
+        return cls._unwrap(org)
+
+    @classmethod
+    def store(cls, key: Hashable, org: Optional[dict], epoch: Optional[int] = None):
+        """
+        Cache a loaded organization record, or its absence.
+
+        Args:
+            key: Key the record was looked up by
+            org: Assembled organization record, or None if not found
+            epoch: Cache epoch read before loading
+        """
+        if org is None:
+            cls.cache.set(
+                key,
+                _MISSING,
+                ttl=settings.org_cache_negative_ttl_seconds,
+                epoch=epoch,
+            )
+            return
+
+        tags = [org["_id"]]
+        if org.get("admin_id") is not None:
+            tags.append(org["admin_id"])
+
+        for cache_key in (cls.name_key(org["organization_name"]), cls.id_key(org["_id"])):
+            cls.cache.set(
+                cache_key,
+                org,
+                tags=tags,
+                epoch=epoch,
+                stale_ttl=settings.org_cache_stale_seconds,
+            )
+
+    @classmethod
+    def invalidate_organization(cls, organization_id: ObjectId, *organization_names: str):
+        """
+        Drop cached records of an organization.
+
+        Args:
+            organization_id: Organization ObjectId
+            organization_names: Names whose entries (including cached misses)
+                must be dropped too, e.g. both the old and the new name
+        """
+        cls.cache.invalidate_tag(organization_id)
+        cls.cache.invalidate(cls.id_key(organization_id))
+        for organization_name in organization_names:
+            cls.cache.invalidate(cls.name_key(organization_name))
+        SharedDirectory.invalidate(organization_id, *organization_names)
+
+    @classmethod
+    def invalidate_admin(cls, admin_id: ObjectId) -> int:
+        """
+        Drop cached records that embed an admin's details.
+
+        Args:
+            admin_id: Admin user ID
+
+        Returns:
+            Number of cache entries removed
+        """
+        SharedDirectory.invalidate(admin_id)
+        return cls.cache.invalidate_tag(admin_id)
+
+    @classmethod
+    def on_organization_changed(cls, organization_id: ObjectId, document: Optional[dict]):
+        """Invalidation bus handler for the organizations collection."""
+        names = []
+        if document and document.get("organization_name"):
+            names.append(document["organization_name"])
+        cls.invalidate_organization(organization_id, *names)
+
+    @classmethod
+    def on_admin_changed(cls, admin_id: ObjectId, document: Optional[dict]):
+        """Invalidation bus handler for the admin_users collection."""
+        cls.invalidate_admin(admin_id)
+        if document and document.get("organization_id") is not None:
+            cls.cache.invalidate_tag(document["organization_id"])
+            SharedDirectory.invalidate(document["organization_id"])
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the background refresh thread."""
+        with cls._lock:
+            executor = cls._refresh_executor
+            cls._refresh_executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def _get_refresh_executor(cls) -> ThreadPoolExecutor:
+        """Get the refresh executor, creating it on first use."""
+        with cls._lock:
+            if cls._refresh_executor is None:
+                cls._refresh_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="org-cache-refresh"
+                )
+            return cls._refresh_executor
+
+    @classmethod
+    def _claim_refresh(cls, key: Hashable) -> bool:
+        """Return True if no refresh of this key is running yet."""
+        with cls._lock:
+            if key in cls._refreshing:
+                return False
+            cls._refreshing.add(key)
+            return True
+
+    @classmethod
+    def _release_refresh(cls, key: Hashable):
+        """Mark a refresh as finished."""
+        with cls._lock:
+            cls._refreshing.discard(key)
+
+    @classmethod
+    def _refresh(cls, key: Hashable, loader: Callable[[], Optional[dict]]):
+        """Reload a stale record in the background."""
+        try:
+            epoch = cls.cache.epoch
+            cls.store(key, loader(), epoch)
+        except Exception:
+            logger.exception("Refreshing cached organization %s failed", key)
+        finally:
+            cls._release_refresh(key)
+
+    @classmethod
+    async def _refresh_async(
+        cls, key: Hashable, loader: Callable[[], Awaitable[Optional[dict]]]
+    ):
+        """Async version of _refresh."""
+        try:
+            epoch = cls.cache.epoch
+            cls.store(key, await loader(), epoch)
+        except Exception:
+            logger.exception("Refreshing cached organization %s failed", key)
+        finally:
+            cls._release_refresh(key)
+
+    @staticmethod
+    def _unwrap(value) -> Optional[dict]:
+        """Turn a cached value into what callers get: a copy, or None."""
+        if value is None or value == _MISSING:
+            return None
+        return dict(value)
+
+
+InvalidationBus.subscribe("organizations", OrganizationCache.on_organization_changed)
+InvalidationBus.subscribe("admin_users", OrganizationCache.on_admin_changed)
+InvalidationBus.subscribe_reset(OrganizationCache.cache.clear)
+InvalidationBus.subscribe_reset(SharedDirectory.invalidate_all)
@@ -1,14 +1,72 @@
-from typing import Optional
+import base64
+import json
+import re
+from typing import AsyncIterator, Callable, Iterator, Optional
 from datetime import datetime, timezone
 from bson import ObjectId
-from src.config.database import db
+from pymongo import ASCENDING, DESCENDING
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.client_session import ClientSession
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from src.config.database import db, async_db
+from src.config.settings import settings
 from src.services.database_service import DatabaseService
-from src.services.admin_service import AdminService
+from src.services.admin_service import AdminProjection, AdminService
+from src.services.auth_service import AuthService
+from src.services.collection_pool import CollectionPool
+from src.services.invalidation_bus import InvalidationBus
+from src.services.job_service import JobService
+from src.services.organization_cache import OrganizationCache
+from src.services.shared_directory import SharedDirectory
+from src.services.tenant_collection import (
+    TENANT_STORAGE_HYBRID,
+    AsyncTenantCollection,
+    StorageMode,
+    TenantCollection,
+)
+from src.services.transaction_service import TransactionService
+from src.utils.errors import duplicate_key_field
+
+
+RENAME_ORGANIZATION_JOB = "rename_organization"
+
+# collection_state of an organization whose collection is created on first write
+COLLECTION_PENDING = "pending"
+
+# Sort orders of organization listings; each ends in _id so positions are unique
+ORGANIZATION_LIST_ORDERS = {
+    "id": [("_id", ASCENDING)],
+    "created_at": [("created_at", ASCENDING), ("_id", ASCENDING)],
+}
+
+# Fields returned by organization listings
+ORGANIZATION_LIST_PROJECTION = {"organization_name": 1, "collection_name": 1, "created_at": 1}
+
+# Sort fields of organization queries, as the index keys that provide them
+ORGANIZATION_QUERY_SORTS = {
+    "organization_name": ["organization_name"],
+    "created_at": ["created_at", "_id"],
+}
+
+
+class QueryNotIndexedError(Exception):
+    """Raised when an organization query would scan the whole collection."""
+
+    pass
+
+
+class QueryTooBroadError(Exception):
+    """Raised when an admin email domain matches too many organizations."""
+
+    pass
 
 
 class OrganizationService:
     """Service class for organization CRUD operations."""
 
+    # Query shapes whose plan was checked to use an index
+    _indexed_query_shapes: set = set()
+
     @staticmethod
     def validate_organization_exists(organization_name: str) -> bool:
         """
@@ -23,9 +81,77 @@ class OrganizationService:
         existing = db.organizations.find_one({"organization_name": organization_name})
         return existing is not None
 
+    @staticmethod
+    async def validate_organization_exists_async(organization_name: str) -> bool:
+        """Async version of validate_organization_exists."""
+        existing = await async_db.organizations.find_one(
+            {"organization_name": organization_name}
+        )
+        return existing is not None
+
+    @staticmethod
+    def duplicate_organization_error(
+        error: DuplicateKeyError, name_message: str
+    ) -> Exception:
+        """
+        Translate a unique-index violation on organizations into a domain error.
+
+        Args:
+            error: DuplicateKeyError raised by the insert or update
+            name_message: Message to use when the name is taken
+
+        Returns:
+            Exception to raise
+        """
+        if duplicate_key_field(error) == "collection_name":
+            return Exception("Collection is already used by another organization")
+        return Exception(name_message)
+
+    @staticmethod
+    def creates_collection_upfront() -> bool:
+        """Whether new organizations get a dedicated collection when created."""
+        return (
+            settings.tenant_storage_mode != TENANT_STORAGE_HYBRID
+            and not settings.lazy_tenant_collections
+        )
+
+    @staticmethod
+    def new_organization_document(
+        organization_id: ObjectId, organization_name: str
+    ) -> dict:
+        """
+        Build the master record of a new organization.
+
+        Args:
+            organization_id: Organization ObjectId
+            organization_name: Name of the organization
+
+        Returns:
+            Organization document ready for insertion
+        """
+        org_doc = {
+            "_id": organization_id,
+            "organization_name": organization_name,
+            # Reserved even for shared storage, for a later promotion
+            "collection_name": DatabaseService.tenant_collection_name(organization_id),
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+        }
+        database_target = DatabaseService.place_organization(organization_id)
+        if database_target is not None:
+            org_doc["database_target"] = database_target
+        if settings.tenant_storage_mode == TENANT_STORAGE_HYBRID:
+            org_doc["storage_mode"] = StorageMode.SHARED
+        elif settings.lazy_tenant_collections:
+            org_doc["collection_state"] = COLLECTION_PENDING
+        return org_doc
+
     @staticmethod
     def create_organization(
-        organization_name: str, admin_email: str, admin_password: str
+        organization_name: str,
+        admin_email: str,
+        admin_password: str,
+        admin_password_hash: Optional[str] = None,
     ) -> dict:
         """
         Create a new organization with admin user and dynamic collection.
@@ -34,6 +160,7 @@ class OrganizationService:
             organization_name: Name of the organization
             admin_email: Admin user email
             admin_password: Admin user password
+            admin_password_hash: Pre-computed bcrypt hash of admin_password (optional)
 
         Returns:
             Created organization document with admin info
@@ -41,160 +168,653 @@ class OrganizationService:
         Raises:
             Exception: If organization already exists or creation fails
         """
-        # Validate organization name doesn't exist
-        if OrganizationService.validate_organization_exists(organization_name):
-            raise Exception("Organization with this name already exists")
+        if TransactionService.supported():
+            return OrganizationService.create_organization_in_transaction(
+                organization_name, admin_email, admin_password, admin_password_hash
+            )
 
-        # Generate collection name
-        collection_name = DatabaseService.generate_collection_name(organization_name)
+        # Adopt a pre-created collection when the pool has one; collections
+        # are keyed by the immutable organization ID
+        pooled_id = (
+            CollectionPool.claim()
+            if OrganizationService.creates_collection_upfront()
+            else None
+        )
+        organization_id = pooled_id or ObjectId()
+        collection_name = DatabaseService.tenant_collection_name(organization_id)
 
         # Create organization document
-        org_doc = {
-            "organization_name": organization_name,
-            "collection_name": collection_name,
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc),
-        }
+        org_doc = OrganizationService.new_organization_document(
+            organization_id, organization_name
+        )
 
-        # Insert organization into master database
-        result = db.organizations.insert_one(org_doc)
-        organization_id = result.inserted_id
-        org_doc["_id"] = organization_id
+        # Insert organization into master database; the unique indexes on
+        # organization_name and collection_name reject duplicates
+        try:
+            db.organizations.insert_one(org_doc)
+        except DuplicateKeyError as e:
+            if pooled_id is not None:
+                CollectionPool.release(pooled_id)
+            raise OrganizationService.duplicate_organization_error(
+                e, "Organization with this name already exists"
+            )
 
         try:
             # Create dynamic collection for organization
-            DatabaseService.create_dynamic_collection(collection_name)
+            if pooled_id is None and OrganizationService.creates_collection_upfront():
+                DatabaseService.create_dynamic_collection(
+                    collection_name, target=org_doc.get("database_target")
+                )
 
             # Create admin user for organization
             admin_doc = AdminService.create_admin(
-                admin_email, admin_password, organization_id
+                admin_email,
+                admin_password,
+                organization_id,
+                password_hash=admin_password_hash,
             )
 
             # Return organization with admin info
             org_doc["admin_id"] = admin_doc["_id"]
             org_doc["admin_email"] = admin_email
 
+            # Forget a cached "not found" for this name
+            OrganizationCache.invalidate_organization(organization_id, organization_name)
+
             return org_doc
 
         except Exception as e:
             # Rollback: delete organization if admin creation fails
             db.organizations.delete_one({"_id": organization_id})
-            DatabaseService.drop_collection(collection_name)
+            DatabaseService.drop_collection(
+                collection_name, org_doc.get("database_target")
+            )
+            OrganizationCache.invalidate_organization(organization_id, organization_name)
             raise Exception(f"Failed to create organization: {str(e)}")
 
+    @staticmethod
+    def create_organization_in_transaction(
+        organization_name: str,
+        admin_email: str,
+        admin_password: str,
+        admin_password_hash: Optional[str] = None,
+    ) -> dict:
+        """
+        Create an organization, its collection and its admin atomically.
+
+        Either all three exist after the commit or none does, so there is
+        nothing to compensate on failure.
+
+        Args:
+            organization_name: Name of the organization
+            admin_email: Admin user email
+            admin_password: Admin user password
+            admin_password_hash: Pre-computed bcrypt hash of admin_password (optional)
+
+        Returns:
+            Created organization document with admin info
+
+        Raises:
+            Exception: If organization already exists or creation fails
+        """
+        # Hash before the transaction so bcrypt never runs inside (or per retry)
+        if admin_password_hash is None:
+            admin_password_hash = AuthService.hash_password(admin_password)
+
+        # Claimed outside the transaction so concurrent signups do not
+        # conflict on the same ledger entry
+        pooled_id = (
+            CollectionPool.claim()
+            if OrganizationService.creates_collection_upfront()
+            else None
+        )
+        organization_id = pooled_id or ObjectId()
+        collection_name = DatabaseService.tenant_collection_name(organization_id)
+        org_doc = OrganizationService.new_organization_document(
+            organization_id, organization_name
+        )
+        database_target = org_doc.get("database_target")
+        create_collection = (
+            pooled_id is None and OrganizationService.creates_collection_upfront()
+        )
+
+        # A transaction cannot span clients, so a collection placed in another
+        # database is created up front and dropped again if the commit fails
+        if create_collection and database_target is not None:
+            DatabaseService.create_dynamic_collection(
+                collection_name, target=database_target
+            )
+
+        def provision(session: ClientSession) -> dict:
+            try:
+                db.organizations.insert_one(org_doc, session=session)
+            except DuplicateKeyError as e:
+                raise OrganizationService.duplicate_organization_error(
+                    e, "Organization with this name already exists"
+                )
+
+            try:
+                if create_collection and database_target is None:
+                    DatabaseService.create_dynamic_collection(
+                        collection_name, session=session
+                    )
+                return AdminService.create_admin(
+                    admin_email,
+                    admin_password,
+                    organization_id,
+                    password_hash=admin_password_hash,
+                    session=session,
+                )
+            except PyMongoError:
+                # Keep error labels intact so transient errors are retried
+                raise
+            except Exception as e:
+                raise Exception(f"Failed to create organization: {str(e)}")
+
+        try:
+            # Collections can only be created in a transaction at read concern
+            # "local", and provision reads nothing it relies on being consistent
+            admin_doc = TransactionService.run(
+                "create_organization", provision, read_concern="local"
+            )
+        except Exception:
+            if pooled_id is not None:
+                CollectionPool.release(pooled_id)
+            if create_collection and database_target is not None:
+                DatabaseService.drop_collection(collection_name, database_target)
+            raise
+
+        if create_collection and database_target is None:
+            DatabaseService.catalog.mark_created(collection_name)
+        OrganizationCache.invalidate_organization(organization_id, organization_name)
+
+        org_doc["admin_id"] = admin_doc["_id"]
+        org_doc["admin_email"] = admin_email
+        return org_doc
+
+    @staticmethod
+    async def create_organization_in_transaction_async(
+        organization_name: str,
+        admin_email: str,
+        admin_password: str,
+        admin_password_hash: Optional[str] = None,
+    ) -> dict:
+        """Async version of create_organization_in_transaction."""
+        if admin_password_hash is None:
+            admin_password_hash = await AuthService.hash_password_async(admin_password)
+
+        pooled_id = (
+            await CollectionPool.claim_async()
+            if OrganizationService.creates_collection_upfront()
+            else None
+        )
+        organization_id = pooled_id or ObjectId()
+        collection_name = DatabaseService.tenant_collection_name(organization_id)
+        org_doc = OrganizationService.new_organization_document(
+            organization_id, organization_name
+        )
+        database_target = org_doc.get("database_target")
+        create_collection = (
+            pooled_id is None and OrganizationService.creates_collection_upfront()
+        )
+
+        if create_collection and database_target is not None:
+            await DatabaseService.create_dynamic_collection_async(
+                collection_name, target=database_target
+            )
+
+        async def provision(session: AsyncClientSession) -> dict:
+            try:
+                await async_db.organizations.insert_one(org_doc, session=session)
+            except DuplicateKeyError as e:
+                raise OrganizationService.duplicate_organization_error(
+                    e, "Organization with this name already exists"
+                )
+
+            try:
+                if create_collection and database_target is None:
+                    await DatabaseService.create_dynamic_collection_async(
+                        collection_name, session=session
+                    )
+                return await AdminService.create_admin_async(
+                    admin_email,
+                    admin_password,
+                    organization_id,
+                    password_hash=admin_password_hash,
+                    session=session,
+                )
+            except PyMongoError:
+                raise
+            except Exception as e:
+                raise Exception(f"Failed to create organization: {str(e)}")
+
+        try:
+            admin_doc = await TransactionService.run_async(
+                "create_organization", provision, read_concern="local"
+            )
+        except Exception:
+            if pooled_id is not None:
+                await CollectionPool.release_async(pooled_id)
+            if create_collection and database_target is not None:
+                await DatabaseService.drop_collection_async(
+                    collection_name, database_target
+                )
+            raise
+
+        if create_collection and database_target is None:
+            DatabaseService.catalog.mark_created(collection_name)
+        OrganizationCache.invalidate_organization(organization_id, organization_name)
+
+        org_doc["admin_id"] = admin_doc["_id"]
+        org_doc["admin_email"] = admin_email
+        return org_doc
+
+    @staticmethod
+    async def create_organization_async(
+        organization_name: str,
+        admin_email: str,
+        admin_password: str,
+        admin_password_hash: Optional[str] = None,
+    ) -> dict:
+        """Async version of create_organization."""
+        if await TransactionService.supported_async():
+            return await OrganizationService.create_organization_in_transaction_async(
+                organization_name, admin_email, admin_password, admin_password_hash
+            )
+
+        pooled_id = (
+            await CollectionPool.claim_async()
+            if OrganizationService.creates_collection_upfront()
+            else None
+        )
+        organization_id = pooled_id or ObjectId()
+        collection_name = DatabaseService.tenant_collection_name(organization_id)
+
+        org_doc = OrganizationService.new_organization_document(
+            organization_id, organization_name
+        )
+
+        try:
+            await async_db.organizations.insert_one(org_doc)
+        except DuplicateKeyError as e:
+            if pooled_id is not None:
+                await CollectionPool.release_async(pooled_id)
+            raise OrganizationService.duplicate_organization_error(
+                e, "Organization with this name already exists"
+            )
+
+        try:
+            if pooled_id is None and OrganizationService.creates_collection_upfront():
+                await DatabaseService.create_dynamic_collection_async(
+                    collection_name, target=org_doc.get("database_target")
+                )
+
+            admin_doc = await AdminService.create_admin_async(
+                admin_email,
+                admin_password,
+                organization_id,
+                password_hash=admin_password_hash,
+            )
+
+            org_doc["admin_id"] = admin_doc["_id"]
+            org_doc["admin_email"] = admin_email
+
+            OrganizationCache.invalidate_organization(organization_id, organization_name)
+
+            return org_doc
+
+        except Exception as e:
+            # Rollback: delete organization if admin creation fails
+            await async_db.organizations.delete_one({"_id": organization_id})
+            await DatabaseService.drop_collection_async(
+                collection_name, org_doc.get("database_target")
+            )
+            OrganizationCache.invalidate_organization(organization_id, organization_name)
+            raise Exception(f"Failed to create organization: {str(e)}")
+
+    @staticmethod
+    def organization_with_admin_pipeline(query: dict) -> list:
+        """
+        Build the aggregation that loads an organization and its admin info.
+
+        The admin is joined server-side with $lookup on the organization_id
+        index, so both come back in one round trip, and only the admin's
+        email and _id leave the server (never password_hash).
+
+        Args:
+            query: Filter matching a single organization
+
+        Returns:
+            Aggregation pipeline
+        """
+        return [
+            {"$match": query},
+            {"$limit": 1},
+            {
+                "$lookup": {
+                    "from": "admin_users",
+                    "localField": "_id",
+                    "foreignField": "organization_id",
+                    "as": "admins",
+                }
+            },
+            {"$addFields": {"admin": {"$arrayElemAt": ["$admins", 0]}}},
+            {"$addFields": {"admin_email": "$admin.email", "admin_id": "$admin._id"}},
+            {"$project": {"admins": 0, "admin": 0}},
+        ]
+
+    @staticmethod
+    def load_organization(query: dict) -> Optional[dict]:
+        """
+        Load an organization together with its admin info from the database.
+
+        Args:
+            query: Filter matching a single organization
+
+        Returns:
+            Organization document with admin_email/admin_id, or None if not found
+        """
+        pipeline = OrganizationService.organization_with_admin_pipeline(query)
+        return next(db.organizations.aggregate(pipeline), None)
+
+    @staticmethod
+    async def load_organization_async(query: dict) -> Optional[dict]:
+        """Async version of load_organization."""
+        pipeline = OrganizationService.organization_with_admin_pipeline(query)
+        cursor = await async_db.organizations.aggregate(pipeline)
+        orgs = await cursor.to_list(1)
+        return orgs[0] if orgs else None
+
     @staticmethod
     def get_organization(organization_name: str) -> Optional[dict]:
         """
         Get organization by name.
 
+        Served from the shared-memory directory when one is configured and
+        holds the organization unchanged since its snapshot, otherwise from
+        the organization cache.
+
         Args:
             organization_name: Name of the organization
 
         Returns:
             Organization document or None if not found
         """
-        org = db.organizations.find_one({"organization_name": organization_name})
+        org = SharedDirectory.get_by_name(organization_name)
+        if org is not None:
+            return org
 
-        if not org:
-            return None
+        return OrganizationCache.get_or_load(
+            OrganizationCache.name_key(organization_name),
+            lambda: OrganizationService.load_organization(
+                {"organization_name": organization_name}
+            ),
+        )
 
-        # Get admin info for the organization
-        admin = AdminService.get_admin_by_organization(org["_id"])
-        if admin:
-            org["admin_email"] = admin["email"]
-            org["admin_id"] = admin["_id"]
+    @staticmethod
+    async def get_organization_async(organization_name: str) -> Optional[dict]:
+        """Async version of get_organization."""
+        org = SharedDirectory.get_by_name(organization_name)
+        if org is not None:
+            return org
 
-        return org
+        return await OrganizationCache.get_or_load_async(
+            OrganizationCache.name_key(organization_name),
+            lambda: OrganizationService.load_organization_async(
+                {"organization_name": organization_name}
+            ),
+        )
 
     @staticmethod
     def get_organization_by_id(organization_id: ObjectId) -> Optional[dict]:
         """
         Get organization by ID.
 
+        Served from the shared-memory directory when one is configured and
+        holds the organization unchanged since its snapshot, otherwise from
+        the organization cache.
+
         Args:
             organization_id: Organization ObjectId
 
         Returns:
             Organization document or None if not found
         """
-        return db.organizations.find_one({"_id": organization_id})
+        org = SharedDirectory.get_by_id(organization_id)
+        if org is not None:
+            return org
+
+        return OrganizationCache.get_or_load(
+            OrganizationCache.id_key(organization_id),
+            lambda: OrganizationService.load_organization({"_id": organization_id}),
+        )
+
+    @staticmethod
+    async def get_organization_by_id_async(
+        organization_id: ObjectId,
+    ) -> Optional[dict]:
+        """Async version of get_organization_by_id."""
+        org = SharedDirectory.get_by_id(organization_id)
+        if org is not None:
+            return org
+
+        return await OrganizationCache.get_or_load_async(
+            OrganizationCache.id_key(organization_id),
+            lambda: OrganizationService.load_organization_async(
+                {"_id": organization_id}
+            ),
+        )
+
+    @staticmethod
+    def get_tenant_collection(
+        org: dict, for_write: bool = False
+    ) -> Optional[TenantCollection]:
+        """
+        Get the data collection of an organization, scoped to it.
+
+        Organizations created with lazy_tenant_collections have no collection
+        until their first write. Reads of such an organization get None and
+        should answer with empty results without querying the database;
+        writes create the collection first.
+
+        Args:
+            org: Organization document
+            for_write: Whether the caller is about to write to the collection
+
+        Returns:
+            Tenant collection handle, or None for a read of a pending collection
+        """
+        if org.get("collection_state") == COLLECTION_PENDING:
+            if not for_write:
+                return None
+            OrganizationService.materialize_collection(org)
+        return DatabaseService.get_tenant_handle(org)
+
+    @staticmethod
+    async def get_tenant_collection_async(
+        org: dict, for_write: bool = False
+    ) -> Optional[AsyncTenantCollection]:
+        """Async version of get_tenant_collection."""
+        if org.get("collection_state") == COLLECTION_PENDING:
+            if not for_write:
+                return None
+            await OrganizationService.materialize_collection_async(org)
+        return DatabaseService.get_tenant_handle_async(org)
 
     @staticmethod
-    def update_organization(
-        old_organization_name: str,
+    def materialize_collection(org: dict):
+        """
+        Create the pending collection of an organization.
+
+        Safe to run concurrently: creating an existing collection is a no-op
+        and only the first caller clears the pending state.
+
+        Args:
+            org: Organization document (its collection_state is cleared)
+        """
+        DatabaseService.create_dynamic_collection(
+            org["collection_name"], target=org.get("database_target")
+        )
+        db.organizations.update_one(
+            {"_id": org["_id"], "collection_state": COLLECTION_PENDING},
+            {
+                "$unset": {"collection_state": ""},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            },
+        )
+        OrganizationCache.invalidate_organization(org["_id"], org["organization_name"])
+        org.pop("collection_state", None)
+
+    @staticmethod
+    async def materialize_collection_async(org: dict):
+        """Async version of materialize_collection."""
+        await DatabaseService.create_dynamic_collection_async(
+            org["collection_name"], target=org.get("database_target")
+        )
+        await async_db.organizations.update_one(
+            {"_id": org["_id"], "collection_state": COLLECTION_PENDING},
+            {
+                "$unset": {"collection_state": ""},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            },
+        )
+        OrganizationCache.invalidate_organization(org["_id"], org["organization_name"])
+        org.pop("collection_state", None)
+
+    @staticmethod
+    def start_organization_update(
+        org: dict,
         new_organization_name: str,
         admin_email: Optional[str] = None,
         admin_password: Optional[str] = None,
+        admin_password_hash: Optional[str] = None,
     ) -> dict:
         """
-        Update organization name and optionally admin credentials.
-        This involves creating a new collection and migrating data.
+        Queue the rename as a background job and apply admin credential changes.
+
+        The job is queued first, so a request rejected because another update
+        is running leaves the credentials untouched.
 
         Args:
-            old_organization_name: Current organization name
+            org: Current organization document
             new_organization_name: New organization name
             admin_email: New admin email (optional)
             admin_password: New admin password (optional)
+            admin_password_hash: Pre-computed bcrypt hash of admin_password (optional)
 
         Returns:
-            Updated organization document
+            Queued job document
 
         Raises:
-            Exception: If organization not found or update fails
+            JobConflictError: If an update is already running
+            Exception: If the new name is taken
         """
-        # Get existing organization
-        org = db.organizations.find_one({"organization_name": old_organization_name})
-        if not org:
-            raise Exception("Organization not found")
-
-        # Check if new name already exists (and it's not the same org)
-        if old_organization_name != new_organization_name:
+        if org["organization_name"] != new_organization_name:
             if OrganizationService.validate_organization_exists(new_organization_name):
                 raise Exception("Organization with new name already exists")
 
-        old_collection_name = org["collection_name"]
-        new_collection_name = DatabaseService.generate_collection_name(
-            new_organization_name
+        job = JobService.enqueue(
+            RENAME_ORGANIZATION_JOB,
+            org["_id"],
+            {"new_organization_name": new_organization_name},
         )
 
-        try:
-            # Create new collection
-            DatabaseService.create_dynamic_collection(new_collection_name)
+        if admin_email or admin_password or admin_password_hash:
+            admin = AdminService.get_admin_by_organization(
+                org["_id"], AdminProjection.MINIMAL
+            )
+            if admin:
+                AdminService.update_admin_credentials(
+                    admin["_id"],
+                    admin_email,
+                    admin_password,
+                    password_hash=admin_password_hash,
+                )
+
+        return job
 
-            # Migrate data from old collection to new collection
-            if DatabaseService.collection_exists(old_collection_name):
-                DatabaseService.migrate_collection_data(
-                    old_collection_name, new_collection_name
+    @staticmethod
+    async def start_organization_update_async(
+        org: dict,
+        new_organization_name: str,
+        admin_email: Optional[str] = None,
+        admin_password: Optional[str] = None,
+        admin_password_hash: Optional[str] = None,
+    ) -> dict:
+        """Async version of start_organization_update."""
+        if org["organization_name"] != new_organization_name:
+            if await OrganizationService.validate_organization_exists_async(
+                new_organization_name
+            ):
+                raise Exception("Organization with new name already exists")
+
+        job = await JobService.enqueue_async(
+            RENAME_ORGANIZATION_JOB,
+            org["_id"],
+            {"new_organization_name": new_organization_name},
+        )
+
+        if admin_email or admin_password or admin_password_hash:
+            admin = await AdminService.get_admin_by_organization_async(
+                org["_id"], AdminProjection.MINIMAL
+            )
+            if admin:
+                await AdminService.update_admin_credentials_async(
+                    admin["_id"],
+                    admin_email,
+                    admin_password,
+                    password_hash=admin_password_hash,
                 )
 
-            # Update organization document
-            update_doc = {
-                "organization_name": new_organization_name,
-                "collection_name": new_collection_name,
-                "updated_at": datetime.now(timezone.utc),
-            }
+        return job
 
-            db.organizations.update_one({"_id": org["_id"]}, {"$set": update_doc})
+    @staticmethod
+    def run_rename_job(job: dict, report_progress: Callable[[dict, int], None]) -> dict:
+        """
+        Job handler that renames an organization.
 
-            # Drop old collection
-            DatabaseService.drop_collection(old_collection_name)
+        Renaming only rewrites the organization document, so re-running the
+        job after a restart is harmless.
 
-            # Update admin credentials if provided
-            if admin_email or admin_password:
-                admin = AdminService.get_admin_by_organization(org["_id"])
-                if admin:
-                    AdminService.update_admin_credentials(
-                        admin["_id"], admin_email, admin_password
-                    )
+        Args:
+            job: Job document with params.new_organization_name
+            report_progress: Progress callback (unused, nothing is copied)
 
-            # Get updated organization
-            updated_org = OrganizationService.get_organization(new_organization_name)
-            return updated_org
+        Returns:
+            Summary of the renamed organization
 
-        except Exception as e:
-            # Cleanup new collection if update fails
-            DatabaseService.drop_collection(new_collection_name)
-            raise Exception(f"Failed to update organization: {str(e)}")
+        Raises:
+            Exception: If the organization no longer exists or the update fails
+        """
+        # Read past the cache: another process may have renamed it meanwhile
+        org = db.organizations.find_one({"_id": job["organization_id"]})
+        if not org:
+            raise Exception("Organization not found")
+
+        # The unique index rejects a name that belongs to another organization
+        new_organization_name = job["params"]["new_organization_name"]
+        try:
+            db.organizations.update_one(
+                {"_id": org["_id"]},
+                {
+                    "$set": {
+                        "organization_name": new_organization_name,
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                },
+            )
+        except DuplicateKeyError as e:
+            raise OrganizationService.duplicate_organization_error(
+                e, "Organization with new name already exists"
+            )
+        OrganizationCache.invalidate_organization(
+            org["_id"], org["organization_name"], new_organization_name
+        )
+
+        return {
+            "organization_name": new_organization_name,
+            "collection_name": org["collection_name"],
+        }
 
     @staticmethod
     def delete_organization(organization_name: str, admin_id: ObjectId) -> bool:
@@ -218,19 +838,46 @@ class OrganizationService:
             raise Exception("Organization not found")
 
         # Verify admin belongs to this organization
-        admin = AdminService.get_admin_by_id(admin_id)
+        admin = AdminService.get_admin_by_id(admin_id, AdminProjection.MINIMAL)
         if not admin or admin["organization_id"] != org["_id"]:
             raise Exception("Not authorized to delete this organization")
 
         try:
+            if TransactionService.supported():
+                # Admins, organization and tombstone go atomically; dropping a
+                # collection is not allowed in a transaction, so the now
+                # unreferenced collection is dropped after the commit
+                def teardown(session: ClientSession) -> bool:
+                    AdminService.delete_admins_by_organization(org["_id"], session=session)
+                    result = db.organizations.delete_one({"_id": org["_id"]}, session=session)
+                    InvalidationBus.record_deletion(
+                        "organizations",
+                        org["_id"],
+                        session=session,
+                        organization_name=organization_name,
+                    )
+                    return result.deleted_count > 0
+
+                deleted = TransactionService.run("delete_organization", teardown)
+                # Invalidated only now: a request before the commit would
+                # still find the admins and cache their tokens again
+                AuthService.invalidate_cached_tokens(org["_id"])
+                OrganizationCache.invalidate_organization(org["_id"], organization_name)
+                DatabaseService.drop_tenant_storage(org)
+                return deleted
+
             # Drop the organization's collection
-            DatabaseService.drop_collection(org["collection_name"])
+            DatabaseService.drop_tenant_storage(org)
 
             # Delete admin users for this organization
             AdminService.delete_admins_by_organization(org["_id"])
 
             # Delete organization from master database
             result = db.organizations.delete_one({"_id": org["_id"]})
+            OrganizationCache.invalidate_organization(org["_id"], organization_name)
+            InvalidationBus.record_deletion(
+                "organizations", org["_id"], organization_name=organization_name
+            )
 
             return result.deleted_count > 0
 
@@ -238,11 +885,400 @@ class OrganizationService:
             raise Exception(f"Failed to delete organization: {str(e)}")
 
     @staticmethod
-    def list_all_organizations() -> list:
+    async def delete_organization_async(
+        organization_name: str, admin_id: ObjectId
+    ) -> bool:
+        """Async version of delete_organization."""
+        org = await async_db.organizations.find_one(
+            {"organization_name": organization_name}
+        )
+        if not org:
+            raise Exception("Organization not found")
+
+        admin = await AdminService.get_admin_by_id_async(
+            admin_id, AdminProjection.MINIMAL
+        )
+        if not admin or admin["organization_id"] != org["_id"]:
+            raise Exception("Not authorized to delete this organization")
+
+        try:
+            if await TransactionService.supported_async():
+
+                async def teardown(session: AsyncClientSession) -> bool:
+                    await AdminService.delete_admins_by_organization_async(
+                        org["_id"], session=session
+                    )
+                    result = await async_db.organizations.delete_one(
+                        {"_id": org["_id"]}, session=session
+                    )
+                    await InvalidationBus.record_deletion_async(
+                        "organizations",
+                        org["_id"],
+                        session=session,
+                        organization_name=organization_name,
+                    )
+                    return result.deleted_count > 0
+
+                deleted = await TransactionService.run_async(
+                    "delete_organization", teardown
+                )
+                AuthService.invalidate_cached_tokens(org["_id"])
+                OrganizationCache.invalidate_organization(org["_id"], organization_name)
+                await DatabaseService.drop_tenant_storage_async(org)
+                return deleted
+
+            await DatabaseService.drop_tenant_storage_async(org)
+            await AdminService.delete_admins_by_organization_async(org["_id"])
+            result = await async_db.organizations.delete_one({"_id": org["_id"]})
+            OrganizationCache.invalidate_organization(org["_id"], organization_name)
+            await InvalidationBus.record_deletion_async(
+                "organizations", org["_id"], organization_name=organization_name
+            )
+
+            return result.deleted_count > 0
+
+        except Exception as e:
+            raise Exception(f"Failed to delete organization: {str(e)}")
+
+    @staticmethod
+    def encode_list_cursor(org: dict, order: str) -> str:
+        """
+        Build the opaque continuation token positioned after an organization.
+
+        Args:
+            org: Last organization of a page
+            order: Listing order (a key of ORGANIZATION_LIST_ORDERS)
+
+        Returns:
+            URL-safe token for the next page
+        """
+        position = {"order": order, "id": str(org["_id"])}
+        if order == "created_at":
+            position["created_at"] = org["created_at"].isoformat()
+        token = base64.urlsafe_b64encode(json.dumps(position).encode())
+        return token.decode().rstrip("=")
+
+    @staticmethod
+    def decode_list_cursor(token: str, order: str) -> Optional[dict]:
+        """
+        Turn a continuation token into a keyset filter.
+
+        Args:
+            token: Token from encode_list_cursor
+            order: Listing order the token is used with
+
+        Returns:
+            Filter matching the organizations after the token's position, or
+            None if the token is malformed or was issued for another order
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded))
+            if position["order"] != order:
+                return None
+            after_id = ObjectId(position["id"])
+            if order == "id":
+                return {"_id": {"$gt": after_id}}
+            created_at = datetime.fromisoformat(position["created_at"])
+        except Exception:
+            return None
+
+        return {
+            "$or": [
+                {"created_at": {"$gt": created_at}},
+                {"created_at": created_at, "_id": {"$gt": after_id}},
+            ]
+        }
+
+    @staticmethod
+    def list_organizations(
+        limit: int, after: Optional[dict] = None, order: str = "id"
+    ) -> tuple:
+        """
+        Get one page of organizations by keyset pagination.
+
+        Pages are index range scans that start where the previous page ended,
+        so deep pages cost the same as the first one.
+
+        Args:
+            limit: Maximum organizations on the page
+            after: Filter from decode_list_cursor (optional, first page if unset)
+            order: Listing order (a key of ORGANIZATION_LIST_ORDERS)
+
+        Returns:
+            Tuple of (organization documents, continuation token or None on
+            the last page)
+        """
+        orgs = list(
+            db.organizations.find(
+                after or {},
+                ORGANIZATION_LIST_PROJECTION,
+                sort=ORGANIZATION_LIST_ORDERS[order],
+                limit=limit + 1,
+            )
+        )
+        if len(orgs) <= limit:
+            return orgs, None
+        orgs = orgs[:limit]
+        return orgs, OrganizationService.encode_list_cursor(orgs[-1], order)
+
+    @staticmethod
+    async def list_organizations_async(
+        limit: int, after: Optional[dict] = None, order: str = "id"
+    ) -> tuple:
+        """Async version of list_organizations."""
+        cursor = async_db.organizations.find(
+            after or {},
+            ORGANIZATION_LIST_PROJECTION,
+            sort=ORGANIZATION_LIST_ORDERS[order],
+            limit=limit + 1,
+        )
+        orgs = await cursor.to_list(None)
+        if len(orgs) <= limit:
+            return orgs, None
+        orgs = orgs[:limit]
+        return orgs, OrganizationService.encode_list_cursor(orgs[-1], order)
+
+    @staticmethod
+    def iter_organizations(
+        after: Optional[dict] = None, order: str = "id"
+    ) -> Iterator[dict]:
+        """
+        Iterate over all organizations from a server-side cursor.
+
+        Only one batch of organization_list_batch_size documents is held in
+        memory at a time, whatever the number of organizations.
+
+        Args:
+            after: Filter from decode_list_cursor (optional)
+            order: Listing order (a key of ORGANIZATION_LIST_ORDERS)
+
+        Yields:
+            Organization documents
+        """
+        cursor = db.organizations.find(
+            after or {},
+            ORGANIZATION_LIST_PROJECTION,
+            sort=ORGANIZATION_LIST_ORDERS[order],
+            batch_size=settings.organization_list_batch_size,
+        )
+        with cursor:
+            yield from cursor
+
+    @staticmethod
+    async def iter_organizations_async(
+        after: Optional[dict] = None, order: str = "id"
+    ) -> AsyncIterator[dict]:
+        """Async version of iter_organizations."""
+        cursor = async_db.organizations.find(
+            after or {},
+            ORGANIZATION_LIST_PROJECTION,
+            sort=ORGANIZATION_LIST_ORDERS[order],
+            batch_size=settings.organization_list_batch_size,
+        )
+        try:
+            async for org in cursor:
+                yield org
+        finally:
+            await cursor.close()
+
+    @staticmethod
+    def build_organization_query(
+        name_prefix: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        organization_ids: Optional[list] = None,
+    ) -> dict:
+        """
+        Build the filter of an organization query.
+
+        Args:
+            name_prefix: Organization name prefix (case-sensitive)
+            created_after: Earliest creation time, inclusive
+            created_before: Latest creation time, exclusive
+            organization_ids: Restrict to these organization IDs
+
+        Returns:
+            Filter for the organizations collection
+        """
+        query = {}
+        if name_prefix:
+            # Anchored, case-sensitive prefix regexes become index range scans
+            query["organization_name"] = {"$regex": "^" + re.escape(name_prefix)}
+
+        created_at = {}
+        if created_after:
+            created_at["$gte"] = created_after
+        if created_before:
+            created_at["$lt"] = created_before
+        if created_at:
+            query["created_at"] = created_at
+
+        if organization_ids is not None:
+            query["_id"] = {"$in": organization_ids}
+        return query
+
+    @staticmethod
+    def organization_query_sort(order: str) -> list:
+        """
+        Get the sort specification of a query order.
+
+        Args:
+            order: Key of ORGANIZATION_QUERY_SORTS, prefixed with "-" for
+                descending order
+
+        Returns:
+            Sort keys matching an index walked forwards or backwards
+        """
+        direction = DESCENDING if order.startswith("-") else ASCENDING
+        return [(key, direction) for key in ORGANIZATION_QUERY_SORTS[order.lstrip("-")]]
+
+    @staticmethod
+    def query_organizations(
+        name_prefix: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        admin_email_domain: Optional[str] = None,
+        order: str = "created_at",
+        limit: int = 100,
+    ) -> list:
         """
-        Get list of all organizations.
+        Query organizations by name prefix, creation time and admin email domain.
+
+        The admin email domain is resolved to organization IDs with a covered
+        query on admin_users first, up to
+        organization_query_max_domain_organizations of them. The plan of
+        every new query shape is
+        checked with explain, and queries that would scan the whole
+        collection are rejected instead of run.
+
+        Args:
+            name_prefix: Organization name prefix (optional)
+            created_after: Earliest creation time, inclusive (optional)
+            created_before: Latest creation time, exclusive (optional)
+            admin_email_domain: Domain of the admin's email (optional)
+            order: Sort field, prefixed with "-" for descending order
+            limit: Maximum organizations returned
 
         Returns:
             List of organization documents
+
+        Raises:
+            QueryNotIndexedError: If no index serves the query
+            QueryTooBroadError: If the domain matches too many organizations
         """
-        return list(db.organizations.find())
+        organization_ids = None
+        if admin_email_domain:
+            admins = db.admin_users.find(
+                {"email_domain": admin_email_domain.lower()},
+                {"_id": 0, "organization_id": 1},
+                limit=settings.organization_query_max_domain_organizations + 1,
+            )
+            organization_ids = OrganizationService._domain_organization_ids(
+                [admin["organization_id"] for admin in admins]
+            )
+            if not organization_ids:
+                return []
+
+        query = OrganizationService.build_organization_query(
+            name_prefix, created_after, created_before, organization_ids
+        )
+        cursor = db.organizations.find(
+            query,
+            ORGANIZATION_LIST_PROJECTION,
+            sort=OrganizationService.organization_query_sort(order),
+            limit=limit,
+        )
+
+        shape = (frozenset(query), order.lstrip("-"))
+        if shape not in OrganizationService._indexed_query_shapes:
+            OrganizationService._check_query_plan(shape, cursor.explain())
+        return list(cursor)
+
+    @staticmethod
+    async def query_organizations_async(
+        name_prefix: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        admin_email_domain: Optional[str] = None,
+        order: str = "created_at",
+        limit: int = 100,
+    ) -> list:
+        """Async version of query_organizations."""
+        organization_ids = None
+        if admin_email_domain:
+            admins = async_db.admin_users.find(
+                {"email_domain": admin_email_domain.lower()},
+                {"_id": 0, "organization_id": 1},
+                limit=settings.organization_query_max_domain_organizations + 1,
+            )
+            organization_ids = OrganizationService._domain_organization_ids(
+                [admin["organization_id"] async for admin in admins]
+            )
+            if not organization_ids:
+                return []
+
+        query = OrganizationService.build_organization_query(
+            name_prefix, created_after, created_before, organization_ids
+        )
+        cursor = async_db.organizations.find(
+            query,
+            ORGANIZATION_LIST_PROJECTION,
+            sort=OrganizationService.organization_query_sort(order),
+            limit=limit,
+        )
+
+        shape = (frozenset(query), order.lstrip("-"))
+        if shape not in OrganizationService._indexed_query_shapes:
+            OrganizationService._check_query_plan(shape, await cursor.explain())
+        return await cursor.to_list(None)
+
+    @staticmethod
+    def _domain_organization_ids(organization_ids: list) -> list:
+        """
+        Reject an email domain resolving to more IDs than an $in should hold.
+
+        Raises:
+            QueryTooBroadError: If the list exceeds the configured maximum
+        """
+        if len(organization_ids) > settings.organization_query_max_domain_organizations:
+            raise QueryTooBroadError(
+                "admin_email_domain matches too many organizations; "
+                "narrow the query with name_prefix or a creation time range"
+            )
+        return organization_ids
+
+    @staticmethod
+    def _check_query_plan(shape: tuple, explain: dict):
+        """
+        Reject a query whose winning plan contains a collection scan.
+
+        Only indexed shapes are remembered, so a shape rejected while its
+        index is still building is accepted once the index is ready.
+
+        Raises:
+            QueryNotIndexedError: If the plan scans the collection
+        """
+        stages = OrganizationService._plan_stages(explain["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages:
+            raise QueryNotIndexedError(
+                "Query is not supported by an index and would scan every organization"
+            )
+        OrganizationService._indexed_query_shapes.add(shape)
+
+    @staticmethod
+    def _plan_stages(plan) -> set:
+        """Collect the stage names of a query plan at any depth."""
+        stages = set()
+        if isinstance(plan, dict):
+            if "stage" in plan:
+                stages.add(plan["stage"])
+            for value in plan.values():
+                stages |= OrganizationService._plan_stages(value)
+        elif isinstance(plan, list):
+            for value in plan:
+                stages |= OrganizationService._plan_stages(value)
+        return stages
+
+
+JobService.register_handler(RENAME_ORGANIZATION_JOB, OrganizationService.run_rename_job)
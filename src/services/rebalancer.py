@@ -0,0 +1,412 @@
+"""
+Move tenant collections between placement targets without downtime.
+
+Usage (from the repository root, with .env configured):
+    python -m src.services.rebalancer --dry-run
+    python -m src.services.rebalancer --max-moves 5
+    python -m src.services.rebalancer --organization "Acme" --to east
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure, PyMongoError
+from src.config.database import PRIMARY_TARGET, DatabaseConfig, db
+from src.config.settings import settings
+from src.services.database_service import DatabaseService
+from src.services.job_service import JobService, JobStatus
+from src.services.migration_service import MigrationService
+from src.services.organization_cache import OrganizationCache
+from src.utils.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+REBALANCE_TENANT_JOB = "rebalance_tenant"
+
+
+class TenantRebalancer:
+    """
+    Moves dedicated tenant collections between placement targets.
+
+    Tenants are weighed by storage size and operation rate, and moves are
+    planned greedily from the most to the least loaded target. Each move is
+    a rebalance_tenant job, so it holds the organization's job lock and is
+    resumed by a live worker if the process running it dies. A move:
+
+    1. opens a change stream on the source collection,
+    2. bulk-copies the collection and its indexes into the target database,
+    3. replays the writes captured by the stream until it is caught up,
+    4. fences the organization's writes and waits
+       rebalance_fence_grace_seconds so every process has seen the fence,
+    5. replays the last writes, checks that source and target hold the same
+       number of documents, points database_target at the new database
+       (which lifts the fence) and drops the source collection.
+
+    Without change streams (a standalone server) writes are fenced for the
+    whole copy instead. A move resumed before the cutover starts over from a
+    fresh copy; one resumed after it only drops the source collection.
+    """
+
+    @staticmethod
+    def measure_tenants(sample_seconds: float = 10.0) -> list:
+        """
+        Measure the size and operation rate of every dedicated tenant.
+
+        Operation counts come from $collStats latency statistics, sampled
+        twice sample_seconds apart.
+
+        Args:
+            sample_seconds: Time between the two operation count samples
+
+        Returns:
+            List of tenant dicts (organization_id, organization_name,
+            collection_name, target, bytes, ops_per_sec)
+        """
+        organizations = db.organizations.find(
+            {
+                "collection_state": {"$exists": False},
+                "storage_mode": {"$exists": False},
+                "writes_fenced": {"$exists": False},
+            },
+            {"organization_name": 1, "collection_name": 1, "database_target": 1},
+        )
+
+        tenants = []
+        for org in organizations:
+            target = org.get("database_target") or PRIMARY_TARGET
+            collection = DatabaseService.get_collection_handle(
+                org["collection_name"], target
+            )
+            size, ops = TenantRebalancer._collection_stats(collection)
+            tenants.append(
+                {
+                    "organization_id": org["_id"],
+                    "organization_name": org["organization_name"],
+                    "collection_name": org["collection_name"],
+                    "target": target,
+                    "bytes": size,
+                    "ops": ops,
+                }
+            )
+
+        time.sleep(sample_seconds)
+        for tenant in tenants:
+            collection = DatabaseService.get_collection_handle(
+                tenant["collection_name"], tenant["target"]
+            )
+            _, ops = TenantRebalancer._collection_stats(collection)
+            tenant["ops_per_sec"] = max(ops - tenant.pop("ops"), 0) / sample_seconds
+        return tenants
+
+    @staticmethod
+    def plan_moves(
+        tenants: list, max_moves: int = 10, tolerance: float = 0.1
+    ) -> list:
+        """
+        Plan moves that even out load across targets.
+
+        A tenant's load is the mean of its share of all bytes and its share
+        of all operations. Each step moves, from the most to the least loaded
+        target, the tenant that best closes half the gap between them.
+
+        Args:
+            tenants: Output of measure_tenants
+            max_moves: Most moves to plan
+            tolerance: Stop once the load gap is below this fraction
+
+        Returns:
+            List of (tenant, destination target) tuples
+        """
+        targets = [PRIMARY_TARGET, *settings.tenant_database_targets]
+        total_bytes = sum(tenant["bytes"] for tenant in tenants) or 1
+        total_ops = sum(tenant["ops_per_sec"] for tenant in tenants) or 1
+        for tenant in tenants:
+            tenant["load"] = (
+                tenant["bytes"] / total_bytes + tenant["ops_per_sec"] / total_ops
+            ) / 2
+
+        placement = {target: [] for target in targets}
+        for tenant in tenants:
+            placement.setdefault(tenant["target"], []).append(tenant)
+
+        def load(target: str) -> float:
+            return sum(tenant["load"] for tenant in placement[target])
+
+        moves = []
+        while len(moves) < max_moves:
+            heaviest = max(targets, key=load)
+            lightest = min(targets, key=load)
+            gap = load(heaviest) - load(lightest)
+            if gap <= tolerance or not placement[heaviest]:
+                break
+
+            tenant = min(
+                placement[heaviest], key=lambda tenant: abs(tenant["load"] - gap / 2)
+            )
+            if tenant["load"] >= gap:
+                # Moving it would only swap which target is overloaded
+                break
+
+            placement[heaviest].remove(tenant)
+            placement[lightest].append(tenant)
+            moves.append((tenant, lightest))
+        return moves
+
+    @staticmethod
+    def run_move_job(job: dict, report_progress: Callable[[dict, int], None]) -> dict:
+        """
+        Job handler that moves one tenant collection to another target.
+
+        Args:
+            job: Job document with params.target
+            report_progress: Progress callback for the bulk copy
+
+        Returns:
+            Move summary (documents, throughput, replayed writes, fence time)
+
+        Raises:
+            Exception: If the organization is gone or the move fails
+        """
+        org = db.organizations.find_one({"_id": job["organization_id"]})
+        if not org:
+            raise Exception("Organization not found")
+        if "storage_mode" in org or "collection_state" in org:
+            raise Exception("Only dedicated, materialized collections can be moved")
+
+        source_target = org.get("database_target")
+        destination = job["params"]["target"]
+        if destination == PRIMARY_TARGET:
+            destination = None
+        if destination == source_target:
+            moved_from = job["params"].get("source_target")
+            if moved_from is None:
+                return {"moved": False}
+            # Resumed after the cutover: finish by dropping the old copy
+            if moved_from == PRIMARY_TARGET:
+                moved_from = None
+            if moved_from != destination:
+                DatabaseService.drop_collection(org["collection_name"], moved_from)
+            return {
+                "moved": True,
+                "from": moved_from or PRIMARY_TARGET,
+                "to": destination or PRIMARY_TARGET,
+            }
+
+        collection_name = org["collection_name"]
+        source = DatabaseService.get_collection_handle(collection_name, source_target)
+        # A resumed move cannot trust a partial copy or its lost stream position
+        DatabaseService.drop_collection(collection_name, destination)
+        target = DatabaseService.create_dynamic_collection(
+            collection_name, target=destination
+        )
+        total = source.estimated_document_count()
+
+        fence_started = None
+        replayed = 0
+        stream = TenantRebalancer._open_change_stream(source)
+        try:
+            if stream is None:
+                fence_started = TenantRebalancer._fence(org)
+
+            # Counts drift while writes are still streaming; they are checked
+            # once the fence has stopped them
+            stats = MigrationService.copy_collection_parallel(
+                source,
+                target,
+                progress_callback=lambda stats: report_progress(stats, total),
+                verify_counts=False,
+            )
+            MigrationService.copy_indexes(source, target)
+
+            if stream is not None:
+                replayed += TenantRebalancer._replay(stream, target)
+                fence_started = TenantRebalancer._fence(org)
+                replayed += TenantRebalancer._replay(stream, target)
+
+            source_count = source.count_documents({})
+            target_count = target.count_documents({})
+            if source_count != target_count:
+                raise Exception(f"Moved {target_count} of {source_count} documents")
+
+            # Lets a resumed job drop the source if the worker dies after cutover
+            db.jobs.update_one(
+                {"_id": job["_id"]},
+                {"$set": {"params.source_target": source_target or PRIMARY_TARGET}},
+            )
+        except Exception:
+            DatabaseService.drop_collection(collection_name, destination)
+            TenantRebalancer._cutover(org, source_target)
+            raise
+        finally:
+            if stream is not None:
+                stream.close()
+
+        TenantRebalancer._cutover(org, destination)
+        fence_seconds = time.monotonic() - fence_started
+        DatabaseService.drop_collection(collection_name, source_target)
+
+        Metrics.increment("rebalance.moves")
+        Metrics.observe("rebalance.fence_seconds", fence_seconds)
+        return {
+            "from": source_target or PRIMARY_TARGET,
+            "to": destination or PRIMARY_TARGET,
+            "documents": stats["documents"],
+            "docs_per_sec": stats["docs_per_sec"],
+            "bytes_per_sec": stats["bytes_per_sec"],
+            "replayed_writes": replayed,
+            "fence_seconds": fence_seconds,
+        }
+
+    @staticmethod
+    def _collection_stats(collection: Collection) -> tuple:
+        """Get (storage bytes, total operations) of a collection."""
+        try:
+            stats = next(
+                collection.aggregate(
+                    [{"$collStats": {"storageStats": {}, "latencyStats": {}}}]
+                ),
+                None,
+            )
+        except OperationFailure:
+            # The collection no longer exists
+            return 0, 0
+        if not stats:
+            return 0, 0
+
+        latency = stats.get("latencyStats", {})
+        ops = sum(
+            latency.get(kind, {}).get("ops", 0)
+            for kind in ("reads", "writes", "commands")
+        )
+        storage = stats.get("storageStats", {})
+        return storage.get("storageSize", 0) + storage.get("totalIndexSize", 0), ops
+
+    @staticmethod
+    def _open_change_stream(source: Collection):
+        """Open a change stream on source, or None where they are unsupported."""
+        try:
+            stream = source.watch(full_document="updateLookup", max_await_time_ms=200)
+            # Establish the stream's start position before the copy begins
+            stream.try_next()
+            return stream
+        except PyMongoError:
+            logger.info("Change streams unavailable; fencing writes for the whole copy")
+            return None
+
+    @staticmethod
+    def _replay(stream, target: Collection) -> int:
+        """Apply captured writes to target until the stream is drained."""
+        applied = 0
+        while True:
+            change = stream.try_next()
+            if change is None:
+                return applied
+
+            document_id = change["documentKey"]["_id"]
+            document = change.get("fullDocument")
+            if change["operationType"] == "delete" or document is None:
+                target.delete_one({"_id": document_id})
+            elif change["operationType"] in ("insert", "update", "replace"):
+                target.replace_one({"_id": document_id}, document, upsert=True)
+            else:
+                # drop, rename or invalidate: the source is no longer usable
+                raise Exception(
+                    "Source collection changed during the move "
+                    f"({change['operationType']})"
+                )
+            applied += 1
+
+    @staticmethod
+    def _fence(org: dict) -> float:
+        """Fence the organization's writes and wait until every process sees it."""
+        db.organizations.update_one(
+            {"_id": org["_id"]},
+            {"$set": {"writes_fenced": True, "updated_at": datetime.now(timezone.utc)}},
+        )
+        OrganizationCache.invalidate_organization(org["_id"], org["organization_name"])
+        fence_started = time.monotonic()
+        time.sleep(settings.rebalance_fence_grace_seconds)
+        return fence_started
+
+    @staticmethod
+    def _cutover(org: dict, target: Optional[str]):
+        """Point the organization at a target and lift the fence."""
+        update = {
+            "$set": {"updated_at": datetime.now(timezone.utc)},
+            "$unset": {"writes_fenced": ""},
+        }
+        if target is None:
+            update["$unset"]["database_target"] = ""
+        else:
+            update["$set"]["database_target"] = target
+        db.organizations.update_one({"_id": org["_id"]}, update)
+        OrganizationCache.invalidate_organization(org["_id"], org["organization_name"])
+
+
+JobService.register_handler(REBALANCE_TENANT_JOB, TenantRebalancer.run_move_job)
+
+
+def main():
+    """Plan and run tenant moves, printing a report per move."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="Only print the plan")
+    parser.add_argument("--max-moves", type=int, default=10)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--sample-seconds", type=float, default=10.0)
+    parser.add_argument("--organization", help="Move this organization only")
+    parser.add_argument("--to", help="Target for --organization")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    targets = [PRIMARY_TARGET, *settings.tenant_database_targets]
+
+    if args.organization:
+        if args.to not in targets:
+            raise SystemExit(f"--to must be one of {', '.join(targets)}")
+        org = db.organizations.find_one({"organization_name": args.organization})
+        if not org:
+            raise SystemExit("Organization not found")
+        tenant = {"organization_id": org["_id"], "organization_name": args.organization}
+        moves = [(tenant, args.to)]
+    else:
+        tenants = TenantRebalancer.measure_tenants(args.sample_seconds)
+        moves = TenantRebalancer.plan_moves(tenants, args.max_moves, args.tolerance)
+
+    for tenant, destination in moves:
+        print(f"{tenant['organization_name']}: -> {destination}")
+    if args.dry_run or not moves:
+        return
+
+    JobService.start()
+    try:
+        for tenant, destination in moves:
+            job = JobService.enqueue(
+                REBALANCE_TENANT_JOB, tenant["organization_id"], {"target": destination}
+            )
+            while True:
+                job = db.jobs.find_one({"_id": job["_id"]})
+                if job["status"] in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+                    break
+                time.sleep(1)
+
+            if job["status"] == JobStatus.FAILED:
+                print(f"{tenant['organization_name']}: failed: {job['error']}")
+                continue
+            result = job["result"]
+            print(
+                f"{tenant['organization_name']}: "
+                f"{result.get('from')} -> {result.get('to')}, "
+                f"{result.get('documents', 0)} documents at "
+                f"{result.get('docs_per_sec', 0):.0f} docs/sec, "
+                f"{result.get('replayed_writes', 0)} writes replayed, "
+                f"writes fenced {result.get('fence_seconds', 0):.2f}s"
+            )
+    finally:
+        JobService.shutdown()
+        DatabaseConfig.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Shared-memory organization directory for multi-process deployments.
+
+A single refresher process mirrors every organization into a fixed-layout
+hash table in a memory-mapped file; all API worker processes map the same
+file read-only and look organizations up without locks or database calls.
+
+Layout: a header, then two open-addressing index tables (by name and by
+organization ID) of 2 * slots uint32 record numbers each, then `slots`
+fixed-size records. The refresher publishes a new table under a seqlock:
+the sequence number is odd while it writes, and readers retry whenever the
+number was odd or changed while they read. A restarted refresher writes a
+new file and renames it over the old one, so a mapped file never shrinks;
+readers notice the rename within a second and map the new file.
+
+The heartbeat is the time of the database snapshot the table reflects.
+Workers skip records of organizations they saw invalidated (by their own
+writes or the invalidation bus) after that time, so a stale record is never
+served over the OrganizationCache.
+
+Run the refresher (from the repository root, with .env configured):
+    python -m src.services.shared_directory
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from bson import ObjectId
+from pymongo.database import Database
+from src.config.database import db
+from src.config.settings import settings
+from src.services.invalidation_bus import InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ORGDIR01"
+# magic, seq, slots, record size, count, heartbeat (time.time() of the snapshot)
+HEADER = struct.Struct("<8sQIIId")
+HEADER_SIZE = 64
+SEQ_OFFSET = 8
+HEARTBEAT_OFFSET = 28
+SEQ = struct.Struct("<Q")
+HEARTBEAT = struct.Struct("<d")
+INDEX_ENTRY = struct.Struct("<I")
+# org id, admin id, has admin, created_at/updated_at (ms), then length-prefixed
+# name, collection name and admin email
+RECORD = struct.Struct("<12s12s?qqH200sH128sH254s")
+MAX_READ_ATTEMPTS = 100
+
+
+def _key_hash(key: bytes) -> int:
+    """Process-independent hash of a lookup key."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _to_millis(value: Optional[datetime]) -> int:
+    """Encode a datetime as milliseconds since the epoch."""
+    if value is None:
+        return 0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def _from_millis(value: int) -> datetime:
+    """Decode milliseconds since the epoch (naive UTC, like PyMongo returns)."""
+    return datetime.fromtimestamp(value / 1000, timezone.utc).replace(tzinfo=None)
+
+
+def _table_sizes(slots: int) -> tuple:
+    """Return (index slots, offset of id index, offset of records, file size)."""
+    index_slots = slots * 2
+    id_index_offset = HEADER_SIZE + index_slots * INDEX_ENTRY.size
+    records_offset = id_index_offset + index_slots * INDEX_ENTRY.size
+    return index_slots, id_index_offset, records_offset, records_offset + slots * RECORD.size
+
+
+class SharedDirectory:
+    """Lock-free reader of the shared organization directory."""
+
+    _map: Optional[mmap.mmap] = None
+    # (st_dev, st_ino) of the mapped file
+    _map_identity: Optional[tuple] = None
+    _next_open_attempt = 0.0
+
+    # Organization IDs, admin IDs and names -> time.time() of invalidation
+    _invalidated: dict = {}
+    _reset_at = 0.0
+    _invalidation_lock = threading.Lock()
+
+    hits = 0
+    misses = 0
+    retries = 0
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """Whether a directory path is configured."""
+        return bool(settings.shared_directory_path)
+
+    @classmethod
+    def get_by_name(cls, organization_name: str) -> Optional[dict]:
+        """
+        Look an organization up by name.
+
+        Args:
+            organization_name: Name of the organization
+
+        Returns:
+            Organization document with admin info, or None if the directory is
+            unavailable, stale, or does not contain it
+        """
+        return cls._lookup(organization_name.encode(), by_id=False)
+
+    @classmethod
+    def get_by_id(cls, organization_id: ObjectId) -> Optional[dict]:
+        """
+        Look an organization up by ID.
+
+        Args:
+            organization_id: Organization ObjectId
+
+        Returns:
+            Organization document with admin info, or None if the directory is
+            unavailable, stale, or does not contain it
+        """
+        return cls._lookup(organization_id.binary, by_id=True)
+
+    @classmethod
+    def invalidate(cls, *keys):
+        """
+        Stop serving records for keys changed since the directory's snapshot.
+
+        Args:
+            keys: Organization IDs, admin IDs and organization names
+        """
+        now = time.time()
+        with cls._invalidation_lock:
+            for key in keys:
+                cls._invalidated[key] = now
+            if len(cls._invalidated) > 1024:
+                # Older invalidations predate every directory still served
+                cutoff = now - settings.shared_directory_max_age_seconds
+                cls._invalidated = {
+                    key: at for key, at in cls._invalidated.items() if at >= cutoff
+                }
+
+    @classmethod
+    def invalidate_all(cls):
+        """Stop serving any record until the directory is republished."""
+        with cls._invalidation_lock:
+            cls._reset_at = time.time()
+            cls._invalidated = {}
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Get reader counters for monitoring.
+
+        Returns:
+            Dictionary with entry count, age and hit/miss counters
+        """
+        directory = cls._get_map()
+        count, age = None, None
+        if directory is not None:
+            count = HEADER.unpack_from(directory, 0)[4]
+            age = time.time() - HEARTBEAT.unpack_from(directory, HEARTBEAT_OFFSET)[0]
+        return {
+            "enabled": cls.enabled(),
+            "entries": count,
+            "age_seconds": age,
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "retries": cls.retries,
+        }
+
+    @classmethod
+    def _get_map(cls) -> Optional[mmap.mmap]:
+        """
+        Map the directory file read-only.
+
+        At most once a second, checks whether the refresher replaced the file
+        and maps the new one if so. The old map is left to the garbage
+        collector, as other threads may still be reading it.
+        """
+        if not cls.enabled():
+            return None
+
+        now = time.monotonic()
+        if now < cls._next_open_attempt:
+            return cls._map
+        cls._next_open_attempt = now + 1
+
+        try:
+            with open(settings.shared_directory_path, "rb") as f:
+                info = os.fstat(f.fileno())
+                identity = (info.st_dev, info.st_ino)
+                if cls._map is not None and identity == cls._map_identity:
+                    return cls._map
+                directory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return cls._map
+
+        cls._map = directory if cls._valid_header(directory) else None
+        cls._map_identity = identity
+        return cls._map
+
+    @staticmethod
+    def _valid_header(directory: mmap.mmap) -> Optional[int]:
+        """Get the slot count if the header matches this layout and file size."""
+        if len(directory) < HEADER_SIZE:
+            return None
+        magic, _, slots, record_size, _, _ = HEADER.unpack_from(directory, 0)
+        if (
+            magic != MAGIC
+            or record_size != RECORD.size
+            or slots == 0
+            or len(directory) < _table_sizes(slots)[3]
+        ):
+            return None
+        return slots
+
+    @classmethod
+    def _lookup(cls, key: bytes, by_id: bool) -> Optional[dict]:
+        """Probe one of the index tables under the seqlock."""
+        directory = cls._get_map()
+        if directory is None:
+            return None
+
+        for _ in range(MAX_READ_ATTEMPTS):
+            start_seq = SEQ.unpack_from(directory, SEQ_OFFSET)[0]
+            if start_seq & 1:
+                cls.retries += 1
+                time.sleep(0)
+                continue
+
+            slots = cls._valid_header(directory)
+            if slots is None:
+                cls.misses += 1
+                return None
+
+            heartbeat = HEARTBEAT.unpack_from(directory, HEARTBEAT_OFFSET)[0]
+            if time.time() - heartbeat > settings.shared_directory_max_age_seconds:
+                # The refresher stopped; don't serve an outdated table
+                cls.misses += 1
+                return None
+
+            try:
+                result = cls._probe(directory, slots, key, by_id)
+            except (struct.error, UnicodeDecodeError, ValueError):
+                result = None
+
+            if SEQ.unpack_from(directory, SEQ_OFFSET)[0] == start_seq:
+                if result is not None and cls._invalidated_since(result, heartbeat):
+                    result = None
+                if result is None:
+                    cls.misses += 1
+                else:
+                    cls.hits += 1
+                return result
+            cls.retries += 1
+
+        cls.misses += 1
+        return None
+
+    @classmethod
+    def _invalidated_since(cls, org: dict, snapshot: float) -> bool:
+        """Whether the record may have changed after the directory snapshot."""
+        keys = (org["_id"], org.get("admin_id"), org["organization_name"])
+        with cls._invalidation_lock:
+            if cls._reset_at >= snapshot:
+                return True
+            return any(cls._invalidated.get(key, 0.0) >= snapshot for key in keys)
+
+    @staticmethod
+    def _probe(
+        directory: mmap.mmap, slots: int, key: bytes, by_id: bool
+    ) -> Optional[dict]:
+        """Find a record by linear probing. May see torn data; caller verifies."""
+        index_slots, id_index_offset, records_offset, _ = _table_sizes(slots)
+        index_offset = id_index_offset if by_id else HEADER_SIZE
+        position = _key_hash(key) % index_slots
+
+        for _ in range(index_slots):
+            record_number = INDEX_ENTRY.unpack_from(
+                directory, index_offset + position * INDEX_ENTRY.size
+            )[0]
+            if record_number == 0 or record_number > slots:
+                return None
+
+            record = RECORD.unpack_from(
+                directory, records_offset + (record_number - 1) * RECORD.size
+            )
+            org_id, admin_id, has_admin, created_at, updated_at = record[:5]
+            name = record[6][: record[5]]
+            if (org_id if by_id else name) == key:
+                org = {
+                    "_id": ObjectId(org_id),
+                    "organization_name": name.decode(),
+                    "collection_name": record[8][: record[7]].decode(),
+                    "created_at": _from_millis(created_at),
+                    "updated_at": _from_millis(updated_at),
+                }
+                if has_admin:
+                    org["admin_id"] = ObjectId(admin_id)
+                    org["admin_email"] = record[10][: record[9]].decode()
+                return org
+
+            position = (position + 1) % index_slots
+
+        return None
+
+
+class SharedDirectoryWriter:
+    """Builds the directory file and publishes new tables under the seqlock."""
+
+    def __init__(self, path: str, slots: int):
+        self.path = path
+        self.slots = slots
+        self.index_slots, self.id_index_offset, self.records_offset, size = (
+            _table_sizes(slots)
+        )
+
+        # Never resize a file readers may have mapped: build a new one and
+        # rename it into place
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self.map = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+
+        # A zero heartbeat keeps readers off the table until the first publish
+        HEADER.pack_into(self.map, 0, MAGIC, 0, slots, RECORD.size, 0, 0.0)
+        os.replace(temp_path, path)
+
+    def publish(self, organizations: list, snapshot_at: float):
+        """
+        Replace the directory contents.
+
+        Args:
+            organizations: Assembled organization records (see load_organizations)
+            snapshot_at: time.time() taken before the records were read
+        """
+        body = bytearray(self.map.size() - HEADER_SIZE)
+        count = 0
+
+        for org in organizations:
+            if count == self.slots:
+                logger.warning(
+                    "Shared directory full; %d organizations not mirrored",
+                    len(organizations) - count,
+                )
+                break
+
+            name = org["organization_name"].encode()
+            collection_name = org["collection_name"].encode()
+            email = org.get("admin_email", "").encode()
+            if len(name) > 200 or len(collection_name) > 128 or len(email) > 254:
+                continue
+
+            record = RECORD.pack(
+                org["_id"].binary,
+                org["admin_id"].binary if org.get("admin_id") else bytes(12),
+                org.get("admin_id") is not None,
+                _to_millis(org.get("created_at")),
+                _to_millis(org.get("updated_at")),
+                len(name),
+                name,
+                len(collection_name),
+                collection_name,
+                len(email),
+                email,
+            )
+            record_offset = self.records_offset - HEADER_SIZE + count * RECORD.size
+            body[record_offset : record_offset + RECORD.size] = record
+            count += 1
+
+            self._insert_index(body, 0, name, count)
+            self._insert_index(
+                body, self.id_index_offset - HEADER_SIZE, org["_id"].binary, count
+            )
+
+        seq = SEQ.unpack_from(self.map, SEQ_OFFSET)[0]
+        SEQ.pack_into(self.map, SEQ_OFFSET, seq + 1)
+        self.map[HEADER_SIZE:] = body
+        HEADER.pack_into(
+            self.map, 0, MAGIC, seq + 1, self.slots, RECORD.size, count, snapshot_at
+        )
+        SEQ.pack_into(self.map, SEQ_OFFSET, seq + 2)
+
+    def heartbeat(self, snapshot_at: float):
+        """
+        Mark the current table as up to date.
+
+        Args:
+            snapshot_at: time.time() taken before the database was last checked
+        """
+        HEARTBEAT.pack_into(self.map, HEARTBEAT_OFFSET, snapshot_at)
+
+    def _insert_index(self, body: bytearray, index_offset: int, key: bytes, record_number: int):
+        """Insert a record number into an index table by linear probing."""
+        position = _key_hash(key) % self.index_slots
+        while INDEX_ENTRY.unpack_from(body, index_offset + position * INDEX_ENTRY.size)[0]:
+            position = (position + 1) % self.index_slots
+        INDEX_ENTRY.pack_into(
+            body, index_offset + position * INDEX_ENTRY.size, record_number
+        )
+
+
+class ChangeCounter:
+    """
+    Counts changes to organizations and admins seen by the invalidation bus.
+
+    Unlike timestamps written by the application servers, the counter only
+    moves forward, so a write stamped by a server with a slow clock is still
+    noticed.
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._lock = threading.Lock()
+        for collection_name in InvalidationBus.WATCHED_COLLECTIONS:
+            InvalidationBus.subscribe(collection_name, self._on_change)
+        InvalidationBus.subscribe_reset(self._bump)
+
+    def version(self) -> Optional[int]:
+        """Current version, or None while the bus is not delivering changes."""
+        if InvalidationBus.mode is None:
+            return None
+        with self._lock:
+            return self._version
+
+    def _on_change(self, document_id: ObjectId, document: Optional[dict]):
+        """Invalidation bus handler for the watched collections."""
+        self._bump()
+
+    def _bump(self):
+        """Advance the version."""
+        with self._lock:
+            self._version += 1
+
+
+def load_organizations(database: Database) -> list:
+    """
+    Load every organization with its admin's ID and email.
+
+    Organizations whose collection is still pending, that use shared storage
+    or that are placed outside the main database (see
+    OrganizationService.get_tenant_collection) are left out: the record has
+    no room for that state, so lookups for them fall through to the cache.
+    """
+    admins = {}
+    for admin in database.admin_users.find({}, {"email": 1, "organization_id": 1}):
+        admins.setdefault(admin["organization_id"], admin)
+
+    organizations = []
+    for org in database.organizations.find(
+        {
+            "collection_state": {"$exists": False},
+            "storage_mode": {"$exists": False},
+            "database_target": {"$exists": False},
+            "writes_fenced": {"$exists": False},
+        },
+        {"organization_name": 1, "collection_name": 1, "created_at": 1, "updated_at": 1},
+    ):
+        admin = admins.get(org["_id"])
+        if admin:
+            org["admin_email"] = admin["email"]
+            org["admin_id"] = admin["_id"]
+        organizations.append(org)
+    return organizations
+
+
+def main():
+    """Keep the shared directory in sync with the master database."""
+    if not settings.shared_directory_path:
+        raise SystemExit("SHARED_DIRECTORY_PATH is not set")
+
+    logging.basicConfig(level=logging.INFO)
+    writer = SharedDirectoryWriter(
+        settings.shared_directory_path, settings.shared_directory_slots
+    )
+    changes = ChangeCounter()
+    InvalidationBus.start()
+    last_version = None
+
+    while True:
+        try:
+            snapshot_at = time.time()
+            version = changes.version()
+            if version is None or version != last_version:
+                # Without the bus there is no way to tell; republish every time
+                organizations = load_organizations(db)
+                writer.publish(organizations, snapshot_at)
+                last_version = version
+                logger.info("Published %d organizations", len(organizations))
+            else:
+                # A write just before snapshot_at may still be on its way
+                # through the bus, so only vouch for the table up to one poll
+                # interval earlier
+                writer.heartbeat(
+                    snapshot_at - settings.cache_invalidation_poll_interval_seconds
+                )
+        except Exception:
+            logger.exception("Refreshing the shared directory failed")
+
+        time.sleep(settings.shared_directory_refresh_interval_seconds)
+
+
+if __name__ == "__main__":
+    main()
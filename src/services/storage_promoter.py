@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from pymongo import ASCENDING, DESCENDING
+from src.config.database import db
+from src.config.settings import settings
+from src.services.database_service import DatabaseService
+from src.services.job_service import JobConflictError, JobService
+from src.services.migration_service import MigrationService
+from src.services.organization_cache import OrganizationCache
+from src.services.tenant_collection import TENANT_STORAGE_HYBRID, StorageMode
+from src.utils.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+PROMOTE_STORAGE_JOB = "promote_storage"
+
+
+class StoragePromoter:
+    """
+    Moves organizations out of the shared tenant collection once they grow.
+
+    A background thread counts documents per tenant_id in the shared
+    collection (an index-only scan) and queues a promotion job for every
+    organization above storage_promotion_threshold_documents. The job:
+
+    1. marks the organization "promoting", which fences its writes,
+    2. waits storage_promotion_grace_seconds so every process has seen the
+       fence (keep it above the cache invalidation latency),
+    3. copies the tenant's documents into its reserved dedicated collection,
+    4. clears storage_mode, which unfences writes against the new collection,
+    5. deletes the tenant's documents from the shared collection.
+
+    Reads keep working throughout, and every step is safe to repeat when a
+    job is resumed after a restart: a job resumed after step 4 finds the
+    organization already dedicated and only repeats step 5. A failed copy
+    lifts the fence and discards the partial collection. Copied documents
+    keep their tenant_id.
+    """
+
+    _thread: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+
+    @staticmethod
+    def find_candidates() -> list:
+        """
+        Find tenants of the shared collection above the promotion threshold.
+
+        Returns:
+            List of (organization_id, document_count), largest first
+        """
+        threshold = settings.storage_promotion_threshold_documents
+        pipeline = [
+            {"$group": {"_id": "$tenant_id", "documents": {"$sum": 1}}},
+            {"$match": {"documents": {"$gte": threshold}}},
+            {"$sort": {"documents": -1}},
+        ]
+        shared = db[settings.shared_tenant_collection]
+        cursor = shared.aggregate(
+            pipeline, hint=[("tenant_id", ASCENDING), ("_id", ASCENDING)]
+        )
+        return [(candidate["_id"], candidate["documents"]) for candidate in cursor]
+
+    @classmethod
+    def queue_promotions(cls) -> int:
+        """
+        Queue a promotion job for every tenant above the threshold.
+
+        Returns:
+            Number of jobs queued
+        """
+        queued = 0
+        for organization_id, documents in cls.find_candidates():
+            try:
+                JobService.enqueue(
+                    PROMOTE_STORAGE_JOB, organization_id, {"documents": documents}
+                )
+            except JobConflictError:
+                # Another job (possibly this promotion) is already active
+                continue
+            queued += 1
+
+        if queued:
+            Metrics.increment("storage_promotion.queued", queued)
+        return queued
+
+    @staticmethod
+    def run_promotion_job(
+        job: dict, report_progress: Callable[[dict, int], None]
+    ) -> dict:
+        """
+        Job handler that moves one organization to a dedicated collection.
+
+        Args:
+            job: Job document of the organization to promote
+            report_progress: Progress callback for the copy
+
+        Returns:
+            Summary with copied documents and fence duration
+
+        Raises:
+            Exception: If the organization no longer exists or the copy fails
+        """
+        organization_id = job["organization_id"]
+        org = db.organizations.find_one({"_id": organization_id})
+        if not org:
+            raise Exception("Organization not found")
+
+        shared = db[settings.shared_tenant_collection]
+        if "storage_mode" not in org:
+            # Already dedicated; finish a promotion interrupted before cleanup
+            result = shared.delete_many({"tenant_id": organization_id})
+            return {
+                "storage_mode": StorageMode.DEDICATED,
+                "documents": 0,
+                "deleted_shared_documents": result.deleted_count,
+            }
+
+        fence_started = time.monotonic()
+        StoragePromoter._set_storage_mode(
+            org, {"$set": {"storage_mode": StorageMode.PROMOTING}}
+        )
+        time.sleep(settings.storage_promotion_grace_seconds)
+
+        target = DatabaseService.create_dynamic_collection(
+            org["collection_name"], target=org.get("database_target")
+        )
+        total = shared.count_documents({"tenant_id": organization_id})
+
+        # Writes are fenced, so whatever was already copied is final
+        last_copied = target.find_one({}, {"_id": 1}, sort=[("_id", DESCENDING)])
+        try:
+            stats = MigrationService.copy_collection(
+                shared,
+                target,
+                query={"tenant_id": organization_id},
+                progress_callback=lambda stats: report_progress(stats, total),
+                resume_after=last_copied["_id"] if last_copied else None,
+            )
+        except Exception:
+            # Lift the fence; the partial copy goes stale once writes resume
+            DatabaseService.drop_collection(
+                org["collection_name"], org.get("database_target")
+            )
+            StoragePromoter._set_storage_mode(
+                org, {"$set": {"storage_mode": StorageMode.SHARED}}
+            )
+            raise
+
+        StoragePromoter._set_storage_mode(org, {"$unset": {"storage_mode": ""}})
+        fence_seconds = time.monotonic() - fence_started
+        shared.delete_many({"tenant_id": organization_id})
+
+        Metrics.increment("storage_promotion.completed")
+        Metrics.observe("storage_promotion.fence_seconds", fence_seconds)
+        logger.info(
+            "Promoted organization %s to %s (%d documents, writes fenced %.1fs)",
+            organization_id,
+            org["collection_name"],
+            stats["documents"],
+            fence_seconds,
+        )
+        return {
+            "storage_mode": StorageMode.DEDICATED,
+            "documents": stats["documents"],
+            "fence_seconds": fence_seconds,
+        }
+
+    @classmethod
+    def start(cls):
+        """Check for tenants to promote on the configured interval."""
+        if settings.tenant_storage_mode != TENANT_STORAGE_HYBRID:
+            return
+        if cls._thread is not None:
+            return
+
+        cls._stop_event.clear()
+        cls._thread = threading.Thread(
+            target=cls._check_loop, name="storage-promoter", daemon=True
+        )
+        cls._thread.start()
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the check thread."""
+        cls._stop_event.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=5)
+            cls._thread = None
+
+    @staticmethod
+    def _set_storage_mode(org: dict, update: dict):
+        """Change an organization's storage mode and drop cached copies."""
+        update.setdefault("$set", {})["updated_at"] = datetime.now(timezone.utc)
+        db.organizations.update_one({"_id": org["_id"]}, update)
+        OrganizationCache.invalidate_organization(org["_id"], org["organization_name"])
+
+    @classmethod
+    def _check_loop(cls):
+        """Queue promotions, then wait for the next check."""
+        while not cls._stop_event.wait(settings.storage_promotion_check_interval_seconds):
+            try:
+                cls.queue_promotions()
+            except Exception:
+                logger.exception("Checking for tenants to promote failed")
+
+
+JobService.register_handler(PROMOTE_STORAGE_JOB, StoragePromoter.run_promotion_job)
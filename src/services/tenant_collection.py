@@ -0,0 +1,187 @@
+from typing import Any, Optional
+from bson import ObjectId
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.collection import Collection
+
+
+# tenant_storage_mode placing new organizations in the shared collection
+TENANT_STORAGE_HYBRID = "hybrid"
+
+
+class StorageMode:
+    """Where an organization's documents are stored."""
+
+    # Own collection (collection_name); organizations without storage_mode
+    DEDICATED = "dedicated"
+    # Shared collection, every document stamped with the tenant_id
+    SHARED = "shared"
+    # Still shared, writes fenced while the data moves to a dedicated collection
+    PROMOTING = "promoting"
+
+
+class TenantStorageBusyError(Exception):
+    """Raised when a tenant's writes are fenced while its storage moves."""
+
+    pass
+
+
+class TenantCollection:
+    """
+    Collection handle scoped to one organization.
+
+    For a dedicated collection calls pass straight through. For the shared
+    collection every filter is restricted to the organization's tenant_id and
+    every inserted document is stamped with it, so callers use the same code
+    for both storage modes. Documents in the shared collection must keep
+    globally unique _ids (the ObjectId default).
+    """
+
+    def __init__(
+        self,
+        collection: Collection,
+        tenant_id: Optional[ObjectId] = None,
+        writes_fenced: bool = False,
+    ):
+        """
+        Args:
+            collection: Underlying collection
+            tenant_id: Organization ID to scope to, None for a dedicated collection
+            writes_fenced: Reject writes (storage is being moved)
+        """
+        self.collection = collection
+        self.tenant_id = tenant_id
+        self.writes_fenced = writes_fenced
+
+    def scope(self, filter: Optional[dict] = None) -> dict:
+        """Restrict a filter to this tenant."""
+        filter = dict(filter or {})
+        if self.tenant_id is not None:
+            filter["tenant_id"] = self.tenant_id
+        return filter
+
+    def stamp(self, document: dict) -> dict:
+        """Tag a document with this tenant (in place) before it is written."""
+        self.check_writable()
+        if self.tenant_id is not None:
+            document["tenant_id"] = self.tenant_id
+        return document
+
+    def check_writable(self):
+        """
+        Raises:
+            TenantStorageBusyError: If writes are fenced
+        """
+        if self.writes_fenced:
+            raise TenantStorageBusyError(
+                "Organization storage is being migrated, retry shortly"
+            )
+
+    def find(self, filter: Optional[dict] = None, *args, **kwargs):
+        """Scoped version of Collection.find."""
+        return self.collection.find(self.scope(filter), *args, **kwargs)
+
+    def find_one(self, filter: Optional[dict] = None, *args, **kwargs) -> Optional[dict]:
+        """Scoped version of Collection.find_one."""
+        return self.collection.find_one(self.scope(filter), *args, **kwargs)
+
+    def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        """Scoped version of Collection.count_documents."""
+        return self.collection.count_documents(self.scope(filter), **kwargs)
+
+    def aggregate(self, pipeline: list, **kwargs):
+        """Scoped version of Collection.aggregate."""
+        if self.tenant_id is not None:
+            pipeline = [{"$match": {"tenant_id": self.tenant_id}}, *pipeline]
+        return self.collection.aggregate(pipeline, **kwargs)
+
+    def insert_one(self, document: dict, **kwargs):
+        """Scoped version of Collection.insert_one."""
+        return self.collection.insert_one(self.stamp(document), **kwargs)
+
+    def insert_many(self, documents: list, **kwargs):
+        """Scoped version of Collection.insert_many."""
+        return self.collection.insert_many(
+            [self.stamp(document) for document in documents], **kwargs
+        )
+
+    def replace_one(self, filter: dict, replacement: dict, **kwargs):
+        """Scoped version of Collection.replace_one."""
+        return self.collection.replace_one(
+            self.scope(filter), self.stamp(replacement), **kwargs
+        )
+
+    def update_one(self, filter: dict, update: Any, **kwargs):
+        """Scoped version of Collection.update_one."""
+        self.check_writable()
+        return self.collection.update_one(self.scope(filter), update, **kwargs)
+
+    def update_many(self, filter: dict, update: Any, **kwargs):
+        """Scoped version of Collection.update_many."""
+        self.check_writable()
+        return self.collection.update_many(self.scope(filter), update, **kwargs)
+
+    def delete_one(self, filter: dict, **kwargs):
+        """Scoped version of Collection.delete_one."""
+        self.check_writable()
+        return self.collection.delete_one(self.scope(filter), **kwargs)
+
+    def delete_many(self, filter: dict, **kwargs):
+        """Scoped version of Collection.delete_many."""
+        self.check_writable()
+        return self.collection.delete_many(self.scope(filter), **kwargs)
+
+
+class AsyncTenantCollection(TenantCollection):
+    """Async version of TenantCollection."""
+
+    collection: AsyncCollection
+
+    async def find_one(self, filter: Optional[dict] = None, *args, **kwargs) -> Optional[dict]:
+        """Async version of find_one."""
+        return await self.collection.find_one(self.scope(filter), *args, **kwargs)
+
+    async def count_documents(self, filter: Optional[dict] = None, **kwargs) -> int:
+        """Async version of count_documents."""
+        return await self.collection.count_documents(self.scope(filter), **kwargs)
+
+    async def aggregate(self, pipeline: list, **kwargs):
+        """Async version of aggregate."""
+        if self.tenant_id is not None:
+            pipeline = [{"$match": {"tenant_id": self.tenant_id}}, *pipeline]
+        return await self.collection.aggregate(pipeline, **kwargs)
+
+    async def insert_one(self, document: dict, **kwargs):
+        """Async version of insert_one."""
+        return await self.collection.insert_one(self.stamp(document), **kwargs)
+
+    async def insert_many(self, documents: list, **kwargs):
+        """Async version of insert_many."""
+        return await self.collection.insert_many(
+            [self.stamp(document) for document in documents], **kwargs
+        )
+
+    async def replace_one(self, filter: dict, replacement: dict, **kwargs):
+        """Async version of replace_one."""
+        return await self.collection.replace_one(
+            self.scope(filter), self.stamp(replacement), **kwargs
+        )
+
+    async def update_one(self, filter: dict, update: Any, **kwargs):
+        """Async version of update_one."""
+        self.check_writable()
+        return await self.collection.update_one(self.scope(filter), update, **kwargs)
+
+    async def update_many(self, filter: dict, update: Any, **kwargs):
+        """Async version of update_many."""
+        self.check_writable()
+        return await self.collection.update_many(self.scope(filter), update, **kwargs)
+
+    async def delete_one(self, filter: dict, **kwargs):
+        """Async version of delete_one."""
+        self.check_writable()
+        return await self.collection.delete_one(self.scope(filter), **kwargs)
+
+    async def delete_many(self, filter: dict, **kwargs):
+        """Async version of delete_many."""
+        self.check_writable()
+        return await self.collection.delete_many(self.scope(filter), **kwargs)
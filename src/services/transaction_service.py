@@ -0,0 +1,173 @@
+import time
+from typing import Awaitable, Callable, TypeVar
+from pymongo import WriteConcern
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.client_session import ClientSession
+from pymongo.errors import PyMongoError
+from pymongo.read_concern import ReadConcern
+from src.config.database import AsyncDatabaseConfig, DatabaseConfig, db, async_db
+from src.config.settings import settings
+from src.utils.metrics import Metrics
+
+T = TypeVar("T")
+
+TRANSIENT_TRANSACTION_ERROR = "TransientTransactionError"
+UNKNOWN_COMMIT_RESULT = "UnknownTransactionCommitResult"
+
+
+class TransactionService:
+    """
+    Runs groups of writes in multi-document transactions.
+
+    Transactions need a replica set (a single-node one is enough) or a sharded
+    cluster; callers check supported() and keep a non-transactional path for
+    standalone servers. The whole callback is retried on
+    TransientTransactionError and the commit alone on
+    UnknownTransactionCommitResult, until transaction_timeout_seconds passes.
+    Commit latency and retries are recorded under "transaction.<name>.*".
+    """
+
+    @staticmethod
+    def supported() -> bool:
+        """Whether writes should go through transactions on this deployment."""
+        return settings.transactions_enabled and DatabaseConfig.supports_transactions()
+
+    @staticmethod
+    async def supported_async() -> bool:
+        """Async version of supported."""
+        return (
+            settings.transactions_enabled
+            and await AsyncDatabaseConfig.supports_transactions()
+        )
+
+    @staticmethod
+    def run(
+        name: str,
+        callback: Callable[[ClientSession], T],
+        read_concern: str = "snapshot",
+    ) -> T:
+        """
+        Run a callback in a transaction and commit it.
+
+        Args:
+            name: Metric name of the transaction (e.g. "create_organization")
+            callback: Performs the writes, passing session to every operation;
+                may run more than once
+            read_concern: Read concern level of the transaction; use "local"
+                when the callback creates collections or indexes, which
+                MongoDB rejects in a snapshot transaction
+
+        Returns:
+            Whatever the callback returned in the committed attempt
+
+        Raises:
+            Exception: Whatever the callback or the commit raised last
+        """
+        deadline = time.monotonic() + settings.transaction_timeout_seconds
+
+        with db.client.start_session() as session:
+            while True:
+                session.start_transaction(
+                    read_concern=ReadConcern(read_concern),
+                    write_concern=WriteConcern("majority"),
+                )
+                try:
+                    result = callback(session)
+                except Exception as e:
+                    if session.in_transaction:
+                        session.abort_transaction()
+                    if TransactionService._should_retry(e, TRANSIENT_TRANSACTION_ERROR, deadline):
+                        Metrics.increment(f"transaction.{name}.retries")
+                        continue
+                    Metrics.increment(f"transaction.{name}.aborted")
+                    raise
+
+                if TransactionService._commit(name, session, deadline):
+                    return result
+
+    @staticmethod
+    async def run_async(
+        name: str,
+        callback: Callable[[AsyncClientSession], Awaitable[T]],
+        read_concern: str = "snapshot",
+    ) -> T:
+        """Async version of run."""
+        deadline = time.monotonic() + settings.transaction_timeout_seconds
+
+        async with async_db.client.start_session() as session:
+            while True:
+                await session.start_transaction(
+                    read_concern=ReadConcern(read_concern),
+                    write_concern=WriteConcern("majority"),
+                )
+                try:
+                    result = await callback(session)
+                except Exception as e:
+                    if session.in_transaction:
+                        await session.abort_transaction()
+                    if TransactionService._should_retry(e, TRANSIENT_TRANSACTION_ERROR, deadline):
+                        Metrics.increment(f"transaction.{name}.retries")
+                        continue
+                    Metrics.increment(f"transaction.{name}.aborted")
+                    raise
+
+                if await TransactionService._commit_async(name, session, deadline):
+                    return result
+
+    @staticmethod
+    def _commit(name: str, session: ClientSession, deadline: float) -> bool:
+        """
+        Commit, retrying an unknown outcome.
+
+        Returns:
+            True once committed, False if the whole transaction must be retried
+        """
+        while True:
+            started = time.monotonic()
+            try:
+                session.commit_transaction()
+            except PyMongoError as e:
+                if TransactionService._should_retry(e, UNKNOWN_COMMIT_RESULT, deadline):
+                    Metrics.increment(f"transaction.{name}.retries")
+                    continue
+                if TransactionService._should_retry(e, TRANSIENT_TRANSACTION_ERROR, deadline):
+                    Metrics.increment(f"transaction.{name}.retries")
+                    return False
+                Metrics.increment(f"transaction.{name}.aborted")
+                raise
+
+            Metrics.observe(f"transaction.{name}.commit_seconds", time.monotonic() - started)
+            Metrics.increment(f"transaction.{name}.committed")
+            return True
+
+    @staticmethod
+    async def _commit_async(
+        name: str, session: AsyncClientSession, deadline: float
+    ) -> bool:
+        """Async version of _commit."""
+        while True:
+            started = time.monotonic()
+            try:
+                await session.commit_transaction()
+            except PyMongoError as e:
+                if TransactionService._should_retry(e, UNKNOWN_COMMIT_RESULT, deadline):
+                    Metrics.increment(f"transaction.{name}.retries")
+                    continue
+                if TransactionService._should_retry(e, TRANSIENT_TRANSACTION_ERROR, deadline):
+                    Metrics.increment(f"transaction.{name}.retries")
+                    return False
+                Metrics.increment(f"transaction.{name}.aborted")
+                raise
+
+            Metrics.observe(f"transaction.{name}.commit_seconds", time.monotonic() - started)
+            Metrics.increment(f"transaction.{name}.committed")
+            return True
+
+    @staticmethod
+    def _should_retry(error: Exception, label: str, deadline: float) -> bool:
+        """Whether an error carries a retryable label and time is left."""
+        return (
+            isinstance(error, PyMongoError)
+            and error.has_error_label(label)
+            and time.monotonic() < deadline
+        )
@@ -0,0 +1,276 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Roughly estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Value to measure (dicts, lists, tuples and scalars)
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class _CacheEntry:
+    """Single cached value with its expiry, size and tags."""
+
+    __slots__ = ("value", "expires_at", "stale_until", "size", "tags")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        stale_until: float,
+        size: int,
+        tags: tuple,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+        self.tags = tags
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache with per-entry expiry.
+
+    Entries are bounded both by count and by estimated memory, and can be
+    tagged so that every entry related to e.g. one admin can be dropped at once.
+    An entry stored with a stale_ttl stays readable through get_stale for that
+    long after it expires, so callers can serve it while they refresh it.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._tags: dict = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    @property
+    def epoch(self) -> int:
+        """Counter bumped on every invalidation, used to reject racing writes."""
+        return self._epoch
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss or expiry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            if entry.expires_at <= now:
+                if entry.stale_until <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_stale(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """
+        Get a value from the cache, accepting it within its stale window.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (value, fresh); value is None on miss, and fresh is False
+            when the entry has expired but may still be served while refreshing
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            now = time.monotonic()
+            if entry.stale_until <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+            if entry.expires_at <= now:
+                self.stale_hits += 1
+                return entry.value, False
+
+            self.hits += 1
+            return entry.value, True
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[Hashable] = (),
+        epoch: Optional[int] = None,
+        stale_ttl: float = 0,
+    ) -> bool:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Lifetime in seconds (defaults to the cache TTL)
+            tags: Tags the entry can later be invalidated by
+            epoch: Epoch read before the value was loaded; the write is dropped
+                if an invalidation happened in between
+            stale_ttl: Extra seconds the entry stays readable via get_stale
+
+        Returns:
+            True if the value was stored, False otherwise
+        """
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            return False
+
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if epoch is not None and epoch != self._epoch:
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            expires_at = time.monotonic() + ttl
+            entry = _CacheEntry(
+                value, expires_at, expires_at + stale_ttl, size, tuple(tags)
+            )
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Remove a single entry from the cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if an entry was removed, False otherwise
+        """
+        with self._lock:
+            self._epoch += 1
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self.invalidations += 1
+            return True
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """
+        Remove every entry carrying the given tag.
+
+        Args:
+            tag: Tag to invalidate
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._epoch += 1
+            keys = self._tags.pop(tag, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache counters for sizing and monitoring.
+
+        Returns:
+            Dictionary with size, limits and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+            }
+
+    def _remove(self, key: Hashable):
+        """Remove an entry and its tag references. Caller must hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
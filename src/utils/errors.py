@@ -0,0 +1,22 @@
+import re
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+
+
+def duplicate_key_field(error: DuplicateKeyError) -> Optional[str]:
+    """
+    Get the first field of the unique index a duplicate-key error came from.
+
+    Args:
+        error: DuplicateKeyError raised by an insert or update
+
+    Returns:
+        Field name (e.g. "organization_name"), or None if it cannot be told
+    """
+    key_pattern = (error.details or {}).get("keyPattern")
+    if key_pattern:
+        return next(iter(key_pattern))
+
+    # Servers that omit keyPattern still name the index in the message
+    match = re.search(r"index: (\w+?)_-?1", str(error))
+    return match.group(1) if match else None
@@ -0,0 +1,49 @@
+import bisect
+import hashlib
+from typing import Iterable
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash of a string (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to nodes.
+
+    Every node is placed at several virtual points so keys spread evenly, and
+    adding or removing a node only remaps the keys of that node (about 1/N
+    of them) instead of reshuffling everything.
+    """
+
+    def __init__(self, nodes: Iterable[str], virtual_nodes: int = 128):
+        """
+        Args:
+            nodes: Node names
+            virtual_nodes: Points per node on the ring
+        """
+        self.nodes = sorted(set(nodes))
+        if not self.nodes:
+            raise ValueError("HashRing needs at least one node")
+
+        points = sorted(
+            (_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def get(self, key: str) -> str:
+        """
+        Get the node owning a key.
+
+        Args:
+            key: Key to place
+
+        Returns:
+            Name of the first node clockwise from the key's hash
+        """
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
@@ -0,0 +1,80 @@
+import threading
+from collections import deque
+
+
+class _Timing:
+    """Latency summary over all observations plus a window of recent ones."""
+
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+
+class Metrics:
+    """
+    Thread-safe in-process counters and latency timings.
+
+    Names are dotted strings such as "transaction.create_organization.retries".
+    Percentiles are computed over the most recent TIMING_WINDOW observations.
+    """
+
+    TIMING_WINDOW = 1024
+
+    _counters: dict = {}
+    _timings: dict = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def increment(cls, name: str, value: int = 1):
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with cls._lock:
+            cls._counters[name] = cls._counters.get(name, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, seconds: float):
+        """
+        Record one latency observation.
+
+        Args:
+            name: Timing name
+            seconds: Observed duration in seconds
+        """
+        with cls._lock:
+            timing = cls._timings.get(name)
+            if timing is None:
+                timing = cls._timings[name] = _Timing(cls.TIMING_WINDOW)
+            timing.count += 1
+            timing.total += seconds
+            timing.max = max(timing.max, seconds)
+            timing.recent.append(seconds)
+
+    @classmethod
+    def snapshot(cls) -> dict:
+        """
+        Get all counters and timing summaries.
+
+        Returns:
+            Dictionary with "counters" and "timings" (count, mean, p50, p99, max)
+        """
+        with cls._lock:
+            timings = {}
+            for name, timing in cls._timings.items():
+                recent = sorted(timing.recent)
+                timings[name] = {
+                    "count": timing.count,
+                    "mean": timing.total / timing.count,
+                    "p50": recent[len(recent) // 2],
+                    "p99": recent[min(len(recent) - 1, int(len(recent) * 0.99))],
+                    "max": timing.max,
+                }
+            return {"counters": dict(cls._counters), "timings": timings}